@@ -0,0 +1,90 @@
+"""
+Alchemy combination graph built from the mod's combination recipes.
+Indexes every recipe by ingredient pair, by ingredient and by output for constant-time lookups.
+"""
+
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from search_index import SubstringIndex
+
+# Combination modes as written in the recipe files, and how the bot displays them
+MODE_SYMBOLS = {'and': '&&', 'or': '||'}
+
+
+class Combination(NamedTuple):
+    """One combination recipe: ``input1 <mode> input2 = output``."""
+    input1: str
+    input2: str
+    mode: str
+    output: str
+
+
+def ingredient_name(ingredient: str, item_names: Mapping[str, str]) -> str:
+    """Display name of an item id, or of a ``#namespace:tag`` ingredient."""
+    if ingredient.startswith('#'):
+        return ingredient
+    return item_names.get(ingredient) or ingredient.replace('_', ' ').title()
+
+
+def _pair(first: str, second: str) -> Tuple[str, str]:
+    # Combining is symmetric in the mod, so both orders share one key
+    return (first, second) if first <= second else (second, first)
+
+
+class AlchemyGraph:
+    """
+    Every combination recipe, with adjacency indexes in both directions.
+
+    ``combine`` answers "what do A && B / A || B make", ``recipes_for`` answers
+    "what combinations produce X", and ``uses_of`` lists the recipes an
+    ingredient takes part in. Each is a single dict lookup.
+    """
+
+    def __init__(self, combinations: Iterable[Sequence[str]], item_names: Mapping[str, str]):
+        """
+        Parameters:
+        -----------
+        combinations: iterable of (input1, input2, mode, output)
+            Recipes as written by parse_items.py
+        item_names: mapping
+            Display names of known items by id; other ids are title-cased
+        """
+        self.combinations = [Combination(*combination) for combination in combinations]
+        self._by_pair: Dict[Tuple[str, str], List[Combination]] = {}
+        self._by_output: Dict[str, List[Combination]] = {}
+        self._by_input: Dict[str, List[Combination]] = {}
+
+        for combination in self.combinations:
+            self._by_pair.setdefault(_pair(combination.input1, combination.input2), []).append(combination)
+            self._by_output.setdefault(combination.output, []).append(combination)
+            self._by_input.setdefault(combination.input1, []).append(combination)
+            if combination.input2 != combination.input1:
+                self._by_input.setdefault(combination.input2, []).append(combination)
+
+        ids = set(self._by_input) | set(self._by_output)
+        self.names = {item_id: ingredient_name(item_id, item_names) for item_id in ids}
+        # Autocomplete over every item and tag that appears in a recipe
+        self.index = SubstringIndex(
+            (name, item_id, (name, item_id)) for item_id, name in sorted(self.names.items())
+        )
+
+    def __len__(self) -> int:
+        return len(self.combinations)
+
+    def name(self, item_id: str) -> str:
+        return self.names.get(item_id) or ingredient_name(item_id, {})
+
+    def combine(self, first: str, second: str, mode: Optional[str] = None) -> List[Combination]:
+        """Recipes combining ``first`` and ``second`` in either order, optionally for one mode."""
+        combinations = self._by_pair.get(_pair(first, second), [])
+        if mode is None:
+            return list(combinations)
+        return [combination for combination in combinations if combination.mode == mode]
+
+    def recipes_for(self, output: str) -> List[Combination]:
+        """Recipes that produce ``output``."""
+        return list(self._by_output.get(output, []))
+
+    def uses_of(self, ingredient: str) -> List[Combination]:
+        """Recipes that take ``ingredient`` as one of their inputs."""
+        return list(self._by_input.get(ingredient, []))
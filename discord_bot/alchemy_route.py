@@ -0,0 +1,214 @@
+"""
+Cheapest alchemy chains from a set of owned items to a target item.
+Searches the combination graph as an AND/OR graph, weighting each crafted item by its grist cost.
+"""
+
+import heapq
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+from alchemy_graph import AlchemyGraph, Combination
+
+# Seconds a single /route search may run before giving up
+DEFAULT_BUDGET = 1.0
+
+# Searches kept per planner, one per distinct set of owned items
+SEARCH_CACHE_SIZE = 64
+
+# How many items to settle between deadline checks
+_DEADLINE_CHECK_INTERVAL = 64
+
+
+def grist_total(grist_cost: Optional[Mapping[str, int]]) -> Optional[int]:
+    """Total grist of a cost, or None when there is no usable cost."""
+    if not isinstance(grist_cost, Mapping) or not grist_cost:
+        return None
+    return sum(grist_cost.values())
+
+
+class Route(NamedTuple):
+    """The combinations to perform, in order, and the grist they take in total."""
+    target: str
+    steps: List[Combination]
+    grist: Dict[str, int]
+    unknown_cost: List[str]
+
+
+class RouteTimeout(Exception):
+    """Raised when a route search runs past its deadline."""
+
+
+class _Search:
+    """
+    Knuth's generalization of Dijkstra's algorithm to AND/OR graphs, for one set of owned items.
+
+    Owned items cost nothing. Every other item costs the cheapest of its
+    recipes: the cost of both ingredients plus the item's own grist weight.
+    A ``#tag`` ingredient is an OR node over the tag's items and costs as
+    much as the cheapest of them. An item is settled when it leaves the
+    queue, and a recipe is only tried once both of its ingredients are
+    settled, so settled costs are final.
+
+    The search stops as soon as the requested target is settled and resumes
+    from there for the next target, so every settled item is a memoized
+    subresult shared by all later queries with the same owned items.
+    """
+
+    def __init__(self, graph: AlchemyGraph, weights: Mapping[str, int], owned: FrozenSet[str],
+                 tags_of: Mapping[str, Sequence[str]]):
+        self._graph = graph
+        self._weights = weights
+        self._tags_of = tags_of
+        self.cost: Dict[str, float] = {item: 0 for item in owned}
+        self.via: Dict[str, Combination] = {}
+        # The item standing in for each settled tag
+        self.member: Dict[str, str] = {}
+        self.settled: Set[str] = set()
+        self._queue: List[Tuple[float, str]] = [(0, item) for item in sorted(owned)]
+
+    def run_until(self, target: str, deadline: float) -> bool:
+        """Settle items until ``target`` is settled; False if it can't be reached."""
+        popped = 0
+        while target not in self.settled:
+            if not self._queue:
+                return False
+            popped += 1
+            if popped % _DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+                raise RouteTimeout(target)
+
+            cost, item = heapq.heappop(self._queue)
+            if item in self.settled:
+                continue
+            self.settled.add(item)
+
+            for tag in self._tags_of.get(item, ()):
+                if tag not in self.settled and cost < self.cost.get(tag, float('inf')):
+                    self.cost[tag] = cost
+                    self.member[tag] = item
+                    heapq.heappush(self._queue, (cost, tag))
+
+            for combination in self._graph.uses_of(item):
+                if combination.input1 not in self.settled or combination.input2 not in self.settled:
+                    continue
+                output = combination.output
+                if output in self.settled:
+                    continue
+                candidate = (self.cost[combination.input1] + self.cost[combination.input2] +
+                             self._weights[output])
+                if candidate < self.cost.get(output, float('inf')):
+                    self.cost[output] = candidate
+                    self.via[output] = combination
+                    heapq.heappush(self._queue, (candidate, output))
+        return True
+
+    def steps(self, target: str) -> List[Combination]:
+        """
+        The combinations leading to ``target``, each after the ones making its ingredients.
+        Tag ingredients are replaced by the item that stands in for them.
+        """
+        steps: List[Combination] = []
+        done: Set[str] = set()
+
+        def visit(item: str) -> None:
+            item = self.member.get(item, item)
+            if item in done or item not in self.via:
+                return
+            done.add(item)
+            combination = self.via[item]
+            visit(combination.input1)
+            visit(combination.input2)
+            steps.append(combination._replace(input1=self.member.get(combination.input1, combination.input1),
+                                              input2=self.member.get(combination.input2, combination.input2)))
+
+        visit(target)
+        return steps
+
+
+class RoutePlanner:
+    """
+    Plans /route answers over one AlchemyGraph.
+
+    Items whose grist cost is unknown are weighted with the median known cost,
+    so they can still be used but aren't preferred over items with a known
+    cheap cost. A ``#tag`` ingredient is satisfied by any item of the tag,
+    owned or crafted, so items outside every recipe count when they belong
+    to an ingredient tag. Searches are cached per set of owned items with LRU eviction.
+    The planner is safe to call from several threads: a call takes its search
+    out of the cache while it runs, so concurrent calls never share one.
+    """
+
+    def __init__(self, graph: AlchemyGraph, grist_costs: Mapping[str, Mapping[str, int]],
+                 item_tags: Optional[Mapping[str, Sequence[str]]] = None):
+        """
+        Parameters:
+        -----------
+        graph: AlchemyGraph
+            The combination recipes to search
+        grist_costs: mapping
+            Grist cost of each item by id, e.g. {'sord': {'Build': 5}}
+        item_tags: mapping, optional
+            Concrete items of each ``#tag`` ingredient, as returned by item_tags.ingredient_tags
+        """
+        self.graph = graph
+        self.grist_costs = grist_costs
+        # Inverse of item_tags, for the tags that appear in a recipe
+        self.tags_of: Dict[str, List[str]] = {}
+        for tag, items in (item_tags or {}).items():
+            if tag in graph.names:
+                for item_id in items:
+                    self.tags_of.setdefault(item_id, []).append(tag)
+
+        totals = {item_id: grist_total(cost) for item_id, cost in grist_costs.items()}
+        known = [total for total in totals.values() if total is not None]
+        fallback = statistics.median(known) if known else 1
+        self.weights = {
+            item_id: totals[item_id] if totals.get(item_id) is not None else fallback
+            for item_id in graph.names
+        }
+
+        self._searches: 'OrderedDict[FrozenSet[str], _Search]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def knows(self, item_id: str) -> bool:
+        """Whether ``item_id`` can take part in a route: it is in a recipe or in one of its tags."""
+        return item_id in self.graph.names or item_id in self.tags_of
+
+    def plan(self, owned: Iterable[str], target: str, budget: float = DEFAULT_BUDGET) -> Optional[Route]:
+        """
+        Return the cheapest route from ``owned`` to ``target``, or None if it can't be made.
+
+        Raises RouteTimeout if the search takes longer than ``budget`` seconds;
+        the work done so far is kept for the next query.
+        """
+        deadline = time.perf_counter() + budget
+        owned = frozenset(owned)
+
+        # A call owns its search while it runs; the lock only guards the cache
+        with self._lock:
+            search = self._searches.pop(owned, None)
+        if search is None:
+            search = _Search(self.graph, self.weights, owned, self.tags_of)
+        try:
+            if not search.run_until(target, deadline):
+                return None
+            steps = search.steps(target)
+        finally:
+            with self._lock:
+                self._searches[owned] = search
+                self._searches.move_to_end(owned)
+                while len(self._searches) > SEARCH_CACHE_SIZE:
+                    self._searches.popitem(last=False)
+
+        grist: Dict[str, int] = {}
+        unknown_cost = []
+        for combination in steps:
+            cost = self.grist_costs.get(combination.output)
+            if grist_total(cost) is None:
+                unknown_cost.append(combination.output)
+                continue
+            for grist_type, amount in cost.items():
+                grist[grist_type] = grist.get(grist_type, 0) + amount
+        return Route(target, steps, grist, unknown_cost)
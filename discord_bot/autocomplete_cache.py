@@ -0,0 +1,85 @@
+"""
+Per-user cache of recent autocomplete result sets.
+Lets each keystroke narrow the previous keystroke's matches instead of searching the whole index.
+"""
+
+import heapq
+import time
+from collections import OrderedDict
+from typing import Hashable, List, NamedTuple, Tuple
+
+from search_index import SubstringIndex
+
+
+class _CachedResult(NamedTuple):
+    index: SubstringIndex
+    query: str
+    ranks: Tuple[int, ...]
+    expires_at: float
+
+
+class AutocompleteCache:
+    """
+    Bounded LRU cache of autocomplete match sets, keyed by (user, command, option).
+
+    Every entry remembers the index it was computed against, the lowercased
+    query and the ranks of *all* entries that matched it, unsorted. Since
+    matching is a substring test, any query containing the cached query can
+    only match a subset of those ranks, so only they need to be re-tested.
+    The ``limit`` best ranks are picked with a bounded heap, never by sorting
+    the whole match set.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once more than ``max_entries`` are stored.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, _CachedResult]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, key: Hashable, index: SubstringIndex, query: str, limit: int) -> List[Tuple[str, str]]:
+        """
+        Search ``index`` for ``query``, reusing the match set cached under ``key``.
+
+        Parameters:
+        -----------
+        key: hashable
+            Identifies the autocomplete session, e.g. (user id, command, option)
+        index: SubstringIndex
+            The index to search; cached results for a different index are ignored
+        query: str
+            The text typed so far
+        limit: int
+            Maximum number of (name, value) pairs to return
+        """
+        query = query.lower()
+        now = time.monotonic()
+
+        candidates = None
+        cached = self._entries.get(key)
+        if cached is not None:
+            if cached.expires_at <= now or cached.index is not index:
+                del self._entries[key]
+            elif cached.query == query:
+                self._entries.move_to_end(key)
+                return index.choices(heapq.nsmallest(limit, cached.ranks))
+            elif cached.query and cached.query in query:
+                candidates = cached.ranks
+
+        ranks = index.matching_ranks(query, candidates)
+        self._store(key, _CachedResult(index, query, ranks, now + self.ttl))
+        return index.choices(heapq.nsmallest(limit, ranks))
+
+    def _store(self, key: Hashable, result: _CachedResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
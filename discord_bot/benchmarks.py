@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the bot's hot paths.
+Run from the discord_bot directory after generating items_data.json.
+"""
+
+import asyncio
+import time
+from typing import Callable, Iterable
+
+
+def measure(label: str, func: Callable[[], object], repeat: int = 5) -> float:
+    """Run ``func`` several times and print the best wall time in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<40} {best * 1000:9.3f} ms")
+    return best
+
+
+def per_call(label: str, func: Callable[[], object], calls: int) -> None:
+    """Print the per-call cost of a benchmark that makes ``calls`` calls."""
+    total = measure(label, func)
+    print(f"  {'':<40} {total / max(calls, 1) * 1e6:9.1f} µs per call")
+
+
+def current_snapshot():
+    """The bot's data snapshot, loading it first; the bot itself only loads it once it starts connecting."""
+    import bot
+
+    if bot.SNAPSHOTS.current is None:
+        asyncio.run(bot.SNAPSHOTS.start())
+    return bot.SNAPSHOTS.current
+
+
+def bench_embeds() -> None:
+    """Render cost of /item and /description embeds, uncached versus cached (JSON backend)."""
+    import bot
+
+    snapshot = current_snapshot()
+    repository = snapshot.repository
+    items = list(repository.items)
+    topics = [(topic, None) for topic in repository.descriptions]
+    topics += [
+        (topic, subtopic)
+        for topic, topic_data in repository.descriptions.items()
+        for subtopic in topic_data.get('subtopics', {})
+    ]
+
+    def render_items(render: Callable[[str], object], ids: Iterable[str]):
+        return lambda: [render(item_id) for item_id in ids]
+
+    def render_item(item_id: str):
+        return bot.render_item_embed(item_id, repository.get_item(item_id))
+
+    def cached_item(item_id: str):
+        return bot.EMBED_CACHE.get(snapshot.version, ('item', item_id), lambda: render_item(item_id))
+
+    def render_description(topic: str, subtopic):
+        return bot.render_description_embed(topic, repository.get_topic(topic), subtopic)
+
+    def cached_description(topic: str, subtopic):
+        return bot.EMBED_CACHE.get(snapshot.version, ('description', topic, subtopic),
+                                   lambda: render_description(topic, subtopic))
+
+    print(f"Embeds ({len(items)} items, {len(topics)} topics and subtopics)")
+    per_call("/item render (uncached)", render_items(render_item, items), len(items))
+    per_call("/item render (cached)", render_items(cached_item, items), len(items))
+    per_call("/description render (uncached)",
+             lambda: [render_description(*key) for key in topics], len(topics))
+    per_call("/description render (cached)",
+             lambda: [cached_description(*key) for key in topics], len(topics))
+    print()
+
+
+def bench_msitems_lexer() -> None:
+    """Lexing and parsing cost of MSItems.java, at its real size and repeated tenfold."""
+    from pathlib import Path
+
+    import parse_items
+
+    java_file = (Path(__file__).parent.parent / 'src' / 'main' / 'java' / 'com' / 'mraof' / 'minestuck' /
+                 'item' / 'MSItems.java')
+    with open(java_file, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    registrations = list(parse_items.lex_registrations(lines))
+    large = lines * 10
+
+    print(f"MSItems.java ({len(lines)} lines, {len(registrations)} registrations)")
+    per_call("lex registrations",
+             lambda: list(parse_items.lex_registrations(lines)), len(registrations))
+    per_call("lex registrations (10x source)",
+             lambda: list(parse_items.lex_registrations(large)), len(registrations) * 10)
+    per_call("parse item definitions",
+             lambda: [parse_items.parse_item_definition(*r) for r in registrations], len(registrations))
+    measure("parse_msitems_java (file to dict)", lambda: parse_items.parse_msitems_java(java_file))
+    print()
+
+
+def bench_alchemy() -> None:
+    """Forward and reverse /alchemize lookups over every combination recipe."""
+    graph = current_snapshot().repository.alchemy_graph()
+    combinations = graph.combinations
+
+    print(f"Alchemy graph ({len(combinations)} combinations, {len(graph.names)} items and tags)")
+    per_call("combine (forward)",
+             lambda: [graph.combine(c.input2, c.input1) for c in combinations], len(combinations))
+    per_call("recipes_for (reverse)",
+             lambda: [graph.recipes_for(c.output) for c in combinations], len(combinations))
+    print()
+
+
+def bench_route() -> None:
+    """/route searches from every item that no recipe produces, cold and with the search reused."""
+    from alchemy_route import RoutePlanner
+
+    repository = current_snapshot().repository
+    graph = repository.alchemy_graph()
+    outputs = {c.output for c in graph.combinations}
+    targets = sorted(outputs)
+    owned = [item_id for item_id in graph.names if item_id not in outputs]
+    grist_costs = repository.alchemy_route_planner().grist_costs
+
+    planner = RoutePlanner(graph, grist_costs)
+    print(f"Route planner ({len(owned)} owned items, {len(targets)} targets)")
+    measure("unreachable target (full cold search)",
+            lambda: RoutePlanner(graph, grist_costs).plan(owned, 'not_an_item'))
+    per_call("every target (search reused)",
+             lambda: [planner.plan(owned, target) for target in targets], len(targets))
+    print()
+
+
+def bench_afford() -> None:
+    """/afford queries over the cost matrix, compared with a loop over every cost."""
+    costs = current_snapshot().repository.grist_cost_matrix()
+    inventory = {grist_type: 100 for grist_type in costs.grist_types}
+    grist_costs = {item_id: dict(zip(costs.grist_types, row.tolist()))
+                   for item_id, row in zip(costs.item_ids, costs.matrix)}
+
+    print(f"Grist cost matrix ({len(costs)} items, {len(costs.grist_types)} grist types)")
+    per_call("affordable (matrix)", lambda: costs.affordable(inventory, 25), 1)
+    per_call("affordable (loop)", lambda: [
+        item_id for item_id, cost in grist_costs.items()
+        if all(amount <= inventory[grist_type] for grist_type, amount in cost.items())
+    ], 1)
+    print()
+
+
+def bench_search() -> None:
+    """/search queries over the stat columns, compared with a loop over every item record."""
+    from stat_index import STAT_FIELDS, parse_query
+
+    repository = current_snapshot().repository
+    index = repository.stat_index()
+    query = parse_query("type:sword tier>=3 damage>=5 sort:-speed limit:10")
+
+    def scan():
+        matches = [
+            item for item in repository.items.values()
+            if item.get('type') == 'Sword' and (item.get('tier_level') or 0) >= 3
+            and (item.get('attack_damage') or 0) >= 5
+        ]
+        return sorted(matches, key=lambda item: -STAT_FIELDS['speed'](item))[:10]
+
+    print(f"Stat index ({len(index)} items)")
+    per_call("search (columns)", lambda: index.search(query), 1)
+    per_call("search (loop)", scan, 1)
+    print()
+
+
+def bench_similar() -> None:
+    """Building the /similar neighbour table, and looking up every item in it."""
+    from similar_items import SimilarityIndex
+
+    items = current_snapshot().repository.items
+    index = SimilarityIndex(items)
+
+    print(f"Similarity index ({len(index)} items, {index.features.shape[1]} features)")
+    measure("neighbour table (load time)", lambda: SimilarityIndex(items))
+    per_call("similar (lookup)", lambda: [index.similar(item_id) for item_id in index.item_ids], len(index))
+    print()
+
+
+def main():
+    """Run all benchmarks."""
+    bench_msitems_lexer()
+    bench_embeds()
+    bench_alchemy()
+    bench_route()
+    bench_afford()
+    bench_search()
+    bench_similar()
+
+
+if __name__ == '__main__':
+    main()
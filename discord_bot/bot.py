@@ -3,6 +3,7 @@ Minestuck Discord Bot
 A Discord bot for the Minestuck community with basic command functionality.
 """
 
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -10,7 +11,25 @@ import os
 import json
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
+
+from alchemy_graph import MODE_SYMBOLS, AlchemyGraph, Combination
+from alchemy_route import Route, RouteTimeout
+from autocomplete_cache import AutocompleteCache
+from captcha import EMPTY_CARD_CAPTCHA, parse_seed
+from command_sync import CommandSyncState, StartupTimer, sync_if_changed
+from compat import CompatEntry, CompatSettings, compat_item_name
+from data_repository import JsonRepository, SqliteRepository
+from data_snapshot import DEFAULT_POLL_INTERVAL, SnapshotManager
+from embed_cache import EmbedCache
+from grist_matrix import AffordableItem, GristUse, parse_grist_inventory
+from localization import DEFAULT_LOCALE, LocalePreferences, LocaleTable
+from similar_items import Neighbour
+from stat_index import STAT_FIELDS, QueryError, parse_query
+from response_pipeline import Reply, hold_until_ready, respond
+
+# Times each phase of startup, from here until the bot is connected and its data loaded
+STARTUP = StartupTimer()
 
 # Load environment variables from Token.env
 # Token.env is in the root directory
@@ -30,114 +49,305 @@ DEFAULT_STACK_SIZE = 64
 # Base URL for item images (can be overridden via environment variable)
 ITEM_IMAGE_BASE_URL = os.getenv('ITEM_IMAGE_BASE_URL', 'https://raw.githubusercontent.com/mrMuscles/minestuckBot/main/src/main/resources/assets/minestuck/textures/item')
 
+# Base URL of the mod's texture folders, for linking textures that have no cached thumbnail
+TEXTURE_BASE_URL = os.getenv('TEXTURE_BASE_URL', ITEM_IMAGE_BASE_URL.rsplit('/', 1)[0])
+
+# How /item shows an item's picture: 'attach' sends the cached thumbnail with the reply,
+# 'link' points Discord at the texture on TEXTURE_BASE_URL
+ITEM_IMAGE_MODE = os.getenv('ITEM_IMAGE_MODE', 'attach').lower()
+
 # Maximum number of subtopics to display in description command
 MAX_SUBTOPICS_DISPLAY = 10
 
+# Maximum number of recipes to list in one /alchemize reply
+MAX_COMBINATIONS_DISPLAY = 20
+
+# Maximum number of steps to list in one /route reply
+MAX_ROUTE_STEPS_DISPLAY = 25
+
+# Default and maximum number of items listed by /afford
+DEFAULT_AFFORD_LIMIT = 10
+MAX_AFFORD_LIMIT = 25
+
+# Default and maximum number of items listed by /grist
+DEFAULT_GRIST_LIMIT = 10
+MAX_GRIST_LIMIT = 25
+
+# Maximum limit:N a /search query may ask for
+MAX_SEARCH_LIMIT = 25
+
+# Reply to /captcha without a seed; a world created with an empty seed field got a random one
+EMPTY_SEED_TEXT = "❌ Enter the world's seed; `/seed` shows it in game."
+
+# Recent autocomplete result sets kept per (user, command, option), and how long they stay valid
+AUTOCOMPLETE_CACHE_SIZE = 1024
+AUTOCOMPLETE_CACHE_TTL = 60.0
+
+# Sync the command tree on startup even if it matches the last synced one
+FORCE_COMMAND_SYNC = os.getenv('FORCE_COMMAND_SYNC', '').lower() in ('1', 'true', 'yes')
+
 # Create bot instance
 bot = commands.Bot(command_prefix='!', intents=intents)
 
-# Load items data
-ITEMS_DATA = {}
+# Where item and description data comes from: 'json' (default) or 'sqlite'
+DATA_BACKEND = os.getenv('DATA_BACKEND', 'json').lower()
+
 items_file = Path(__file__).parent / 'items_data.json'
-if items_file.exists():
-    with open(items_file, 'r', encoding='utf-8') as f:
-        ITEMS_DATA = json.load(f)
-    print(f"Loaded {len(ITEMS_DATA)} items from items_data.json")
-else:
-    print(f"Warning: items_data.json not found at {items_file}")
-    print("Run parse_items.py to generate the items database")
-
-# Load descriptions data
-DESCRIPTIONS_DATA = {}
 descriptions_file = Path(__file__).parent / 'descriptions_data.json'
-if descriptions_file.exists():
-    with open(descriptions_file, 'r', encoding='utf-8') as f:
-        DESCRIPTIONS_DATA = json.load(f)
-    print(f"Loaded {len(DESCRIPTIONS_DATA)} description topics from descriptions_data.json")
-else:
-    print(f"Warning: descriptions_data.json not found at {descriptions_file}")
-    print("Run parse_descriptions.py to generate the descriptions database")
+combinations_file = Path(__file__).parent / 'combinations_data.json'
+grist_costs_file = Path(__file__).parent / 'grist_costs_data.json'
+item_tags_file = Path(__file__).parent / 'item_tags_data.json'
+database_file = Path(__file__).parent / 'minestuck_data.db'
+compat_file = Path(__file__).parent / 'compat_data.json'
+preferences_file = Path(__file__).parent / 'locale_preferences.json'
+compat_settings_file = Path(__file__).parent / 'compat_settings.json'
+command_sync_file = Path(__file__).parent / 'command_sync.json'
+thumbnails_dir = Path(__file__).parent / 'thumbnails'
+
+
+def find_locale_files():
+    """The locale_<locale>.json files written by parse_items.py, by locale."""
+    return {path.stem.removeprefix('locale_'): path for path in sorted(Path(__file__).parent.glob('locale_*.json'))}
+
+# Lets each keystroke narrow the matches of the previous one
+AUTOCOMPLETE_CACHE = AutocompleteCache(AUTOCOMPLETE_CACHE_SIZE, AUTOCOMPLETE_CACHE_TTL)
+
+
+def load_repository():
+    """Load the item and description data into a repository for the configured backend."""
+    if DATA_BACKEND == 'sqlite' and database_file.exists():
+        # Records are read lazily from the database
+        repository = SqliteRepository(database_file, AUTOCOMPLETE_CACHE)
+        print(f"Using SQLite data store with {repository.item_count()} items and "
+              f"{repository.topic_count()} description topics from {database_file.name}")
+        return repository
+
+    if DATA_BACKEND == 'sqlite':
+        print(f"Warning: {database_file.name} not found at {database_file}, falling back to JSON data")
+        print("Run parse_items.py and parse_descriptions.py to generate the SQLite store")
+
+    # Load items data
+    items_data = {}
+    if items_file.exists():
+        with open(items_file, 'r', encoding='utf-8') as f:
+            items_data = json.load(f)
+        print(f"Loaded {len(items_data)} items from items_data.json")
+    else:
+        print(f"Warning: items_data.json not found at {items_file}")
+        print("Run parse_items.py to generate the items database")
+
+    # Load descriptions data
+    descriptions_data = {}
+    if descriptions_file.exists():
+        with open(descriptions_file, 'r', encoding='utf-8') as f:
+            descriptions_data = json.load(f)
+        print(f"Loaded {len(descriptions_data)} description topics from descriptions_data.json")
+    else:
+        print(f"Warning: descriptions_data.json not found at {descriptions_file}")
+        print("Run parse_descriptions.py to generate the descriptions database")
+
+    # Load alchemy combinations data
+    combinations_data = []
+    if combinations_file.exists():
+        with open(combinations_file, 'r', encoding='utf-8') as f:
+            combinations_data = json.load(f)
+        print(f"Loaded {len(combinations_data)} alchemy combinations from combinations_data.json")
+    else:
+        print(f"Warning: combinations_data.json not found at {combinations_file}")
+        print("Run parse_items.py to generate the combinations database")
+
+    # Load grist costs of every item, used to weight /route
+    grist_costs_data = {}
+    if grist_costs_file.exists():
+        with open(grist_costs_file, 'r', encoding='utf-8') as f:
+            grist_costs_data = json.load(f)
+        print(f"Loaded grist costs for {len(grist_costs_data)} items from grist_costs_data.json")
+    else:
+        print(f"Warning: grist_costs_data.json not found at {grist_costs_file}")
+        print("Run parse_items.py to generate the grist costs database")
+
+    # Items of each tag that recipes take as an ingredient, so /route can use any of them
+    item_tags_data = {}
+    if item_tags_file.exists():
+        with open(item_tags_file, 'r', encoding='utf-8') as f:
+            item_tags_data = json.load(f)
+        print(f"Loaded {len(item_tags_data)} ingredient tags from item_tags_data.json")
+    else:
+        print(f"Warning: item_tags_data.json not found at {item_tags_file}")
+        print("Run parse_items.py to generate the ingredient tags database")
+
+    # Grist costs and recipes of other mods, one entry per compat pack
+    compat_data = {}
+    if compat_file.exists():
+        with open(compat_file, 'r', encoding='utf-8') as f:
+            compat_data = json.load(f)
+        print(f"Loaded {len(compat_data)} compat packs from compat_data.json")
+    else:
+        print(f"Warning: compat_data.json not found at {compat_file}")
+        print("Run parse_items.py to generate the compat pack database")
+
+    # Other locales are only listed here; each is read the first time someone uses it
+    locale_files = find_locale_files()
+    if locale_files:
+        print(f"Found names and tooltips for locales: {', '.join(sorted(locale_files))}")
+
+    # Autocomplete indexes are built once per load
+    return JsonRepository(items_data, descriptions_data, AUTOCOMPLETE_CACHE, combinations_data, grist_costs_data,
+                          locale_files, compat_data, item_tags_data)
+
+
+# Files whose changes trigger a reload; in SQLite mode the JSON files are watched too,
+# so the bot can move over to the database once it appears
+data_files = (items_file, descriptions_file, combinations_file, grist_costs_file, item_tags_file, compat_file,
+              *find_locale_files().values())
+if DATA_BACKEND == 'sqlite':
+    data_files = (database_file,) + data_files
+
+# Seconds between checks of the data files for changes; 0 turns hot reloading off
+DATA_RELOAD_INTERVAL = float(os.getenv('DATA_RELOAD_INTERVAL', DEFAULT_POLL_INTERVAL))
+
+# The current data snapshot. Commands read SNAPSHOTS.current once and use it throughout,
+# and its version keys every cache, so a reload never serves stale or mixed data.
+# The first snapshot loads in a worker thread while the bot logs in, see load_data
+SNAPSHOTS = SnapshotManager(data_files, load_repository, preload=False)
+
+# Rendered /item and /description embeds, keyed by snapshot version
+EMBED_CACHE = EmbedCache()
+
+# The locale each user and guild picked with /locale
+LOCALE_PREFERENCES = LocalePreferences(preferences_file)
+
+# The compat packs each guild enabled with /compat
+COMPAT_SETTINGS = CompatSettings(compat_settings_file)
+
+# Hash of the command tree last synced, so unchanged commands aren't synced again
+COMMAND_SYNC_STATE = CommandSyncState(command_sync_file)
+
+
+# Commands that run without a loaded snapshot; /reload must be able to recover from a failed first load
+READY_EXEMPT_COMMANDS = {'reload'}
+
+
+# Commands and autocompletes that arrive before the first snapshot is loaded wait for it,
+# or get a "still starting" answer if it takes too long
+async def data_ready_check(interaction: discord.Interaction) -> bool:
+    if interaction.command is not None and interaction.command.name in READY_EXEMPT_COMMANDS:
+        return True
+    return await hold_until_ready(interaction, SNAPSHOTS.wait_ready)
+
+bot.tree.interaction_check = data_ready_check
+
+
+def interaction_locale(interaction: discord.Interaction) -> str:
+    """The locale to answer an interaction in: the user's choice, the guild's, or the Discord client's."""
+    return LOCALE_PREFERENCES.resolve(interaction.user.id, interaction.guild_id, str(interaction.locale))
+
+
+def item_thumbnail(item_data: dict) -> Optional[Path]:
+    """The cached thumbnail file to attach for an item, or None to link its texture instead."""
+    thumbnail = item_data.get('thumbnail')
+    if ITEM_IMAGE_MODE != 'attach' or not thumbnail:
+        return None
+    path = thumbnails_dir / thumbnail
+    return path if path.is_file() else None
+
+
+def report_startup():
+    """Log the startup profile as one JSON line once the bot is both connected and loaded."""
+    if STARTUP.done('data load') and STARTUP.done('gateway connect') and not getattr(bot, 'startup_reported', False):
+        bot.startup_reported = True
+        print(f"Startup profile: {json.dumps(STARTUP.profile())}")
+
+
+async def load_data():
+    """Load and index the first data snapshot in a worker thread, while the bot logs in and connects."""
+    try:
+        with STARTUP.phase('data load'):
+            snapshot = await SNAPSHOTS.start()
+        print(f"Data version {snapshot.version} ready: {snapshot.repository.item_count()} items, "
+              f"{snapshot.repository.topic_count()} description topics")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        print("Commands will answer that the bot is starting until the data files load")
+    report_startup()
+
+
+# Start watching the data files and sync the commands once the bot has logged in.
+# setup_hook runs once per process, unlike on_ready, which fires again on every reconnect
+@bot.event
+async def setup_hook():
+    STARTUP.end('login')
+    if DATA_RELOAD_INTERVAL > 0:
+        bot.data_watcher = asyncio.create_task(SNAPSHOTS.watch(DATA_RELOAD_INTERVAL))
+    with STARTUP.phase('command sync'):
+        try:
+            synced = await sync_if_changed(bot.tree, bot.application_id, COMMAND_SYNC_STATE, FORCE_COMMAND_SYNC)
+            if synced is None:
+                print("Commands unchanged since the last sync, skipping it (set FORCE_COMMAND_SYNC=1 to sync anyway)")
+            else:
+                print(f"Synced {synced} commands")
+        except Exception as e:
+            print(f"Error syncing commands: {e}")
+    STARTUP.begin('gateway connect')
 
 # Event: Bot is ready
 @bot.event
 async def on_ready():
     print(f'{bot.user} has connected to Discord!')
     print(f'Bot is in {len(bot.guilds)} guilds')
+    if not STARTUP.done('gateway connect'):
+        STARTUP.end('gateway connect')
+        report_startup()
     print('------')
     await bot.change_presence(activity=discord.Game(name="Minestuck Encyclopedia Service"))
 
-# Sync all app commands on bot startup
-@bot.event
-async def on_ready():
-    print(f'{bot.user} has connected to Discord!')
-    print(f'Bot is in {len(bot.guilds)} guilds')
-    try:
-        synced = await bot.tree.sync()
-        print(f"Synced {len(synced)} commands")
-    except Exception as e:
-        print(f"Error syncing commands: {e}")
-    print('------')
 
 # Autocomplete function for item names
 async def item_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
     """
     Autocomplete function for item names.
-    Returns top 5 items that match the current input, sorted lexicographically.
+    Returns top 5 items that match the current input, sorted lexicographically,
+    followed by the closest fuzzy matches if fewer than 5 items match exactly.
     """
-    current_lower = current.lower()
-
-    # Filter items that match the input
-    matching_items = []
-    for item_id, item_data in ITEMS_DATA.items():
-        item_name = item_data.get('name', item_id)
-        if current_lower in item_name.lower() or current_lower in item_id.lower():
-            matching_items.append((item_name, item_id))
-
-    # Sort lexicographically by name
-    matching_items.sort(key=lambda x: x[0].lower())
-
-    # Return top 5 matches
+    session = (interaction.user.id, 'item', 'item')
+    locale = interaction_locale(interaction)
     return [
         app_commands.Choice(name=name, value=item_id)
-        for name, item_id in matching_items[:5]
+        for name, item_id in SNAPSHOTS.current.repository.search_items(current, 5, session, locale)
     ]
 
 
-# Command: /item - Get information about a Minestuck item
-@bot.tree.command(name="item", description="Get information about any item in the Minestuck game")
-@app_commands.autocomplete(item=item_autocomplete)
-async def item(interaction: discord.Interaction, item: str):
+# Build the /item embed for an item record
+def render_item_embed(item: str, item_data: dict, strings: Optional[LocaleTable] = None) -> discord.Embed:
     """
-    Display detailed information about a Minestuck item.
+    Render the information embed for a Minestuck item.
 
     Parameters:
     -----------
     item: str
-        The item to look up (autocomplete enabled)
+        The item's id
+    item_data: dict
+        The item's record from the repository
+    strings: LocaleTable, optional
+        Localized name and tooltip to use instead of the default ones
     """
-    # Send initial "loading" message
-    await interaction.response.send_message("Starting Slime's Enough Items Service...")
-
-    # Check if item exists
-    if item not in ITEMS_DATA:
-        await interaction.edit_original_response(content=f"❌ Item '{item}' not found in the database.")
-        return
+    item_name = (strings and strings.name(item)) or item_data.get('name', item.replace('_', ' ').title())
+    tooltip = (strings and strings.tooltip(item)) or item_data.get('tooltip')
 
-    item_data = ITEMS_DATA[item]
-    item_name = item_data.get('name', item.replace('_', ' ').title())
-
-    # Create embed
+    # Create embed, with the item's in-game tooltip when it has one
     embed = discord.Embed(
         title=f"📦 {item_name}",
-        description=f"Information about **{item_name}**",
+        description=f"*{tooltip}*" if tooltip else f"Information about **{item_name}**",
         color=discord.Color.blue()
     )
 
-    # Add item image as thumbnail
-    # Images are stored in the GitHub repository
-    # Can be overridden with ITEM_IMAGE_BASE_URL environment variable
-    image_url = f"{ITEM_IMAGE_BASE_URL}/{item}.png"
-    embed.set_thumbnail(url=image_url)
+    # Add the item's picture as thumbnail: the cached thumbnail sent along with the reply,
+    # or else a link to its texture; items without a texture get none rather than a broken link
+    thumbnail = item_thumbnail(item_data)
+    if thumbnail is not None:
+        embed.set_thumbnail(url=f"attachment://{thumbnail.name}")
+    elif item_data.get('texture'):
+        embed.set_thumbnail(url=f"{TEXTURE_BASE_URL}/{item_data['texture']}.png")
 
     # Add item type
     item_type = item_data.get('type', 'Unknown')
@@ -201,11 +411,18 @@ async def item(interaction: discord.Interaction, item: str):
         if properties:
             embed.add_field(name="🔧 Properties", value='\n'.join(f"• {prop}" for prop in properties), inline=False)
 
-    # Grist costs
+    # Grist costs, or an estimate derived from the item's combination recipes
     grist_cost = item_data.get('grist_cost')
+    estimated_grist_cost = item_data.get('estimated_grist_cost')
     if grist_cost:
         grist_text = ', '.join(f"{amount} {grist_type}" for grist_type, amount in grist_cost.items())
-        embed.add_field(name="💎 Grist Cost", value=grist_text, inline=False)
+        # Costs set for a whole tag name the tag they came from
+        grist_tag = item_data.get('grist_cost_tag')
+        grist_title = f"💎 Grist Cost (from {grist_tag})" if grist_tag else "💎 Grist Cost"
+        embed.add_field(name=grist_title, value=grist_text, inline=False)
+    elif estimated_grist_cost:
+        grist_text = ', '.join(f"{amount} {grist_type}" for grist_type, amount in estimated_grist_cost.items())
+        embed.add_field(name="💎 Grist Cost (estimated from recipe ingredients)", value=grist_text, inline=False)
 
     # Alchemy modes
     alchemy_modes = item_data.get('alchemy_modes')
@@ -231,46 +448,54 @@ async def item(interaction: discord.Interaction, item: str):
     # Item ID (for reference)
     embed.set_footer(text=f"Item ID: {item}")
 
-    # Update the message with the embed
-    await interaction.edit_original_response(content=None, embed=embed)
+    return embed
+
+
+# Command: /item - Get information about a Minestuck item
+@bot.tree.command(name="item", description="Get information about any item in the Minestuck game")
+@app_commands.autocomplete(item=item_autocomplete)
+async def item(interaction: discord.Interaction, item: str):
+    """
+    Display detailed information about a Minestuck item.
+
+    Parameters:
+    -----------
+    item: str
+        The item to look up (autocomplete enabled)
+    """
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        # Check if item exists
+        item_data = snapshot.repository.get_item(item)
+        if item_data is None:
+            return Reply(content=f"❌ Item '{item}' not found in the database.")
+
+        # Names and tooltips in the user's locale, when the data has them
+        strings = snapshot.repository.locale_table(interaction_locale(interaction))
+        locale = strings.locale if strings else DEFAULT_LOCALE
+
+        # Serve the rendered embed from the cache, with its thumbnail attached
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, ('item', item, locale),
+                                           lambda: render_item_embed(item, item_data, strings)),
+                     attachment=item_thumbnail(item_data))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
 
 # Autocomplete function for description topics
 async def topic_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
     """
     Autocomplete function for description topics.
-    Returns top 25 topics that match the current input, sorted lexicographically.
+    Returns top 25 topics that match the current input, sorted lexicographically,
+    followed by the closest fuzzy matches if fewer than 25 topics match exactly.
     """
-    current_lower = current.lower()
-    
-    # Filter topics that match the input (both main topics and subtopics)
-    matching_topics = []
-    for topic_id, topic_data in DESCRIPTIONS_DATA.items():
-        topic_name = topic_data.get('name', topic_id)
-        if current_lower in topic_name.lower() or current_lower in topic_id.lower():
-            matching_topics.append((topic_name, topic_id))
-        
-        # Also check subtopics
-        subtopics = topic_data.get('subtopics', {})
-        for subtopic_id, subtopic_data in subtopics.items():
-            subtopic_name = subtopic_data.get('name', subtopic_id)
-            full_name = f"{topic_name} - {subtopic_name}"
-            full_id = f"{topic_id}:{subtopic_id}"
-            if current_lower in subtopic_name.lower() or current_lower in subtopic_id.lower():
-                matching_topics.append((full_name, full_id))
-    
-    # Sort lexicographically by name
-    matching_topics.sort(key=lambda x: x[0].lower())
-    
-    # Return top 25 matches with smart truncation
-    choices = []
-    for name, topic_id in matching_topics[:25]:
-        if len(name) > 100:
-            # Smart truncation at word boundary
-            truncated = name[:97].rsplit(' ', 1)[0] + '...'
-            choices.append(app_commands.Choice(name=truncated, value=topic_id))
-        else:
-            choices.append(app_commands.Choice(name=name, value=topic_id))
-    return choices
+    session = (interaction.user.id, 'description', 'topic')
+    return [
+        app_commands.Choice(name=name, value=topic_id)
+        for name, topic_id in SNAPSHOTS.current.repository.search_topics(current, 25, session)
+    ]
 
 
 # Autocomplete function for subtopics
@@ -283,68 +508,30 @@ async def subtopic_autocomplete(interaction: discord.Interaction, current: str)
     if not topic or ':' in topic:
         return []
     
-    # Get subtopics for the selected topic
-    topic_data = DESCRIPTIONS_DATA.get(topic, {})
-    subtopics = topic_data.get('subtopics', {})
-    
-    if not subtopics:
-        return []
-    
-    current_lower = current.lower()
-    
-    # Filter subtopics that match
-    matching = []
-    for subtopic_id, subtopic_data in subtopics.items():
-        subtopic_name = subtopic_data.get('name', subtopic_id)
-        if current_lower in subtopic_name.lower() or current_lower in subtopic_id.lower():
-            matching.append((subtopic_name, subtopic_id))
-    
-    # Sort and return
-    matching.sort(key=lambda x: x[0].lower())
+    session = (interaction.user.id, 'description', 'subtopic')
     return [
         app_commands.Choice(name=name, value=subtopic_id)
-        for name, subtopic_id in matching[:25]
+        for name, subtopic_id in SNAPSHOTS.current.repository.search_subtopics(topic, current, 25, session)
     ]
 
 
-# Command: /description - Get detailed descriptions about Minestuck mechanics
-@bot.tree.command(name="description", description="Get detailed information about Minestuck game mechanics and systems")
-@app_commands.autocomplete(topic=topic_autocomplete, subtopic=subtopic_autocomplete)
-async def description(interaction: discord.Interaction, topic: str, subtopic: str = None):
+# Build the /description embed for a topic record, or one of its subtopics
+def render_description_embed(topic: str, topic_data: dict, subtopic: Optional[str]) -> discord.Embed:
     """
-    Display detailed description about a Minestuck topic.
+    Render the description embed for a Minestuck topic or subtopic.
     
     Parameters:
     -----------
     topic: str
-        The main topic to describe (autocomplete enabled)
+        The topic's id
+    topic_data: dict
+        The topic's record from the repository
     subtopic: str, optional
-        Specific subtopic for more detailed information (autocomplete enabled)
+        The id of one of the topic's subtopics
     """
-    # Send initial "loading" message
-    await interaction.response.send_message("📚 Loading Minestuck Encyclopedia...")
-    
-    # Handle topic:subtopic format from autocomplete
-    if ':' in topic:
-        parts = topic.split(':', 1)
-        topic = parts[0]
-        subtopic = parts[1]
-    
-    # Check if topic exists
-    if topic not in DESCRIPTIONS_DATA:
-        await interaction.edit_original_response(content=f"❌ Topic '{topic}' not found in the database.")
-        return
-    
-    topic_data = DESCRIPTIONS_DATA[topic]
-    
     # If subtopic is specified, show subtopic instead
     if subtopic:
-        subtopics = topic_data.get('subtopics', {})
-        if subtopic not in subtopics:
-            await interaction.edit_original_response(content=f"❌ Subtopic '{subtopic}' not found under '{topic}'.")
-            return
-        
-        subtopic_data = subtopics[subtopic]
+        subtopic_data = topic_data['subtopics'][subtopic]
         display_name = subtopic_data.get('name', subtopic.replace('_', ' ').title())
         description_text = subtopic_data.get('description', 'No description available.')
         image_url = subtopic_data.get('image_url', '')
@@ -359,6 +546,14 @@ async def description(interaction: discord.Interaction, topic: str, subtopic: st
         if image_url:
             embed.set_thumbnail(url=image_url)
         
+        # Grist subtopics list the items that cost the most of that grist type
+        top_items = subtopic_data.get('top_items')
+        if top_items:
+            items_text = '\n'.join(f"**{name}** - {amount}" for name, amount in top_items)
+            items_text += (f"\n{subtopic_data.get('item_count', len(top_items))} items use it, "
+                           f"{subtopic_data.get('only_item_count', 0)} use nothing else")
+            embed.add_field(name="💎 Costliest Items", value=items_text, inline=False)
+        
         embed.set_footer(text=f"Topic: {topic} → {subtopic}")
     else:
         # Show main topic
@@ -390,8 +585,969 @@ async def description(interaction: discord.Interaction, topic: str, subtopic: st
         
         embed.set_footer(text=f"Topic ID: {topic}")
     
-    # Update the message with the embed
-    await interaction.edit_original_response(content=None, embed=embed)
+    return embed
+
+
+# Command: /description - Get detailed descriptions about Minestuck mechanics
+@bot.tree.command(name="description", description="Get detailed information about Minestuck game mechanics and systems")
+@app_commands.autocomplete(topic=topic_autocomplete, subtopic=subtopic_autocomplete)
+async def description(interaction: discord.Interaction, topic: str, subtopic: str = None):
+    """
+    Display detailed description about a Minestuck topic.
+    
+    Parameters:
+    -----------
+    topic: str
+        The main topic to describe (autocomplete enabled)
+    subtopic: str, optional
+        Specific subtopic for more detailed information (autocomplete enabled)
+    """
+    # Handle topic:subtopic format from autocomplete
+    if ':' in topic:
+        parts = topic.split(':', 1)
+        topic = parts[0]
+        subtopic = parts[1]
+    
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        # Check if topic exists
+        topic_data = snapshot.repository.get_topic(topic)
+        if topic_data is None:
+            return Reply(content=f"❌ Topic '{topic}' not found in the database.")
+        
+        # Check if subtopic exists
+        if subtopic and subtopic not in topic_data.get('subtopics', {}):
+            return Reply(content=f"❌ Subtopic '{subtopic}' not found under '{topic}'.")
+        
+        # Serve the rendered embed from the cache
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, ('description', topic, subtopic or None),
+                                           lambda: render_description_embed(topic, topic_data, subtopic)))
+    
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Command group: /alchemize - Look up alchemy combination recipes
+alchemize = app_commands.Group(name="alchemize", description="Look up Minestuck alchemy combinations")
+bot.tree.add_command(alchemize)
+
+
+# Autocomplete function for items and tags used in combination recipes
+async def alchemy_item_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """
+    Autocomplete function for alchemy ingredients and results.
+    Returns top 25 items or tags from the combination recipes that match the current input.
+    """
+    session = (interaction.user.id, 'alchemize', 'item')
+    return [
+        app_commands.Choice(name=name, value=item_id)
+        for name, item_id in SNAPSHOTS.current.repository.search_alchemy_items(current, 25, session)
+    ]
+
+
+# Build an /alchemize embed listing combination recipes
+def render_combinations_embed(title: str, combinations: List[Combination], graph: AlchemyGraph,
+                              empty_text: str) -> discord.Embed:
+    """
+    Render a list of combination recipes.
+
+    Parameters:
+    -----------
+    title: str
+        The embed's title
+    combinations: list of Combination
+        The recipes to list
+    graph: AlchemyGraph
+        Supplies display names for item ids
+    empty_text: str
+        Shown instead of the list when there are no recipes
+    """
+    embed = discord.Embed(title=f"⚗️ {title}", color=discord.Color.green())
+
+    if not combinations:
+        embed.description = empty_text
+        return embed
+
+    lines = [
+        f"**{graph.name(c.input1)}** {MODE_SYMBOLS.get(c.mode, c.mode)} **{graph.name(c.input2)}** "
+        f"→ **{graph.name(c.output)}**"
+        for c in combinations[:MAX_COMBINATIONS_DISPLAY]
+    ]
+    if len(combinations) > MAX_COMBINATIONS_DISPLAY:
+        lines.append(f"... and {len(combinations) - MAX_COMBINATIONS_DISPLAY} more")
+    embed.description = '\n'.join(lines)
+    embed.set_footer(text=f"{len(combinations)} recipe(s)")
+    return embed
+
+
+# Command: /alchemize combine - What two items make together
+@alchemize.command(name="combine", description="See what two items make when combined with && or ||")
+@app_commands.autocomplete(first=alchemy_item_autocomplete, second=alchemy_item_autocomplete)
+@app_commands.choices(mode=[
+    app_commands.Choice(name="&& (and)", value="and"),
+    app_commands.Choice(name="|| (or)", value="or"),
+])
+async def alchemize_combine(interaction: discord.Interaction, first: str, second: str,
+                            mode: Optional[app_commands.Choice[str]] = None):
+    """
+    Show the results of combining two items.
+
+    Parameters:
+    -----------
+    first: str
+        The first item or tag (autocomplete enabled)
+    second: str
+        The second item or tag (autocomplete enabled)
+    mode: Choice, optional
+        Only show && or || combinations
+    """
+    snapshot = SNAPSHOTS.current
+    mode_value = mode.value if mode else None
+
+    def build() -> Reply:
+        def render() -> discord.Embed:
+            graph = snapshot.repository.alchemy_graph()
+            symbol = MODE_SYMBOLS[mode_value] if mode_value else "&& / ||"
+            return render_combinations_embed(
+                f"{graph.name(first)} {symbol} {graph.name(second)}",
+                graph.combine(first, second, mode_value), graph,
+                "These items have no combination recipe.")
+
+        # Serve the rendered embed from the cache
+        key = ('alchemize', 'combine', *sorted((first, second)), mode_value)
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, key, render))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Command: /alchemize recipes - What combinations produce an item
+@alchemize.command(name="recipes", description="See which combinations produce an item")
+@app_commands.autocomplete(item=alchemy_item_autocomplete)
+async def alchemize_recipes(interaction: discord.Interaction, item: str):
+    """
+    Show every combination recipe that produces an item.
+
+    Parameters:
+    -----------
+    item: str
+        The item to make (autocomplete enabled)
+    """
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        def render() -> discord.Embed:
+            graph = snapshot.repository.alchemy_graph()
+            return render_combinations_embed(
+                f"Recipes for {graph.name(item)}", graph.recipes_for(item), graph,
+                "No combination recipe produces this item.")
+
+        # Serve the rendered embed from the cache
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, ('alchemize', 'recipes', item), render))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Autocomplete function for a comma-separated list of owned items
+async def owned_items_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """
+    Autocomplete function for the /route owned item list.
+    Completes the last entry of the comma-separated list, keeping the entries before it.
+    """
+    head, _, last = current.rpartition(',')
+    prefix = ', '.join(part.strip() for part in head.split(',') if part.strip())
+    prefix = f"{prefix}, " if prefix else ''
+
+    session = (interaction.user.id, 'route', 'have')
+    choices = []
+    for _, item_id in SNAPSHOTS.current.repository.search_alchemy_items(last.strip(), 25, session):
+        value = prefix + item_id
+        # Discord rejects choices longer than 100 characters
+        if len(value) <= 100:
+            choices.append(app_commands.Choice(name=value, value=value))
+    return choices
+
+
+# Build the /route embed for a planned route
+def render_route_embed(target: str, route: Optional[Route], graph: AlchemyGraph, owned: List[str],
+                       unknown: List[str]) -> discord.Embed:
+    """
+    Render the cheapest alchemy chain to a target item.
+
+    Parameters:
+    -----------
+    target: str
+        The item to make
+    route: Route, optional
+        The planned route, or None if the target can't be reached
+    graph: AlchemyGraph
+        Supplies display names for item ids
+    owned: list of str
+        The item ids the route starts from
+    unknown: list of str
+        Entries of the owned list that don't appear in any recipe
+    """
+    embed = discord.Embed(title=f"🧭 Route to {graph.name(target)}", color=discord.Color.green())
+
+    if route is None:
+        embed.description = "No chain of combinations reaches this item from the items you have."
+        embed.color = discord.Color.red()
+    elif not route.steps:
+        embed.description = "You already have this item."
+    else:
+        lines = [
+            f"{number}. **{graph.name(c.input1)}** {MODE_SYMBOLS.get(c.mode, c.mode)} **{graph.name(c.input2)}** "
+            f"→ **{graph.name(c.output)}**"
+            for number, c in enumerate(route.steps[:MAX_ROUTE_STEPS_DISPLAY], start=1)
+        ]
+        if len(route.steps) > MAX_ROUTE_STEPS_DISPLAY:
+            lines.append(f"... and {len(route.steps) - MAX_ROUTE_STEPS_DISPLAY} more steps")
+        embed.description = '\n'.join(lines)
+
+        if route.grist:
+            grist_text = ', '.join(f"{amount} {grist_type}" for grist_type, amount in sorted(route.grist.items()))
+            embed.add_field(name="💎 Total Grist", value=grist_text, inline=False)
+        if route.unknown_cost:
+            embed.add_field(name="❔ Unknown Grist Cost",
+                            value=', '.join(graph.name(item_id) for item_id in route.unknown_cost), inline=False)
+
+    embed.add_field(name="🎒 Starting From", value=', '.join(graph.name(item_id) for item_id in owned) or "Nothing",
+                    inline=False)
+    if unknown:
+        embed.add_field(name="⚠️ Not In Any Recipe", value=', '.join(unknown), inline=False)
+    return embed
+
+
+# Command: /route - Cheapest chain of combinations from owned items to a target
+@bot.tree.command(name="route", description="Find the cheapest chain of alchemy combinations to make an item")
+@app_commands.autocomplete(target=alchemy_item_autocomplete, have=owned_items_autocomplete)
+async def route(interaction: discord.Interaction, target: str, have: str):
+    """
+    Plan the cheapest chain of && / || combinations that makes an item.
+
+    Parameters:
+    -----------
+    target: str
+        The item to make (autocomplete enabled)
+    have: str
+        Comma-separated items you already have (autocomplete enabled)
+    """
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        graph = snapshot.repository.alchemy_graph()
+        planner = snapshot.repository.alchemy_route_planner()
+        owned, unknown = [], []
+        for entry in have.split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            # Accept ids from autocomplete as well as typed display names; items of an ingredient tag count too
+            item_id = entry if planner.knows(entry) else entry.lower().replace(' ', '_')
+            if planner.knows(item_id):
+                owned.append(item_id)
+            else:
+                unknown.append(entry)
+
+        if target not in graph.names:
+            return Reply(content=f"❌ Item '{target}' is not part of any alchemy recipe.")
+
+        try:
+            planned = planner.plan(owned, target)
+        except RouteTimeout:
+            return Reply(content="⌛ The route search took too long. Try again, or start from more items.")
+        return Reply(embed=render_route_embed(target, planned, graph, owned, unknown))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Build the /afford embed for a grist inventory
+def render_afford_embed(inventory: dict, affordable: List[AffordableItem], total: int, unknown: List[str]) -> discord.Embed:
+    """
+    Render the items a grist inventory can pay for.
+
+    Parameters:
+    -----------
+    inventory: dict
+        The grist amounts by type
+    affordable: list of AffordableItem
+        The highest-ranked affordable items
+    total: int
+        How many items the inventory can pay for in total
+    unknown: list of str
+        Names in the inventory that aren't grist types
+    """
+    embed = discord.Embed(title="💎 What You Can Afford", color=discord.Color.gold())
+
+    if affordable:
+        embed.description = '\n'.join(
+            f"**{item.name}** - " + ', '.join(f"{amount} {grist_type}" for grist_type, amount in item.cost.items())
+            for item in affordable
+        )
+    else:
+        embed.description = "Nothing with a known grist cost fits this inventory."
+
+    grist_text = ', '.join(f"{amount} {grist_type}" for grist_type, amount in inventory.items()) or "No grist"
+    embed.add_field(name="🎒 Inventory", value=grist_text, inline=False)
+    if unknown:
+        embed.add_field(name="⚠️ Unknown Grist Types", value=', '.join(unknown), inline=False)
+    embed.set_footer(text=f"Showing {len(affordable)} of {total} affordable items, most expensive first")
+    return embed
+
+
+# Command: /afford - Items a grist inventory can pay for
+@bot.tree.command(name="afford", description="See which items you can alchemize with the grist you have")
+async def afford(interaction: discord.Interaction, grist: str,
+                 limit: app_commands.Range[int, 1, MAX_AFFORD_LIMIT] = DEFAULT_AFFORD_LIMIT):
+    """
+    List the most expensive items a grist inventory can pay for.
+
+    Parameters:
+    -----------
+    grist: str
+        Your grist, e.g. "50 build, 20 shale, 5 garnet"
+    limit: int, optional
+        How many items to list
+    """
+    snapshot = SNAPSHOTS.current
+    packs = enabled_compat_packs(interaction)
+
+    def build() -> Reply:
+        # Items of the compat packs enabled here count as well
+        costs, _ = snapshot.repository.grist_indexes(packs)
+        inventory, unknown = parse_grist_inventory(grist, costs.grist_types)
+        if not inventory:
+            return Reply(content="❌ No grist amounts found. Try something like `50 build, 20 shale`.")
+
+        affordable, total = costs.affordable(inventory, limit)
+        return Reply(embed=render_afford_embed(inventory, affordable, total, unknown))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Autocomplete function for grist types
+async def grist_type_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """
+    Autocomplete function for grist types.
+    Matches the typed text anywhere in the grist type's name.
+    """
+    current = current.strip().lower()
+    _, index = SNAPSHOTS.current.repository.grist_indexes(enabled_compat_packs(interaction))
+    return [
+        app_commands.Choice(name=grist_type, value=grist_type)
+        for grist_type in index.grist_types
+        if current in grist_type.lower()
+    ][:25]
+
+
+# Build the /grist embed for one grist type
+def render_grist_embed(grist_type: str, uses: List[GristUse], cheapest: bool, only: bool, total: int) -> discord.Embed:
+    """
+    Render the items ranked by how much of one grist type they cost.
+
+    Parameters:
+    -----------
+    grist_type: str
+        The grist type
+    uses: list of GristUse
+        The highest-ranked items
+    cheapest: bool
+        Whether the items are ranked cheapest first rather than most expensive first
+    only: bool
+        Whether only items costing nothing but this grist type are listed
+    total: int
+        How many items match in total
+    """
+    ranking = "Cheapest" if cheapest else "Most Expensive"
+    scope = f"Only {grist_type}" if only else grist_type
+    embed = discord.Embed(title=f"💎 {ranking} Items Using {scope}", color=discord.Color.gold())
+
+    if uses:
+        lines = []
+        for use in uses:
+            line = f"**{use.name}** - {use.amount} {grist_type}"
+            if use.total != use.amount:
+                line += f" ({use.total} grist in total)"
+            lines.append(line)
+        embed.description = '\n'.join(lines)
+    else:
+        embed.description = f"No item with a known grist cost uses {scope}."
+
+    embed.set_footer(text=f"Showing {len(uses)} of {total} items")
+    return embed
+
+
+# Command: /grist - Items ranked by how much of a grist type they cost
+@bot.tree.command(name="grist", description="See which items cost the most or least of a grist type")
+@app_commands.autocomplete(grist_type=grist_type_autocomplete)
+@app_commands.choices(order=[
+    app_commands.Choice(name="Most expensive first", value="most"),
+    app_commands.Choice(name="Cheapest first", value="cheapest"),
+])
+async def grist(interaction: discord.Interaction, grist_type: str,
+                order: Optional[app_commands.Choice[str]] = None, only: bool = False,
+                limit: app_commands.Range[int, 1, MAX_GRIST_LIMIT] = DEFAULT_GRIST_LIMIT):
+    """
+    List the items that cost the most or the least of one grist type.
+
+    Parameters:
+    -----------
+    grist_type: str
+        The grist type (autocomplete enabled)
+    order: Choice, optional
+        Most expensive first (default) or cheapest first
+    only: bool, optional
+        Only list items that cost nothing but this grist type
+    limit: int, optional
+        How many items to list
+    """
+    snapshot = SNAPSHOTS.current
+    packs = enabled_compat_packs(interaction)
+    cheapest = order is not None and order.value == 'cheapest'
+
+    def build() -> Reply:
+        # Items of the compat packs enabled here count as well
+        _, index = snapshot.repository.grist_indexes(packs)
+        resolved = index.grist_type(grist_type)
+        if resolved is None:
+            return Reply(content=f"❌ '{grist_type}' is not a grist type.")
+
+        def render() -> discord.Embed:
+            uses = index.cheapest(resolved, limit, only) if cheapest else index.most(resolved, limit, only)
+            return render_grist_embed(resolved, uses, cheapest, only, index.count(resolved, only))
+
+        # Serve the rendered embed from the cache
+        key = ('grist', tuple(packs), resolved, cheapest, only, limit)
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, key, render))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Format a stat for lists of items, dropping a trailing .0
+def format_stat(value) -> str:
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+# Short type, tier and combat stats of an item, for lists of items
+def item_summary(item_data: dict) -> List[str]:
+    details = [item_data.get('type', 'Unknown')]
+    if item_data.get('tier'):
+        details.append(f"{item_data['tier']} (tier {item_data.get('tier_level', '?')})")
+    if item_data.get('attack_damage') is not None:
+        details.append(f"⚔️ {format_stat(item_data['attack_damage'])}")
+    if item_data.get('attack_speed') is not None:
+        details.append(f"⚡ {format_stat(item_data['attack_speed'])}")
+    return details
+
+
+# Build the /search embed for a stat query
+def render_search_embed(query: str, items: List[dict], total: int, sort_field: Optional[str]) -> discord.Embed:
+    """
+    Render the items matching a /search query.
+
+    Parameters:
+    -----------
+    query: str
+        The query as typed
+    items: list of dict
+        Records of the matching items to show, in result order
+    total: int
+        How many items match in total
+    sort_field: str, optional
+        The stat the results are sorted by, shown for every item
+    """
+    embed = discord.Embed(title=f"🔎 {query}", color=discord.Color.blue())
+
+    if not items:
+        embed.description = "No items match this search."
+        return embed
+
+    lines = []
+    for item_data in items:
+        details = item_summary(item_data)
+        if sort_field not in (None, 'damage', 'speed', 'tier'):
+            value = STAT_FIELDS[sort_field](item_data)
+            if value is not None:
+                details.append(f"{sort_field} {format_stat(value)}")
+        lines.append(f"**{item_data.get('name', item_data.get('id'))}** - " + ', '.join(details))
+    embed.description = '\n'.join(lines)
+    embed.set_footer(text=f"Showing {len(items)} of {total} matching items")
+    return embed
+
+
+# Command: /search - Find weapons and tools by their stats
+@bot.tree.command(name="search", description="Search items by stats, e.g. type:sword tier>=5 damage>6 sort:-speed")
+async def search(interaction: discord.Interaction, query: str):
+    """
+    Find items with a small query language over their stats.
+
+    Parameters:
+    -----------
+    query: str
+        Space-separated terms, e.g. "type:sword tier>=5 damage>6 sort:-speed limit:10".
+        Stats: damage, speed, efficiency, durability, tier, grist; text: type, material
+    """
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        try:
+            parsed = parse_query(query, MAX_SEARCH_LIMIT)
+        except QueryError as e:
+            return Reply(content=f"❌ {e}")
+
+        def render() -> discord.Embed:
+            item_ids, total = snapshot.repository.stat_index().search(parsed)
+            items = [snapshot.repository.get_item(item_id) for item_id in item_ids]
+            return render_search_embed(query, items, total, parsed.sort[0] if parsed.sort else None)
+
+        # Serve the rendered embed from the cache
+        try:
+            return Reply(embed=EMBED_CACHE.get(snapshot.version, ('search', ' '.join(query.lower().split())), render))
+        except QueryError as e:
+            return Reply(content=f"❌ {e}")
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Build the /similar embed for an item's nearest neighbours
+def render_similar_embed(item_data: dict, neighbours: List[Tuple[Neighbour, dict]]) -> discord.Embed:
+    """
+    Render the items closest to an item by combat stats, tier and grist makeup.
+
+    Parameters:
+    -----------
+    item_data: dict
+        The item's record
+    neighbours: list of (Neighbour, dict)
+        The nearest items, nearest first, each with its record
+    """
+    embed = discord.Embed(title=f"🧬 Items Similar to {item_data.get('name', item_data.get('id'))}",
+                          color=discord.Color.teal())
+
+    lines = []
+    for neighbour, neighbour_data in neighbours:
+        details = item_summary(neighbour_data)
+        grist_cost = neighbour_data.get('grist_cost') or neighbour_data.get('estimated_grist_cost')
+        if grist_cost:
+            details.append(f"💎 {sum(grist_cost.values())}")
+        lines.append(f"**{neighbour.name}** - " + ', '.join(details))
+    embed.description = '\n'.join(lines) or "No other items to compare with."
+
+    embed.add_field(name="This Item", value=', '.join(item_summary(item_data)), inline=False)
+    embed.set_footer(text="Closest first, by damage, speed, efficiency, durability, tier and grist makeup")
+    return embed
+
+
+# Command: /similar - Items closest to an item by stats and grist makeup
+@bot.tree.command(name="similar", description="Find the items most like an item by stats, tier and grist makeup")
+@app_commands.autocomplete(item=item_autocomplete)
+async def similar(interaction: discord.Interaction, item: str):
+    """
+    List the nearest neighbours of an item.
+
+    Parameters:
+    -----------
+    item: str
+        The item to compare with (autocomplete enabled)
+    """
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        item_data = snapshot.repository.get_item(item)
+        if item_data is None:
+            return Reply(content=f"❌ Item '{item}' not found in the database.")
+        neighbours = snapshot.repository.similarity_index().similar(item)
+        if neighbours is None:
+            return Reply(content=f"❌ '{item_data.get('name', item)}' has no combat stats or grist cost to compare.")
+
+        def render() -> discord.Embed:
+            return render_similar_embed(item_data, [
+                (neighbour, snapshot.repository.get_item(neighbour.item_id)) for neighbour in neighbours
+            ])
+
+        # Serve the rendered embed from the cache
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, ('similar', item), render))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Autocomplete function for locales
+async def locale_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """
+    Autocomplete function for /locale.
+    Lists every locale the data has names for, plus 'auto' to follow the Discord client.
+    """
+    current = current.strip().lower()
+    return [
+        app_commands.Choice(name=locale, value=locale)
+        for locale in ['auto'] + SNAPSHOTS.current.repository.locales()
+        if current in locale
+    ][:25]
+
+
+# Command: /locale - Pick the language of item names and tooltips
+@bot.tree.command(name="locale", description="Pick the language of item names and tooltips")
+@app_commands.autocomplete(locale=locale_autocomplete)
+async def locale(interaction: discord.Interaction, locale: str, server: bool = False):
+    """
+    Set the locale used for /item and item autocomplete.
+
+    Parameters:
+    -----------
+    locale: str
+        A locale such as en_us or zh_tw, or 'auto' to follow the Discord client (autocomplete enabled)
+    server: bool, optional
+        Set it for the whole server instead of just for you (needs Manage Server)
+    """
+    locale = locale.strip().lower()
+    if locale != 'auto' and locale not in SNAPSHOTS.current.repository.locales():
+        available = ', '.join(SNAPSHOTS.current.repository.locales())
+        await interaction.response.send_message(f"❌ Unknown locale '{locale}'. Available: {available}",
+                                                ephemeral=True)
+        return
+    choice = None if locale == 'auto' else locale
+
+    if server:
+        if interaction.guild_id is None or not interaction.permissions.manage_guild:
+            await interaction.response.send_message(
+                "❌ You need the Manage Server permission to set the server locale.", ephemeral=True)
+            return
+        await asyncio.to_thread(LOCALE_PREFERENCES.set_guild, interaction.guild_id, choice)
+        scope = "this server"
+    else:
+        await asyncio.to_thread(LOCALE_PREFERENCES.set_user, interaction.user.id, choice)
+        scope = "you"
+
+    language = locale if choice else "the Discord client's language"
+    await interaction.response.send_message(f"✅ Item names and tooltips for {scope} now use {language}.",
+                                            ephemeral=True)
+
+
+# Command group: /compat - Grist costs and recipes from the official compat datapacks
+compat = app_commands.Group(name="compat", description="Grist costs and recipes of other mods with Minestuck compat packs")
+bot.tree.add_command(compat)
+
+
+def enabled_compat_packs(interaction: discord.Interaction) -> List[str]:
+    """The compat packs enabled where the interaction happened."""
+    return COMPAT_SETTINGS.enabled(interaction.guild_id, SNAPSHOTS.current.repository.compat_index().packs)
+
+
+# Autocomplete function for compat packs
+async def compat_pack_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """
+    Autocomplete function for compat packs.
+    Lists every compat pack whose id or folder name contains the current input.
+    """
+    index = SNAPSHOTS.current.repository.compat_index()
+    current = current.strip().lower()
+    return [
+        app_commands.Choice(name=f"{pack} ({index.names[pack]})", value=pack)
+        for pack in index.packs
+        if current in pack or current in index.names[pack].lower()
+    ][:25]
+
+
+# Autocomplete function for items of the enabled compat packs
+async def compat_item_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """
+    Autocomplete function for compat items.
+    Returns the top 25 items of the enabled packs whose name or namespaced id matches the current input.
+    """
+    index = SNAPSHOTS.current.repository.compat_index()
+    return [
+        app_commands.Choice(name=f"{name} ({item_id})"[:100], value=item_id)
+        for name, item_id in index.search(current, 25, enabled_compat_packs(interaction))
+    ]
+
+
+# Build the /compat item embed for a namespaced item id
+def render_compat_item_embed(item_id: str, entries: List[CompatEntry], graph: AlchemyGraph) -> discord.Embed:
+    """
+    Render what the enabled compat packs know about an item.
+
+    Parameters:
+    -----------
+    item_id: str
+        The namespaced item id, e.g. 'quark:crab_leg'
+    entries: list of CompatEntry
+        One entry per enabled pack that has the item
+    graph: AlchemyGraph
+        Supplies display names for Minestuck and vanilla ingredients
+    """
+    def name(ingredient: str) -> str:
+        namespace, _, path = ingredient.lstrip('#').partition(':')
+        if ingredient.startswith('#') or namespace not in ('minecraft', 'minestuck'):
+            return compat_item_name(ingredient)
+        return graph.name(path)
+
+    embed = discord.Embed(title=f"🧩 {compat_item_name(item_id)}", description=f"`{item_id}`",
+                          color=discord.Color.teal())
+    for entry in entries:
+        lines = []
+        if entry.grist_cost:
+            lines.append("💎 " + ', '.join(f"{amount} {grist_type}" for grist_type, amount in entry.grist_cost.items()))
+        for input1, input2, mode, _ in entry.combinations:
+            lines.append(f"⚗️ {name(input1)} {MODE_SYMBOLS.get(mode, mode)} {name(input2)}")
+        embed.add_field(name=entry.pack, value='\n'.join(lines), inline=False)
+    return embed
+
+
+# Command: /compat item - Grist cost and recipes of an item from another mod
+@compat.command(name="item", description="Look up the grist cost and recipes of an item from another mod")
+@app_commands.autocomplete(item=compat_item_autocomplete)
+async def compat_item(interaction: discord.Interaction, item: str):
+    """
+    Show what the compat packs enabled here know about an item.
+
+    Parameters:
+    -----------
+    item: str
+        The namespaced item id, e.g. quark:crab_leg (autocomplete enabled)
+    """
+    snapshot = SNAPSHOTS.current
+    packs = enabled_compat_packs(interaction)
+
+    def build() -> Reply:
+        entries = snapshot.repository.compat_index().lookup(item, packs)
+        if not entries:
+            return Reply(content=f"❌ No compat pack enabled here has '{item}'.")
+
+        def render() -> discord.Embed:
+            return render_compat_item_embed(item, entries, snapshot.repository.alchemy_graph())
+
+        # Serve the rendered embed from the cache
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, ('compat', item, tuple(packs)), render))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Command: /compat packs - List the compat packs and whether each is enabled
+@compat.command(name="packs", description="List the compat packs and which ones this server uses")
+async def compat_packs(interaction: discord.Interaction):
+    """List every compat pack with its item count, marking the ones enabled here."""
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        index = snapshot.repository.compat_index()
+        enabled = set(COMPAT_SETTINGS.enabled(interaction.guild_id, index.packs))
+        lines = [
+            f"{'✅' if pack in enabled else '▫️'} **{pack}** - {index.item_count(pack)} items - "
+            f"{index.descriptions[pack]}"
+            for pack in index.packs
+        ]
+        embed = discord.Embed(title="🧩 Compat Packs", description='\n'.join(lines) or "No compat packs found.",
+                              color=discord.Color.teal())
+        embed.set_footer(text=f"{len(enabled)} of {len(index)} packs enabled")
+        return Reply(embed=embed)
+
+    await respond(interaction, build, ephemeral=True)
+
+
+async def set_compat_pack(interaction: discord.Interaction, pack: str, enable: bool) -> None:
+    """Enable or disable one compat pack for the interaction's guild, or all of them with 'all'."""
+    if interaction.guild_id is None or not interaction.permissions.manage_guild:
+        await interaction.response.send_message(
+            "❌ You need the Manage Server permission to pick this server's compat packs.", ephemeral=True)
+        return
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        available = snapshot.repository.compat_index().packs
+        pack_id = pack.strip().lower()
+        if pack_id != 'all' and pack_id not in available:
+            return Reply(content=f"❌ Unknown compat pack '{pack_id}'. Available: {', '.join(available)}")
+
+        enabled = set(COMPAT_SETTINGS.enabled(interaction.guild_id, available))
+        if pack_id == 'all':
+            enabled = set(available) if enable else set()
+        elif enable:
+            enabled.add(pack_id)
+        else:
+            enabled.discard(pack_id)
+        COMPAT_SETTINGS.set_enabled(interaction.guild_id, enabled)
+
+        verb = "enabled" if enable else "disabled"
+        return Reply(content=f"✅ {'All compat packs' if pack_id == 'all' else pack_id} {verb} for this server "
+                             f"({len(enabled)} of {len(available)} enabled).")
+
+    await respond(interaction, build, ephemeral=True)
+
+
+# Command: /compat enable - Turn on a compat pack for this server
+@compat.command(name="enable", description="Use a compat pack's items in this server")
+@app_commands.autocomplete(pack=compat_pack_autocomplete)
+async def compat_enable(interaction: discord.Interaction, pack: str):
+    """
+    Enable a compat pack for this server (needs Manage Server).
+
+    Parameters:
+    -----------
+    pack: str
+        The pack to enable, or 'all' (autocomplete enabled)
+    """
+    await set_compat_pack(interaction, pack, True)
+
+
+# Command: /compat disable - Turn off a compat pack for this server
+@compat.command(name="disable", description="Stop using a compat pack's items in this server")
+@app_commands.autocomplete(pack=compat_pack_autocomplete)
+async def compat_disable(interaction: discord.Interaction, pack: str):
+    """
+    Disable a compat pack for this server (needs Manage Server).
+
+    Parameters:
+    -----------
+    pack: str
+        The pack to disable, or 'all' (autocomplete enabled)
+    """
+    await set_compat_pack(interaction, pack, False)
+
+
+captcha = app_commands.Group(name="captcha", description="Look up the captcha codes of items in a world")
+bot.tree.add_command(captcha)
+
+
+# Build the /captcha embed for an item and its code
+def render_captcha_embed(item_data: dict, code: str, seed_text: str, seed: int) -> discord.Embed:
+    """
+    Render an item's captcha code in a world.
+
+    Parameters:
+    -----------
+    item_data: dict
+        The item the code belongs to
+    code: str
+        The item's captcha code
+    seed_text: str
+        The seed as the user typed it
+    seed: int
+        The numeric world seed
+    """
+    embed = discord.Embed(title=f"🃏 {item_data.get('name', item_data.get('id'))}", description=f"`{code}`",
+                          color=discord.Color.dark_green())
+    if 'captcha' in item_data:
+        embed.add_field(name="Fixed Code", value="This item has the same code in every world.", inline=False)
+    seed_line = f"{seed}" if seed_text.strip() == str(seed) else f"{seed} (from '{seed_text.strip()}')"
+    embed.set_footer(text=f"World seed {seed_line}")
+    return embed
+
+
+# Command: /captcha item - The captcha code of an item in a world
+@captcha.command(name="item", description="Get the captcha code of an item in a world with the given seed")
+@app_commands.autocomplete(item=item_autocomplete)
+async def captcha_item(interaction: discord.Interaction, item: str, seed: str):
+    """
+    Show the code an item's captchalogue card punches in a world.
+
+    Parameters:
+    -----------
+    item: str
+        The item to look up (autocomplete enabled)
+    seed: str
+        The world seed, as typed in the world creation screen
+    """
+    try:
+        world_seed = parse_seed(seed)
+    except ValueError:
+        await interaction.response.send_message(EMPTY_SEED_TEXT, ephemeral=True)
+        return
+    snapshot = SNAPSHOTS.current
+
+    def build() -> Reply:
+        item_data = snapshot.repository.get_item(item)
+        if item_data is None:
+            return Reply(content=f"❌ Item '{item}' not found in the database.")
+
+        def render() -> discord.Embed:
+            code = snapshot.repository.captcha_tables().code(world_seed, f'minestuck:{item}')
+            return render_captcha_embed(item_data, code, seed, world_seed)
+
+        # Serve the rendered embed from the cache
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, ('captcha', item, world_seed, seed.strip()), render))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Command: /captcha code - The item behind a captcha code in a world
+@captcha.command(name="code", description="Find the item behind a captcha code in a world with the given seed")
+async def captcha_code(interaction: discord.Interaction, code: str, seed: str):
+    """
+    Show which item a captcha code belongs to in a world.
+
+    Parameters:
+    -----------
+    code: str
+        The eight-character captcha code
+    seed: str
+        The world seed, as typed in the world creation screen
+    """
+    try:
+        world_seed = parse_seed(seed)
+    except ValueError:
+        await interaction.response.send_message(EMPTY_SEED_TEXT, ephemeral=True)
+        return
+    snapshot = SNAPSHOTS.current
+    code = code.strip()
+
+    def build() -> Reply:
+        if code == EMPTY_CARD_CAPTCHA:
+            return Reply(content=f"🃏 `{code}` is the code of an empty captchalogue card.")
+        item_id = snapshot.repository.captcha_tables().table(world_seed).item(code)
+        if item_id is None:
+            return Reply(content=f"❌ No Minestuck item has the code `{code}` in a world with seed {world_seed}.")
+        item_data = snapshot.repository.get_item(item_id.partition(':')[2])
+
+        def render() -> discord.Embed:
+            return render_captcha_embed(item_data, code, seed, world_seed)
+
+        # Serve the rendered embed from the cache
+        return Reply(embed=EMBED_CACHE.get(snapshot.version, ('captcha code', code, world_seed, seed.strip()),
+                                           render))
+
+    # Reply with the finished embed in a single call
+    await respond(interaction, build)
+
+
+# Command: /reload - Reload item and description data without restarting
+@bot.tree.command(name="reload", description="Reload the item and description data files")
+@app_commands.default_permissions(administrator=True)
+async def reload(interaction: discord.Interaction):
+    """
+    Rebuild the data snapshot from the current data files and swap it in.
+    Commands already running finish on the old snapshot.
+    """
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    try:
+        snapshot = await SNAPSHOTS.reload()
+    except Exception as e:
+        current = SNAPSHOTS.current
+        serving = f"still serving data version {current.version}" if current else "no data is loaded yet"
+        await interaction.followup.send(f"❌ Reload failed, {serving}: {e}", ephemeral=True)
+        return
+
+    repository = snapshot.repository
+    await interaction.followup.send(
+        f"✅ Loaded data version {snapshot.version}: {repository.item_count()} items, "
+        f"{repository.topic_count()} description topics", ephemeral=True)
+
+
+async def main():
+    """Log in and connect to the gateway while the data loads."""
+    async with bot:
+        bot.data_loader = asyncio.create_task(load_data())
+        STARTUP.begin('login')
+        await bot.start(TOKEN)
+
 
 # Run the bot
 if __name__ == "__main__":
@@ -399,4 +1555,9 @@ if __name__ == "__main__":
         print("Error: Please set your DISCORD_TOKEN in Token.env file")
         exit(1)
 
-    bot.run(TOKEN)
+    # The logging bot.run would set up
+    discord.utils.setup_logging()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,104 @@
+"""
+Build manifest for incremental data rebuilds.
+Remembers a content hash, mtime and parsed result for every input file so unchanged files are not parsed again.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from json_files import write_json_file
+
+
+def _copy(result: Any) -> Any:
+    """Deep-copy a parse result through JSON, turning tuples into lists."""
+    return json.loads(json.dumps(result))
+
+
+class BuildManifest:
+    """
+    Per-file cache of parse results, stored as JSON between runs.
+
+    A file whose size and mtime match the manifest is reused without being
+    read. Otherwise its content hash is compared, so touched-but-unchanged
+    files are still reused. Only files whose content changed are re-parsed.
+    Entries for files that were not seen during a run are dropped on save.
+
+    ``parse`` may be called from several threads at once.
+
+    The manifest is discarded whenever ``parser_version`` differs from the
+    one it was written with, or when ``full`` is set.
+    """
+
+    def __init__(self, path: Path, root: Path, parser_version: int, full: bool = False):
+        """
+        Parameters:
+        -----------
+        path: Path
+            Where the manifest is stored
+        root: Path
+            Input paths are recorded relative to this directory
+        parser_version: int
+            Bump whenever parsing logic changes, to invalidate every cached result
+        full: bool
+            Ignore the stored manifest and parse every file again
+        """
+        self.path = path
+        self.root = root
+        self.parser_version = parser_version
+        self.reused = 0
+        self.parsed = 0
+        self._previous: Dict[str, Dict[str, Any]] = {}
+        self._current: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if not full and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('parser_version') == parser_version:
+                    self._previous = data.get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable build manifest {path}: {e}")
+
+    def parse(self, file: Path, parser: Callable[[Path], Any]) -> Any:
+        """
+        Return the parsed result for ``file``, re-parsing only if it changed.
+
+        ``parser`` is called with the file's path and must return something
+        JSON-serializable. The caller always gets its own copy of the result,
+        normalized the same way whether it was parsed now or reused.
+        """
+        key = file.relative_to(self.root).as_posix()
+        stat = file.stat()
+        entry = self._previous.get(key)
+
+        if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            with self._lock:
+                self._current[key] = entry
+                self.reused += 1
+            return _copy(entry['result'])
+
+        digest = hashlib.sha256(file.read_bytes()).hexdigest()
+        reused = entry is not None and entry['sha256'] == digest
+        result = entry['result'] if reused else _copy(parser(file))
+
+        with self._lock:
+            self._current[key] = {
+                'sha256': digest,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'result': result,
+            }
+            if reused:
+                self.reused += 1
+            else:
+                self.parsed += 1
+        return _copy(result)
+
+    def save(self) -> None:
+        """Write the manifest for the files seen during this run."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_file(self.path, {'parser_version': self.parser_version, 'files': self._current})
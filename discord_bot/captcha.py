@@ -0,0 +1,304 @@
+"""
+Captcha codes of items for a world seed, ported from CardCaptchas.java.
+Whole code tables are computed in one batched NumPy pass per seed and kept in a small LRU cache.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+# Characters a captcha code is made of, in the order CardCaptchas.AVAILABLE_CHARACTERS lists them
+AVAILABLE_CHARACTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!?"
+
+# Code of an empty captchalogue card
+EMPTY_CARD_CAPTCHA = "00000000"
+
+# Seed-independent salt of every item's random source
+CAPTCHA_SALT = "minestuck:item_captchas"
+
+# Seeds whose code tables are kept in memory at once
+MAX_CACHED_SEEDS = 8
+
+# java.util.Random's linear congruential generator, as used by LegacyRandomSource
+_MULTIPLIER = 0x5DEECE66D
+_ADDEND = 0xB
+_MASK = (1 << 48) - 1
+
+# Length of a SHA-256 digest in hex characters
+_HASH_LENGTH = 64
+
+# Seeds Long.parseLong reads as a number; unlike int(), it takes no underscores
+_NUMERIC_SEED = re.compile(r'[+-]?\d+')
+
+
+def _signed(value: int, bits: int) -> int:
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+def java_string_hash(text: str) -> int:
+    """Java's String.hashCode()."""
+    value = 0
+    for unit in text.encode('utf-16-be').hex(' ', 2).split():
+        value = (31 * value + int(unit, 16)) & 0xFFFFFFFF
+    return _signed(value, 32)
+
+
+def parse_seed(text: str) -> int:
+    """
+    A world seed as Minecraft reads it: a whole number if it fits in a long, otherwise the text's hash.
+
+    Minecraft picks a random seed when the field is left empty, so an empty
+    or blank seed has no codes to look up and raises ValueError.
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError("The world seed is empty")
+    if _NUMERIC_SEED.fullmatch(text):
+        seed = int(text)
+        if -(1 << 63) <= seed < (1 << 63):
+            return seed
+    return java_string_hash(text)
+
+
+class JavaRandom:
+    """Minecraft's LegacyRandomSource: java.util.Random's generator, without its thread safety."""
+
+    def __init__(self, seed: int):
+        self.state = (seed ^ _MULTIPLIER) & _MASK
+
+    @classmethod
+    def from_state(cls, state: int) -> 'JavaRandom':
+        random = cls(0)
+        random.state = state
+        return random
+
+    def next(self, bits: int) -> int:
+        self.state = (self.state * _MULTIPLIER + _ADDEND) & _MASK
+        return _signed(self.state >> (48 - bits), 32)
+
+    def next_int(self, bound: int) -> int:
+        if bound & (bound - 1) == 0:
+            return (bound * self.next(31)) >> 31
+        while True:
+            bits = self.next(31)
+            value = bits % bound
+            if bits - value + (bound - 1) < (1 << 31):
+                return value
+
+    def next_long(self) -> int:
+        return _signed((self.next(32) << 32) + self.next(32), 64)
+
+    def fork_positional(self, name: str) -> 'JavaRandom':
+        """``forkPositional().fromHashOf(name)``."""
+        return JavaRandom(java_string_hash(name) ^ self.next_long())
+
+
+def item_random(seed: int, item_id: str) -> JavaRandom:
+    """The random source CardCaptchas gives an item in a world with ``seed``."""
+    return JavaRandom(seed).fork_positional(CAPTCHA_SALT).fork_positional(item_id)
+
+
+def captcha_from_hash(cut_hash: str) -> str:
+    """Eight characters from the eight hex pairs of a 16-character hash."""
+    return ''.join(AVAILABLE_CHARACTERS[int(cut_hash[i:i + 2], 16) % 64] for i in range(0, 16, 2))
+
+
+def generated_captcha(seed: int, item_id: str) -> str:
+    """
+    The code CardCaptchas.createCaptchaForItem generates for one item, one item at
+    a time, before collisions are checked. Used for items outside a code table.
+    """
+    random = item_random(seed, item_id)
+    characters = list(hashlib.sha256(item_id.encode('utf-8')).hexdigest())
+    for index in range(len(characters)):
+        swap = random.next_int(index + 1)
+        characters[index], characters[swap] = characters[swap], characters[index]
+    return captcha_from_hash(''.join(characters)[-16:])
+
+
+def backup_captcha(random: JavaRandom, taken) -> str:
+    """CardCaptchas.generateBackupCaptcha: seven random characters and a '#' that no generated code has."""
+    while True:
+        captcha = ''.join(AVAILABLE_CHARACTERS[random.next_int(len(AVAILABLE_CHARACTERS))] for _ in range(7)) + '#'
+        if captcha not in taken:
+            return captcha
+
+
+def _next_ints(states: np.ndarray, bound: int) -> np.ndarray:
+    """``nextInt(bound)`` on every generator in ``states`` at once, advancing them in place."""
+    states[:] = (states * np.uint64(_MULTIPLIER) + np.uint64(_ADDEND)) & np.uint64(_MASK)
+    bits = (states >> np.uint64(17)).astype(np.int64)
+    if bound & (bound - 1) == 0:
+        return (bound * bits) >> 31
+    values = bits % bound
+    # Draws near the top of the range are thrown away and drawn again, as in java.util.Random
+    rejected = bits - values + (bound - 1) >= (1 << 31)
+    while rejected.any():
+        rows = np.flatnonzero(rejected)
+        states[rows] = (states[rows] * np.uint64(_MULTIPLIER) + np.uint64(_ADDEND)) & np.uint64(_MASK)
+        bits[rows] = (states[rows] >> np.uint64(17)).astype(np.int64)
+        values[rows] = bits[rows] % bound
+        rejected[:] = False
+        rejected[rows] = bits[rows] - values[rows] + (bound - 1) >= (1 << 31)
+    return values
+
+
+class CaptchaTable:
+    """The code of every item in one world, and the item of every code."""
+
+    def __init__(self, seed: int, codes: Dict[str, str]):
+        self.seed = seed
+        self.codes = codes
+        self.items = {code: item_id for item_id, code in codes.items()}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code(self, item_id: str) -> Optional[str]:
+        return self.codes.get(item_id)
+
+    def item(self, code: str) -> Optional[str]:
+        return self.items.get(code)
+
+
+def build_captcha_table(seed: int, item_ids: Iterable[str], predetermined: Mapping[str, str]) -> CaptchaTable:
+    """
+    The codes CardCaptchas gives ``item_ids`` in a world with ``seed``.
+
+    Predetermined items keep their fixed code. Every other item's random
+    source, SHA-256 shuffle and code are computed for all items together,
+    one shuffle step at a time across the whole batch. Collisions are then
+    settled in ``item_ids`` order, the order the world is assumed to have
+    first asked for each code: an item whose code is already taken, by a
+    predetermined item or an earlier one, gets a backup code drawn from its
+    own random source, as in the mod. The empty card's code is never handed
+    out, as the mod's own captcha_codes.json reserves it.
+
+    Parameters:
+    -----------
+    seed: int
+        The world seed
+    item_ids: iterable of str
+        Namespaced item ids, e.g. 'minestuck:sord'
+    predetermined: mapping
+        Fixed codes by namespaced item id, from captcha_codes.json
+    """
+    item_ids = [item_id for item_id in dict.fromkeys(item_ids) if item_id not in predetermined]
+    codes = dict(predetermined)
+
+    salted = JavaRandom(seed).fork_positional(CAPTCHA_SALT).next_long()
+    states = np.array([(java_string_hash(item_id) ^ salted ^ _MULTIPLIER) & _MASK for item_id in item_ids],
+                      dtype=np.uint64)
+    hashes = np.array([list(hashlib.sha256(item_id.encode('utf-8')).hexdigest().encode('ascii'))
+                       for item_id in item_ids], dtype=np.uint8).reshape(len(item_ids), _HASH_LENGTH)
+
+    rows = np.arange(len(item_ids))
+    for index in range(_HASH_LENGTH):
+        swaps = _next_ints(states, index + 1)
+        swapped = hashes[rows, swaps]
+        hashes[rows, swaps] = hashes[:, index]
+        hashes[:, index] = swapped
+
+    # The last 16 hex characters, as eight bytes, each picking a character
+    tail = hashes[:, -16:].astype(np.int64)
+    digits = np.where(tail >= ord('a'), tail - ord('a') + 10, tail - ord('0'))
+    values = (digits[:, 0::2] * 16 + digits[:, 1::2]) % 64
+    alphabet = np.frombuffer(AVAILABLE_CHARACTERS.encode('ascii'), dtype=np.uint8)
+    generated = [bytes(row).decode('ascii') for row in alphabet[values]]
+
+    taken = set(codes.values()) | {EMPTY_CARD_CAPTCHA}
+    for row, (item_id, captcha) in enumerate(zip(item_ids, generated)):
+        if captcha in taken:
+            captcha = backup_captcha(JavaRandom.from_state(int(states[row])), taken)
+        codes[item_id] = captcha
+        taken.add(captcha)
+    return CaptchaTable(seed, codes)
+
+
+def read_predetermined_captchas(data_dirs: Iterable[Path]) -> Dict[str, str]:
+    """
+    The fixed codes of every <namespace>/minestuck/captcha_codes.json under
+    ``data_dirs``, by namespaced item id.
+
+    As in PredeterminedCardCaptchas, the first file to give an item or a code
+    wins, and later duplicates are reported and skipped.
+    """
+    items: Dict[str, str] = {}
+    codes: Dict[str, str] = {}
+    for data_dir in data_dirs:
+        for codes_file in sorted(data_dir.glob('*/minestuck/captcha_codes.json')):
+            with open(codes_file, 'r', encoding='utf-8') as f:
+                for captcha, item_id in json.load(f).items():
+                    if item_id in items:
+                        print(f"Warning: Item {item_id} already has the code '{items[item_id]}'")
+                    elif captcha in codes:
+                        print(f"Warning: Code '{captcha}' is already given to {codes[captcha]}")
+                    else:
+                        items[item_id] = captcha
+                        codes[captcha] = item_id
+    return items
+
+
+class CaptchaTables:
+    """
+    Code tables for the seeds asked about most recently, built on first use.
+
+    Each table holds every item's code and the reverse index, so looking up
+    either direction is a dictionary lookup. The least recently used table is
+    dropped once more than ``max_seeds`` are kept.
+    """
+
+    def __init__(self, item_ids: Iterable[str], predetermined: Mapping[str, str],
+                 max_seeds: int = MAX_CACHED_SEEDS):
+        """
+        Parameters:
+        -----------
+        item_ids: iterable of str
+            Namespaced ids of the items to build tables for, in the order codes are settled
+        predetermined: mapping
+            Fixed codes by namespaced item id
+        max_seeds: int
+            How many seeds' tables to keep
+        """
+        self.item_ids: List[str] = list(item_ids)
+        self.predetermined = dict(predetermined)
+        self.max_seeds = max_seeds
+        self._tables: "OrderedDict[int, CaptchaTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def table(self, seed: int) -> CaptchaTable:
+        """The code table of a world with ``seed``."""
+        with self._lock:
+            table = self._tables.get(seed)
+            if table is not None:
+                self._tables.move_to_end(seed)
+                return table
+        table = build_captcha_table(seed, self.item_ids, self.predetermined)
+        with self._lock:
+            self._tables[seed] = table
+            self._tables.move_to_end(seed)
+            while len(self._tables) > self.max_seeds:
+                self._tables.popitem(last=False)
+        return table
+
+    def code(self, seed: int, item_id: str) -> str:
+        """The code of any namespaced item id; items outside the tables get their code computed alone."""
+        code = self.table(seed).code(item_id)
+        return code if code is not None else generated_captcha(seed, item_id)
+
+
+def item_captcha_tables(items: Mapping[str, Mapping[str, Any]]) -> CaptchaTables:
+    """Code tables over the parsed items, keyed by bare id, with the fixed codes parse_items.py recorded."""
+    predetermined = {f'minestuck:{item_id}': item_data['captcha']
+                     for item_id, item_data in items.items() if 'captcha' in item_data}
+    return CaptchaTables((f'minestuck:{item_id}' for item_id in sorted(items)), predetermined)
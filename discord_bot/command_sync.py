@@ -0,0 +1,124 @@
+"""
+Command tree syncing that only talks to Discord when the commands changed, and startup phase timings.
+The hash of the last synced tree is kept on disk, so restarts and reconnects with the same commands skip the sync.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from discord import app_commands
+
+from json_files import write_json_file
+
+
+def command_tree_hash(tree: app_commands.CommandTree) -> str:
+    """
+    SHA-256 of the global command payload ``tree.sync()`` would upload.
+
+    Commands are serialized the way discord.py sends them and sorted by
+    type and name, so the hash only changes when Discord would see a change.
+    """
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()),
+                     key=lambda command: (command.get('type', 1), command['name']))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+class CommandSyncState:
+    """
+    The hash of the command tree last synced for each application, saved to a JSON file.
+
+    A missing or unreadable file means nothing was synced.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self._hashes: Dict[str, str] = dict(data.get('applications', {}))
+
+    def needs_sync(self, application_id: Optional[int], tree_hash: str) -> bool:
+        """Whether the tree differs from the one last synced for the application."""
+        return self._hashes.get(str(application_id)) != tree_hash
+
+    def record(self, application_id: Optional[int], tree_hash: str) -> None:
+        """Remember that ``tree_hash`` is now synced for the application."""
+        with self._lock:
+            self._hashes[str(application_id)] = tree_hash
+            write_json_file(self.path, {'applications': self._hashes}, indent=2, sort_keys=True)
+
+
+async def sync_if_changed(tree: app_commands.CommandTree, application_id: Optional[int], state: CommandSyncState,
+                          force: bool = False) -> Optional[int]:
+    """
+    Sync the global commands if they changed since the last sync, or if ``force`` is set.
+
+    Returns the number of commands synced, or None when the sync was skipped.
+    The hash is only recorded once Discord accepted the commands, so a failed
+    sync is retried on the next start.
+    """
+    tree_hash = command_tree_hash(tree)
+    if not force and not state.needs_sync(application_id, tree_hash):
+        return None
+    synced = await tree.sync()
+    state.record(application_id, tree_hash)
+    return len(synced)
+
+
+class StartupTimer:
+    """
+    When each phase of startup began and ended, relative to the timer's creation.
+
+    Phases may overlap, e.g. the data loads while the bot logs in, so each
+    one is timed on its own. ``profile`` gives the timings as a dict that is
+    logged as a single JSON line.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started = clock()
+        self._begun: Dict[str, float] = {}
+        self.phases: Dict[str, Tuple[float, float]] = {}
+
+    def begin(self, phase: str) -> None:
+        """Start timing ``phase``."""
+        self._begun[phase] = self._clock() - self.started
+
+    def end(self, phase: str) -> float:
+        """Stop timing ``phase``, print and return its duration in seconds."""
+        begun = self._begun.pop(phase)
+        ended = self._clock() - self.started
+        self.phases[phase] = (begun, ended)
+        print(f"Startup: {phase} took {ended - begun:.2f}s")
+        return ended - begun
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as ``phase``."""
+        self.begin(phase)
+        try:
+            yield
+        finally:
+            self.end(phase)
+
+    def done(self, phase: str) -> bool:
+        """Whether ``phase`` has ended."""
+        return phase in self.phases
+
+    def profile(self) -> Dict[str, Any]:
+        """The phases in the order they began, with start, end and duration in milliseconds."""
+        phases = sorted(self.phases.items(), key=lambda item: item[1])
+        return {
+            'total_ms': round(max((ended for _, ended in self.phases.values()), default=0.0) * 1000, 1),
+            'phases': [{'phase': phase, 'start_ms': round(begun * 1000, 1), 'end_ms': round(ended * 1000, 1),
+                        'duration_ms': round((ended - begun) * 1000, 1)}
+                       for phase, (begun, ended) in phases],
+        }
@@ -0,0 +1,306 @@
+"""
+Grist costs and combination recipes from the Minestuck Official Compats datapacks.
+Ids keep their namespace and every index is partitioned by pack, so a lookup only touches the packs a server enabled.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from build_manifest import BuildManifest
+from grist_matrix import GristCostMatrix, GristTypeIndex
+from ingest import IngestReport, ingest_json_tree
+from json_files import write_json_file
+from search_index import SubstringIndex
+
+# Where the compat datapacks live, relative to the repository root
+COMPAT_PACKS_DIR = Path('additional_resources') / 'Minestuck Official Compats'
+
+# Namespace of ids written without one, as in Minecraft
+DEFAULT_NAMESPACE = 'minecraft'
+
+# Namespaces of the base data, whose ids are written without one
+_BASE_NAMESPACES = ('minecraft', 'minestuck')
+
+# Sets of enabled packs whose grist cost matrices are kept at once
+MAX_GRIST_PACK_SETS = 16
+
+# Grist cost recipe types that carry a fixed cost per grist type
+_GRIST_COST_TYPES = ('minestuck:grist_cost', 'minestuck:source_grist_cost')
+
+
+def pack_id(pack_dir: Path) -> str:
+    """The short id of a compat pack, from its folder name, e.g. 'quark' for MinestuckQuarkCompat."""
+    return pack_dir.name.removeprefix('Minestuck').removesuffix('Compat').lower()
+
+
+def qualified_id(reference: str) -> str:
+    """An item id or ``#tag`` with its namespace spelled out, e.g. 'minecraft:stick' for 'stick'."""
+    tag = reference.startswith('#')
+    reference = reference.lstrip('#')
+    if ':' not in reference:
+        reference = f'{DEFAULT_NAMESPACE}:{reference}'
+    return '#' + reference if tag else reference
+
+
+def compat_item_name(item_id: str) -> str:
+    """Display name of a namespaced item id, e.g. 'Crab Leg' for 'quark:crab_leg'; tags are kept as they are."""
+    if item_id.startswith('#'):
+        return item_id
+    return item_id.partition(':')[2].replace('_', ' ').title()
+
+
+def _ingredient(ingredient: Mapping[str, str]) -> str:
+    if 'tag' in ingredient:
+        return qualified_id('#' + ingredient['tag'])
+    return qualified_id(ingredient.get('item', '')) if ingredient.get('item') else ''
+
+
+def parse_compat_file(json_file: Path) -> Optional[List[Any]]:
+    """
+    Parse one datapack JSON file into ``['grist_cost', item_id, cost]`` or
+    ``['combination', [input1, input2, mode, output]]``, with namespaced ids.
+
+    Returns None for any other file, such as weapon attributes, wildcard
+    costs (the player picks the grist type) and costs that are only derived
+    from their sources.
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    recipe_type = data.get('type') if isinstance(data, dict) else None
+
+    if recipe_type in _GRIST_COST_TYPES:
+        item_id = _ingredient(data.get('ingredient', {}))
+        grist_cost = data.get('grist_cost')
+        if not item_id or not isinstance(grist_cost, dict) or not grist_cost:
+            return None
+        cost = {grist_type.replace('minestuck:', '').replace('_', ' ').title(): amount
+                for grist_type, amount in grist_cost.items()}
+        return ['grist_cost', item_id, cost]
+
+    if recipe_type == 'minestuck:combination':
+        output = data.get('output', '')
+        if isinstance(output, dict):
+            output = output.get('item', '')
+        combination = [_ingredient(data.get('input1', {})), _ingredient(data.get('input2', {})),
+                       data.get('mode', ''), qualified_id(output) if output else '']
+        return ['combination', combination] if all(combination) else None
+
+    return None
+
+
+def read_compat_packs(packs_dir: Path, manifest: Optional[BuildManifest] = None,
+                      workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Read every compat pack under ``packs_dir``.
+
+    All packs' files are parsed together on one thread pool, and each result
+    is filed under the pack it came from. Returns, by pack id, the pack's
+    folder name, its pack.mcmeta description, its grist costs by namespaced
+    item id, and its combination recipes.
+
+    Parameters:
+    -----------
+    packs_dir: Path
+        The Minestuck Official Compats folder
+    manifest: BuildManifest, optional
+        Reuses cached results for unchanged files
+    workers: int, optional
+        Thread pool size; defaults to the executor's default
+    """
+    packs: Dict[str, Dict[str, Any]] = {}
+    if not packs_dir.exists():
+        print(f"Warning: Compat packs directory not found at {packs_dir}")
+        return packs
+
+    folders = {}
+    for pack_dir in sorted(path for path in packs_dir.iterdir() if (path / 'pack.mcmeta').is_file()):
+        with open(pack_dir / 'pack.mcmeta', 'r', encoding='utf-8') as f:
+            description = json.load(f).get('pack', {}).get('description', '')
+        folders[pack_dir.name] = pack_id(pack_dir)
+        packs[pack_id(pack_dir)] = {'name': pack_dir.name, 'description': description,
+                                    'grist_costs': {}, 'combinations': []}
+
+    report = IngestReport(packs_dir)
+    for json_file, result in ingest_json_tree(packs_dir, parse_compat_file, report, manifest, workers):
+        pack = packs.get(folders.get(json_file.relative_to(packs_dir).parts[0]))
+        if pack is None:
+            continue
+        if result[0] == 'grist_cost':
+            pack['grist_costs'][result[1]] = result[2]
+        else:
+            pack['combinations'].append(result[1])
+    report.print()
+
+    return packs
+
+
+class CompatEntry(NamedTuple):
+    """What one pack knows about an item: its grist cost and the recipes that make it."""
+    pack: str
+    grist_cost: Optional[Dict[str, int]]
+    combinations: List[List[str]]
+
+
+class CompatIndex:
+    """
+    The compat packs' grist costs and recipes, one partition per pack.
+
+    Each partition has its own lookup tables and autocomplete index, and a
+    query only visits the partitions of the packs it is given, so its cost
+    depends on how many packs a server enabled, never on how many exist.
+    """
+
+    def __init__(self, packs: Mapping[str, Mapping[str, Any]]):
+        """
+        Parameters:
+        -----------
+        packs: mapping
+            Pack data by pack id, as returned by read_compat_packs
+        """
+        self.packs: List[str] = sorted(packs)
+        self.names = {pack: packs[pack].get('name', pack) for pack in self.packs}
+        self.descriptions = {pack: packs[pack].get('description', '') for pack in self.packs}
+        self._costs: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._recipes: Dict[str, Dict[str, List[List[str]]]] = {}
+        self._indexes: Dict[str, SubstringIndex] = {}
+
+        for pack in self.packs:
+            self._costs[pack] = dict(packs[pack].get('grist_costs', {}))
+            recipes: Dict[str, List[List[str]]] = {}
+            for combination in packs[pack].get('combinations', []):
+                recipes.setdefault(combination[3], []).append(list(combination))
+            self._recipes[pack] = recipes
+            item_ids = sorted(set(self._costs[pack]) | set(recipes))
+            self._indexes[pack] = SubstringIndex(
+                (compat_item_name(item_id), item_id, (compat_item_name(item_id), item_id)) for item_id in item_ids
+            )
+
+    def __len__(self) -> int:
+        return len(self.packs)
+
+    def item_count(self, pack: str) -> int:
+        """How many items a pack has a grist cost or recipe for."""
+        return len(self._indexes[pack]) if pack in self._indexes else 0
+
+    def lookup(self, item_id: str, packs: Iterable[str]) -> List[CompatEntry]:
+        """What each of ``packs`` knows about ``item_id``, in pack order; packs that don't know it are left out."""
+        entries = []
+        for pack in sorted(pack for pack in set(packs) if pack in self._costs):
+            cost = self._costs[pack].get(item_id)
+            combinations = self._recipes[pack].get(item_id, [])
+            if cost is not None or combinations:
+                entries.append(CompatEntry(pack, cost, combinations))
+        return entries
+
+    def grist_costs(self, packs: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Every grist cost from ``packs``; where packs disagree, the first pack in order wins."""
+        costs: Dict[str, Dict[str, int]] = {}
+        for pack in sorted((pack for pack in set(packs) if pack in self._costs), reverse=True):
+            costs.update(self._costs[pack])
+        return costs
+
+    def search(self, query: str, limit: int, packs: Sequence[str]) -> List[Tuple[str, str]]:
+        """Items of ``packs`` whose name or id contains ``query``, by name, as (name, item id)."""
+        results = []
+        for pack in sorted(pack for pack in set(packs) if pack in self._indexes):
+            results.extend(self._indexes[pack].search(query, limit))
+        results.sort(key=lambda result: (result[0].lower(), result[1]))
+        unique = []
+        for result in results:
+            if not unique or unique[-1][1] != result[1]:
+                unique.append(result)
+        return unique[:limit]
+
+
+class CompatGristCosts:
+    """
+    Grist cost matrices and type indexes with the costs of enabled compat packs added.
+
+    Guilds enable different packs, so each set of packs gets its own matrix
+    and index, built on first use; the most recently used sets are kept.
+    Vanilla and Minestuck items lose their namespace to match the base data,
+    whose own costs win over a pack's; other mods' items keep theirs.
+    """
+
+    def __init__(self, compat: CompatIndex, grist_costs: Mapping[str, Mapping[str, int]],
+                 item_names: Mapping[str, str], max_sets: int = MAX_GRIST_PACK_SETS):
+        """
+        Parameters:
+        -----------
+        compat: CompatIndex
+            The compat packs' grist costs
+        grist_costs: mapping
+            Grist cost of each item of the base data by id
+        item_names: mapping
+            Display names of the base data's items by id
+        max_sets: int
+            How many sets of packs to keep matrices for
+        """
+        self.compat = compat
+        self.grist_costs = grist_costs
+        self.item_names = item_names
+        self.max_sets = max_sets
+        self._indexes: "OrderedDict[Tuple[str, ...], Tuple[GristCostMatrix, GristTypeIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def indexes(self, packs: Iterable[str]) -> Tuple[GristCostMatrix, GristTypeIndex]:
+        """The grist cost matrix and type index of the base data plus ``packs``."""
+        key = tuple(sorted(pack for pack in set(packs) if pack in self.compat.names))
+        with self._lock:
+            indexes = self._indexes.get(key)
+            if indexes is None:
+                costs = {}
+                names = dict(self.item_names)
+                for item_id, cost in self.compat.grist_costs(key).items():
+                    namespace, _, path = item_id.partition(':')
+                    if namespace not in _BASE_NAMESPACES:
+                        names[item_id] = compat_item_name(item_id)
+                        path = item_id
+                    costs[path] = cost
+                costs.update(self.grist_costs)
+                matrix = GristCostMatrix(costs, names)
+                indexes = (matrix, GristTypeIndex(matrix))
+                self._indexes[key] = indexes
+                while len(self._indexes) > self.max_sets:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(key)
+            return indexes
+
+
+class CompatSettings:
+    """
+    The compat packs each guild enabled, saved to a JSON file.
+
+    A guild that never picked any has none enabled, so other mods' items
+    only show up in servers that asked for them. Direct messages, where
+    nobody can pick, see every pack.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self._guilds: Dict[str, List[str]] = {guild: list(packs) for guild, packs in data.get('guilds', {}).items()}
+
+    def enabled(self, guild_id: Optional[int], available: Sequence[str]) -> List[str]:
+        """The packs enabled in a guild, out of ``available``; in direct messages, all of them."""
+        if guild_id is None:
+            return list(available)
+        packs = self._guilds.get(str(guild_id), ())
+        return [pack for pack in available if pack in packs]
+
+    def set_enabled(self, guild_id: int, packs: Optional[Iterable[str]]) -> None:
+        """Enable exactly ``packs`` in a guild; None goes back to the default of none."""
+        with self._lock:
+            if packs is None:
+                self._guilds.pop(str(guild_id), None)
+            else:
+                self._guilds[str(guild_id)] = sorted(set(packs))
+            write_json_file(self.path, {'guilds': self._guilds}, indent=2, sort_keys=True)
@@ -0,0 +1,635 @@
+"""
+Repository layer between the bot's commands and the item/description data.
+Data can come from the JSON files in memory or from a SQLite database with FTS5 search indexes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from alchemy_graph import AlchemyGraph
+from alchemy_route import RoutePlanner
+from autocomplete_cache import AutocompleteCache
+from captcha import CaptchaTables, item_captcha_tables
+from compat import CompatGristCosts, CompatIndex
+from fuzzy_search import FuzzyIndex
+from grist_matrix import GristCostMatrix, GristTypeIndex
+from localization import LocaleCatalog, LocaleTable
+from search_index import (DescriptionIndex, SubstringIndex, build_item_fuzzy_index, build_item_index,
+                          truncate_choice_name)
+from similar_items import SimilarityIndex
+from stat_index import ITEM_FIELDS, StatIndex
+
+# Trigram FTS5 phrase queries need at least this many characters
+_MIN_FTS_QUERY = 3
+
+
+def _with_fuzzy_matches(results: List[Tuple[str, str]], limit: int,
+                        search_fuzzy: Callable[[int, List[str]], List[Tuple[str, str]]]) -> List[Tuple[str, str]]:
+    """Fill the slots left over by an exact search with typo-tolerant matches."""
+    if len(results) >= limit:
+        return results
+    exact_values = [value for _, value in results]
+    return results + search_fuzzy(limit - len(results), exact_values)
+
+
+def _load_locale_file(locale_file: Path) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Read the (names, tooltips) of one locale from a locale_<locale>.json file."""
+    with open(locale_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('names', {}), data.get('tooltips', {})
+
+
+class JsonRepository:
+    """
+    Serves items and descriptions from dicts loaded out of the JSON files.
+
+    Searches go through the prebuilt in-memory indexes. When a session key is
+    given, exact searches also go through the per-user autocomplete cache.
+    """
+
+    def __init__(self, items: Dict[str, Dict[str, Any]], descriptions: Dict[str, Dict[str, Any]],
+                 autocomplete_cache: AutocompleteCache, combinations: Sequence[Sequence[str]] = (),
+                 grist_costs: Optional[Dict[str, Dict[str, int]]] = None,
+                 locale_files: Optional[Mapping[str, Path]] = None,
+                 compat_packs: Optional[Dict[str, Dict[str, Any]]] = None,
+                 item_tags: Optional[Dict[str, List[str]]] = None):
+        self.items = items
+        self.descriptions = descriptions
+        self.item_index = build_item_index(items)
+        self.item_fuzzy_index = build_item_fuzzy_index(items)
+        self.description_index = DescriptionIndex(descriptions)
+        item_names = {item_id: item_data.get('name', item_id) for item_id, item_data in items.items()}
+        self.alchemy = AlchemyGraph(combinations, item_names)
+        self.route_planner = RoutePlanner(self.alchemy, grist_costs or {}, item_tags)
+        self.grist_costs = GristCostMatrix(grist_costs or {}, item_names)
+        self.grist_index = GristTypeIndex(self.grist_costs)
+        self.stats = StatIndex(items)
+        self.similarity = SimilarityIndex(items)
+        locale_files = dict(locale_files or {})
+        self.locale_catalog = LocaleCatalog(locale_files, lambda locale: _load_locale_file(locale_files[locale]),
+                                            lambda: item_names)
+        self.compat = CompatIndex(compat_packs or {})
+        self.compat_grist = CompatGristCosts(self.compat, grist_costs or {}, item_names)
+        self.captchas = item_captcha_tables(items)
+        self._autocomplete_cache = autocomplete_cache
+
+    def item_count(self) -> int:
+        return len(self.items)
+
+    def topic_count(self) -> int:
+        return len(self.descriptions)
+
+    def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return self.items.get(item_id)
+
+    def get_topic(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        return self.descriptions.get(topic_id)
+
+    def alchemy_graph(self) -> AlchemyGraph:
+        return self.alchemy
+
+    def alchemy_route_planner(self) -> RoutePlanner:
+        return self.route_planner
+
+    def grist_cost_matrix(self) -> GristCostMatrix:
+        return self.grist_costs
+
+    def grist_type_index(self) -> GristTypeIndex:
+        return self.grist_index
+
+    def grist_indexes(self, packs: Sequence[str]) -> Tuple[GristCostMatrix, GristTypeIndex]:
+        """The grist cost matrix and type index with the costs of the compat ``packs`` added."""
+        if not packs:
+            return self.grist_costs, self.grist_index
+        return self.compat_grist.indexes(packs)
+
+    def stat_index(self) -> StatIndex:
+        return self.stats
+
+    def similarity_index(self) -> SimilarityIndex:
+        return self.similarity
+
+    def locales(self) -> List[str]:
+        return self.locale_catalog.available()
+
+    def locale_table(self, locale: str) -> Optional[LocaleTable]:
+        return self.locale_catalog.table(locale)
+
+    def compat_index(self) -> CompatIndex:
+        return self.compat
+
+    def captcha_tables(self) -> CaptchaTables:
+        return self.captchas
+
+    def _search(self, session: Optional[Hashable], index: SubstringIndex, query: str,
+                limit: int) -> List[Tuple[str, str]]:
+        if session is None:
+            return index.search(query, limit)
+        return self._autocomplete_cache.search(session, index, query, limit)
+
+    def search_items(self, query: str, limit: int, session: Optional[Hashable] = None,
+                     locale: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Exact substring matches on item names and ids, padded with fuzzy matches.
+        For a non-default ``locale``, matches localized names as well and returns them.
+        """
+        table = self.locale_catalog.table(locale) if locale else None
+        if table is not None:
+            return self._search(session, table.index, query, limit)
+        results = self._search(session, self.item_index, query, limit)
+        return _with_fuzzy_matches(results, limit, lambda count, exclude:
+                                   self.item_fuzzy_index.search(query, count, exclude=exclude))
+
+    def search_topics(self, query: str, limit: int, session: Optional[Hashable] = None) -> List[Tuple[str, str]]:
+        """Exact substring matches on topics and subtopics, padded with fuzzy matches."""
+        results = self._search(session, self.description_index.topic_index, query, limit)
+        return _with_fuzzy_matches(results, limit, lambda count, exclude:
+                                   self.description_index.fuzzy_topic_index.search(query, count, exclude=exclude))
+
+    def search_subtopics(self, topic_id: str, query: str, limit: int,
+                         session: Optional[Hashable] = None) -> List[Tuple[str, str]]:
+        """Exact substring matches on the subtopics of one topic."""
+        index = self.description_index.subtopic_index(topic_id)
+        if index is None:
+            return []
+        return self._search(session, index, query, limit)
+
+    def search_alchemy_items(self, query: str, limit: int,
+                             session: Optional[Hashable] = None) -> List[Tuple[str, str]]:
+        """Exact substring matches on the items and tags that appear in combination recipes."""
+        return self._search(session, self.alchemy.index, query, limit)
+
+
+class SqliteRepository:
+    """
+    Serves items and descriptions from the SQLite database written by the parse scripts.
+
+    Records are only decoded when a command asks for them, and substring
+    searches run inside the database against trigram FTS5 indexes, so
+    startup cost and memory use don't grow with the data. Autocomplete
+    sessions are the exception: they narrow their previous keystroke's
+    matches through the autocomplete cache, over item and topic indexes
+    built on first use from the name and id columns alone. Each thread gets
+    its own read-only connection to the database file the repository was
+    opened on. The parse scripts replace that file rather than rewrite it,
+    so once it has been replaced, queries go through a connection opened up
+    front, which still reads the old file, and a snapshot never sees a
+    newer or half-written database. The combination graph, the grist cost
+    matrix and its per-type index, the stat columns and neighbour table
+    behind /search and /similar, the compat packs, the captcha code tables
+    and the fuzzy search indexes over names and ids are small and are always
+    used as a whole, so they are read into memory on first use, each from
+    only the columns and record fields it needs.
+    """
+
+    def __init__(self, db_path: Path, autocomplete_cache: Optional[AutocompleteCache] = None):
+        self.db_path = db_path
+        self._local = threading.local()
+        # The file this repository serves, and a connection to it that keeps working after it is replaced
+        self._file, self._pinned = _open_identified(db_path, check_same_thread=False)
+        self._pinned_lock = threading.Lock()
+        self._autocomplete_cache = autocomplete_cache
+        self._alchemy: Optional[AlchemyGraph] = None
+        self._route_planner: Optional[RoutePlanner] = None
+        self._grist_costs: Optional[GristCostMatrix] = None
+        self._grist_index: Optional[GristTypeIndex] = None
+        self._stats: Optional[StatIndex] = None
+        self._similarity: Optional[SimilarityIndex] = None
+        self._compat: Optional[CompatIndex] = None
+        self._compat_grist: Optional[CompatGristCosts] = None
+        self._captchas: Optional[CaptchaTables] = None
+        self._item_index: Optional[SubstringIndex] = None
+        self._topic_index: Optional[SubstringIndex] = None
+        self._item_fuzzy: Optional[FuzzyIndex] = None
+        self._topic_fuzzy: Optional[FuzzyIndex] = None
+        self.locale_catalog = LocaleCatalog(self._locale_names(), self._locale_strings,
+                                            lambda: dict(self._query("SELECT id, name FROM items")))
+        self._load_lock = threading.Lock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """This thread's connection, or None once the database file has been replaced."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None and not getattr(self._local, 'replaced', False):
+            if _file_identity(self.db_path) == self._file:
+                identity, connection = _open_identified(self.db_path)
+                if identity != self._file:
+                    connection.close()
+                    connection = None
+            self._local.connection = connection
+            self._local.replaced = connection is None
+        return connection
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        connection = self._connection()
+        if connection is None:
+            with self._pinned_lock:
+                return self._pinned.execute(sql, params).fetchall()
+        return connection.execute(sql, params).fetchall()
+
+    def item_count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM items")[0][0]
+
+    def topic_count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM topics WHERE subtopic_id IS NULL")[0][0]
+
+    def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT data FROM items WHERE id = ?", (item_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_topic(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT data FROM topics WHERE value = ? AND subtopic_id IS NULL", (topic_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def alchemy_graph(self) -> AlchemyGraph:
+        with self._load_lock:
+            if self._alchemy is None:
+                try:
+                    combinations = self._query("SELECT input1, input2, mode, output FROM combinations ORDER BY rowid")
+                except sqlite3.OperationalError:
+                    # Written by an older parse_items.py, before combinations were stored
+                    combinations = []
+                self._alchemy = AlchemyGraph(combinations, dict(self._query("SELECT id, name FROM items")))
+            return self._alchemy
+
+    def _grist_cost_rows(self) -> Dict[str, Dict[str, int]]:
+        try:
+            rows = self._query("SELECT item_id, data FROM grist_costs")
+        except sqlite3.OperationalError:
+            # Written by an older parse_items.py, before all grist costs were stored
+            rows = []
+        return {item_id: json.loads(data) for item_id, data in rows}
+
+    def alchemy_route_planner(self) -> RoutePlanner:
+        graph = self.alchemy_graph()
+        with self._load_lock:
+            if self._route_planner is None:
+                try:
+                    rows = self._query("SELECT tag, item_id FROM item_tags ORDER BY rowid")
+                except sqlite3.OperationalError:
+                    # Written by an older parse_items.py, before ingredient tags were stored
+                    rows = []
+                item_tags: Dict[str, List[str]] = {}
+                for tag, item_id in rows:
+                    item_tags.setdefault(tag, []).append(item_id)
+                self._route_planner = RoutePlanner(graph, self._grist_cost_rows(), item_tags)
+            return self._route_planner
+
+    def grist_cost_matrix(self) -> GristCostMatrix:
+        with self._load_lock:
+            if self._grist_costs is None:
+                self._grist_costs = GristCostMatrix(self._grist_cost_rows(),
+                                                    dict(self._query("SELECT id, name FROM items")))
+            return self._grist_costs
+
+    def grist_type_index(self) -> GristTypeIndex:
+        costs = self.grist_cost_matrix()
+        with self._load_lock:
+            if self._grist_index is None:
+                self._grist_index = GristTypeIndex(costs)
+            return self._grist_index
+
+    def grist_indexes(self, packs: Sequence[str]) -> Tuple[GristCostMatrix, GristTypeIndex]:
+        """The grist cost matrix and type index with the costs of the compat ``packs`` added."""
+        if not packs:
+            return self.grist_cost_matrix(), self.grist_type_index()
+        compat = self.compat_index()
+        with self._load_lock:
+            if self._compat_grist is None:
+                self._compat_grist = CompatGristCosts(compat, self._grist_cost_rows(),
+                                                      dict(self._query("SELECT id, name FROM items")))
+        return self._compat_grist.indexes(packs)
+
+    def _cached_session(self, session: Optional[Hashable]) -> bool:
+        """Whether searches for ``session`` go through the autocomplete cache."""
+        return session is not None and self._autocomplete_cache is not None
+
+    def _search(self, session: Optional[Hashable], index: SubstringIndex, query: str,
+                limit: int) -> List[Tuple[str, str]]:
+        # Searches over the in-memory indexes; the others run inside the database
+        if not self._cached_session(session):
+            return index.search(query, limit)
+        return self._autocomplete_cache.search(session, index, query, limit)
+
+    def _locale_names(self) -> List[str]:
+        try:
+            return [locale for locale, in self._query("SELECT DISTINCT locale FROM locale_strings")]
+        except sqlite3.OperationalError:
+            # Written by an older parse_items.py, before lang files were read
+            return []
+
+    def _locale_strings(self, locale: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        rows = self._query("SELECT item_id, name, tooltip FROM locale_strings WHERE locale = ?", (locale,))
+        names = {item_id: name for item_id, name, _ in rows if name}
+        tooltips = {item_id: tooltip for item_id, _, tooltip in rows if tooltip}
+        return names, tooltips
+
+    def locales(self) -> List[str]:
+        return self.locale_catalog.available()
+
+    def locale_table(self, locale: str) -> Optional[LocaleTable]:
+        return self.locale_catalog.table(locale)
+
+    def compat_index(self) -> CompatIndex:
+        with self._load_lock:
+            if self._compat is None:
+                try:
+                    rows = self._query("SELECT pack_id, data FROM compat_packs")
+                except sqlite3.OperationalError:
+                    # Written by an older parse_items.py, before compat packs were read
+                    rows = []
+                self._compat = CompatIndex({pack: json.loads(data) for pack, data in rows})
+            return self._compat
+
+    def _item_fields(self, fields: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Every item record cut down to ``fields``, which the database extracts, so the rest is never decoded."""
+        pairs = ', '.join(f"'{field}', json_extract(data, '$.{field}')" for field in fields)
+        # json_patch drops the fields an item doesn't have, instead of keeping them as nulls
+        rows = self._query(f"SELECT id, json_patch('{{}}', json_object({pairs})) FROM items")
+        return {item_id: json.loads(data) for item_id, data in rows}
+
+    def stat_index(self) -> StatIndex:
+        with self._load_lock:
+            if self._stats is None:
+                self._stats = StatIndex(self._item_fields(ITEM_FIELDS))
+            return self._stats
+
+    def similarity_index(self) -> SimilarityIndex:
+        with self._load_lock:
+            if self._similarity is None:
+                self._similarity = SimilarityIndex(self._item_fields(ITEM_FIELDS))
+            return self._similarity
+
+    def captcha_tables(self) -> CaptchaTables:
+        with self._load_lock:
+            if self._captchas is None:
+                self._captchas = item_captcha_tables(self._item_fields(('captcha',)))
+            return self._captchas
+
+    def _substring_search(self, select: str, table: str, fts: str, where: str, params: Tuple,
+                          order: str, query: str, limit: int) -> List[Tuple[str, str]]:
+        """Rows whose lowercased name or id key contains the query, in display order."""
+        query = query.lower()
+        sql = f"SELECT {select} FROM {fts} f JOIN {table} t ON t.rowid = f.rowid WHERE {where}"
+        if len(query) >= _MIN_FTS_QUERY:
+            sql += f" AND {fts} MATCH ?"
+            params += ('{name_key id_key} : "' + query.replace('"', '""') + '"',)
+        elif query:
+            sql += " AND (instr(f.name_key, ?) > 0 OR instr(f.id_key, ?) > 0)"
+            params += (query, query)
+        sql += f" ORDER BY {order}, t.rowid LIMIT ?"
+        return self._query(sql, params + (limit,))
+
+    def _item_entries(self) -> List[Tuple[str, str, Tuple[str, str]]]:
+        """(name, id, keys) of every item, like search_index.item_entries, from the name and id columns alone."""
+        rows = self._query("SELECT name, id FROM items ORDER BY rowid")
+        return [(name, item_id, (name, item_id)) for name, item_id in rows]
+
+    def _topic_entries(self) -> List[Tuple[str, str, Tuple[str, str]]]:
+        """(full name, value, keys) of every topic and subtopic, flattened like DescriptionIndex does."""
+        rows = self._query(
+            "SELECT coalesce(p.short_name || ' - ', '') || t.short_name, t.value, t.short_name, "
+            "coalesce(t.subtopic_id, t.topic_id) FROM topics t "
+            "LEFT JOIN topics p ON t.subtopic_id IS NOT NULL AND p.value = t.topic_id ORDER BY t.rowid"
+        )
+        return [(name, value, (short_name, key)) for name, value, short_name, key in rows]
+
+    def item_index(self) -> SubstringIndex:
+        """The /item autocomplete index over item names and ids, for autocomplete sessions."""
+        with self._load_lock:
+            if self._item_index is None:
+                self._item_index = SubstringIndex(self._item_entries())
+            return self._item_index
+
+    def topic_index(self) -> SubstringIndex:
+        """The /description topic autocomplete index, for autocomplete sessions."""
+        with self._load_lock:
+            if self._topic_index is None:
+                self._topic_index = SubstringIndex(self._topic_entries(), label=truncate_choice_name)
+            return self._topic_index
+
+    def item_fuzzy_index(self) -> FuzzyIndex:
+        """The typo-tolerant index over item names and ids."""
+        with self._load_lock:
+            if self._item_fuzzy is None:
+                self._item_fuzzy = FuzzyIndex(self._item_entries())
+            return self._item_fuzzy
+
+    def topic_fuzzy_index(self) -> FuzzyIndex:
+        """The typo-tolerant index over topics and subtopics."""
+        with self._load_lock:
+            if self._topic_fuzzy is None:
+                self._topic_fuzzy = FuzzyIndex(self._topic_entries(), label=truncate_choice_name)
+            return self._topic_fuzzy
+
+    def search_items(self, query: str, limit: int, session: Optional[Hashable] = None,
+                     locale: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Exact substring matches on item names and ids, padded with fuzzy matches.
+        For a non-default ``locale``, matches localized names as well and returns them.
+        """
+        table = self.locale_catalog.table(locale) if locale else None
+        if table is not None:
+            return self._search(session, table.index, query, limit)
+        if self._cached_session(session):
+            results = self._search(session, self.item_index(), query, limit)
+        else:
+            results = self._substring_search("t.name, t.id", "items", "items_fts", "1", (),
+                                             "t.sort_key", query, limit)
+        return _with_fuzzy_matches(results, limit, lambda count, exclude:
+                                   self.item_fuzzy_index().search(query, count, exclude=exclude))
+
+    def search_topics(self, query: str, limit: int, session: Optional[Hashable] = None) -> List[Tuple[str, str]]:
+        """Exact substring matches on topics and subtopics, padded with fuzzy matches."""
+        if self._cached_session(session):
+            results = self._search(session, self.topic_index(), query, limit)
+        else:
+            results = self._substring_search("t.label, t.value", "topics", "topics_fts", "1", (),
+                                             "t.sort_key", query, limit)
+        return _with_fuzzy_matches(results, limit, lambda count, exclude:
+                                   self.topic_fuzzy_index().search(query, count, exclude=exclude))
+
+    def search_subtopics(self, topic_id: str, query: str, limit: int,
+                         session: Optional[Hashable] = None) -> List[Tuple[str, str]]:
+        """Exact substring matches on the subtopics of one topic."""
+        return self._substring_search("t.short_name, t.subtopic_id", "topics", "topics_fts",
+                                      "t.topic_id = ? AND t.subtopic_id IS NOT NULL", (topic_id,), "t.short_sort_key", query, limit)
+
+    def search_alchemy_items(self, query: str, limit: int,
+                             session: Optional[Hashable] = None) -> List[Tuple[str, str]]:
+        """Exact substring matches on the items and tags that appear in combination recipes."""
+        return self._search(session, self.alchemy_graph().index, query, limit)
+
+
+def _file_identity(path: Path) -> Optional[Tuple[int, int]]:
+    """The (device, inode) of a file, which changes when the file is replaced; None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _open_identified(db_path: Path, **options: Any) -> Tuple[Optional[Tuple[int, int]], sqlite3.Connection]:
+    """A read-only connection to the database, and the identity of the file it has open."""
+    while True:
+        identity = _file_identity(db_path)
+        connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, **options)
+        # Reading the schema makes SQLite open the file now
+        connection.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        # Unchanged across the open, so the connection has that very file open
+        if _file_identity(db_path) == identity:
+            return identity, connection
+        connection.close()
+
+
+@contextmanager
+def rebuild_database(db_path: Path) -> Iterator[Path]:
+    """
+    Stage changes to the SQLite database in a copy, then swap the copy in.
+
+    Yields the path of ``<db_path>.tmp``, a copy of the current database, so
+    the tables the caller doesn't rewrite are kept. Once the block finishes
+    the copy replaces ``db_path`` in one rename, so the bot never opens a
+    database with tables missing or half-filled. If the block raises, the
+    copy is deleted and the database is left as it was.
+    """
+    temp_path = db_path.with_name(db_path.name + '.tmp')
+    temp_path.unlink(missing_ok=True)
+    if db_path.exists():
+        source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        target = sqlite3.connect(temp_path)
+        source.backup(target)
+        target.close()
+        source.close()
+    try:
+        yield temp_path
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    os.replace(temp_path, db_path)
+
+
+def _create_fts_table(connection: sqlite3.Connection, name: str, text_column: str) -> None:
+    connection.execute(f"DROP TABLE IF EXISTS {name}")
+    connection.execute(f"CREATE VIRTUAL TABLE {name} USING fts5(name_key, id_key, {text_column}, tokenize='trigram')")
+
+
+def write_items_table(db_path: Path, items: Dict[str, Dict[str, Any]]) -> None:
+    """Replace the items table and its FTS5 index in the SQLite database."""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS items")
+        connection.execute("CREATE TABLE items (id TEXT PRIMARY KEY, name TEXT, sort_key TEXT, data TEXT)")
+        _create_fts_table(connection, 'items_fts', 'attributes')
+
+        for item_id, item_data in items.items():
+            item_name = item_data.get('name', item_id)
+            cursor = connection.execute(
+                "INSERT INTO items (id, name, sort_key, data) VALUES (?, ?, ?, ?)",
+                (item_id, item_name, item_name.lower(), json.dumps(item_data))
+            )
+            connection.execute(
+                "INSERT INTO items_fts (rowid, name_key, id_key, attributes) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, item_name.lower(), item_id.lower(), '\n'.join(item_data.get('attributes', [])))
+            )
+    connection.close()
+
+
+def write_combinations_table(db_path: Path, combinations: Sequence[Sequence[str]]) -> None:
+    """Replace the combinations table in the SQLite database."""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS combinations")
+        connection.execute("CREATE TABLE combinations (input1 TEXT, input2 TEXT, mode TEXT, output TEXT)")
+        connection.executemany("INSERT INTO combinations (input1, input2, mode, output) VALUES (?, ?, ?, ?)",
+                               combinations)
+    connection.close()
+
+
+def write_item_tags_table(db_path: Path, item_tags: Dict[str, List[str]]) -> None:
+    """Replace the item_tags table in the SQLite database, one row per item of each tag."""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS item_tags")
+        connection.execute("CREATE TABLE item_tags (tag TEXT, item_id TEXT)")
+        connection.executemany("INSERT INTO item_tags (tag, item_id) VALUES (?, ?)",
+                               ((tag, item_id) for tag, items in item_tags.items() for item_id in items))
+    connection.close()
+
+
+def write_grist_costs_table(db_path: Path, grist_costs: Dict[str, Dict[str, int]]) -> None:
+    """Replace the grist_costs table in the SQLite database."""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS grist_costs")
+        connection.execute("CREATE TABLE grist_costs (item_id TEXT PRIMARY KEY, data TEXT)")
+        connection.executemany("INSERT INTO grist_costs (item_id, data) VALUES (?, ?)",
+                               ((item_id, json.dumps(cost)) for item_id, cost in grist_costs.items()))
+    connection.close()
+
+
+def write_locale_strings_table(db_path: Path,
+                               locale_strings: Dict[str, Tuple[Dict[str, str], Dict[str, str]]]) -> None:
+    """Replace the locale_strings table in the SQLite database with each locale's (names, tooltips)."""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS locale_strings")
+        connection.execute("CREATE TABLE locale_strings (locale TEXT, item_id TEXT, name TEXT, tooltip TEXT, "
+                           "PRIMARY KEY (locale, item_id))")
+        connection.executemany(
+            "INSERT INTO locale_strings (locale, item_id, name, tooltip) VALUES (?, ?, ?, ?)",
+            ((locale, item_id, names.get(item_id), tooltips.get(item_id))
+             for locale, (names, tooltips) in locale_strings.items()
+             for item_id in sorted(set(names) | set(tooltips)))
+        )
+    connection.close()
+
+
+def write_compat_packs_table(db_path: Path, compat_packs: Dict[str, Dict[str, Any]]) -> None:
+    """Replace the compat_packs table in the SQLite database, one row of JSON per pack."""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS compat_packs")
+        connection.execute("CREATE TABLE compat_packs (pack_id TEXT PRIMARY KEY, data TEXT)")
+        connection.executemany("INSERT INTO compat_packs (pack_id, data) VALUES (?, ?)",
+                               ((pack, json.dumps(data)) for pack, data in compat_packs.items()))
+    connection.close()
+
+
+def write_descriptions_tables(db_path: Path, descriptions: Dict[str, Dict[str, Any]]) -> None:
+    """Replace the topics table and its FTS5 index in the SQLite database."""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS topics")
+        connection.execute(
+            "CREATE TABLE topics (value TEXT PRIMARY KEY, topic_id TEXT, subtopic_id TEXT, label TEXT, "
+            "sort_key TEXT, short_name TEXT, short_sort_key TEXT, data TEXT)"
+        )
+        _create_fts_table(connection, 'topics_fts', 'description')
+
+        def insert(value, topic_id, subtopic_id, name, short_name, data):
+            cursor = connection.execute(
+                "INSERT INTO topics (value, topic_id, subtopic_id, label, sort_key, short_name, short_sort_key, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (value, topic_id, subtopic_id, truncate_choice_name(name), name.lower(),
+                 short_name, short_name.lower(), json.dumps(data))
+            )
+            connection.execute(
+                "INSERT INTO topics_fts (rowid, name_key, id_key, description) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, short_name.lower(), (subtopic_id or topic_id).lower(), data.get('description', ''))
+            )
+
+        # Same flattened order as DescriptionIndex, so ties sort the same way
+        for topic_id, topic_data in descriptions.items():
+            topic_name = topic_data.get('name', topic_id)
+            insert(topic_id, topic_id, None, topic_name, topic_name, topic_data)
+            for subtopic_id, subtopic_data in topic_data.get('subtopics', {}).items():
+                subtopic_name = subtopic_data.get('name', subtopic_id)
+                insert(f"{topic_id}:{subtopic_id}", topic_id, subtopic_id,
+                       f"{topic_name} - {subtopic_name}", subtopic_name, subtopic_data)
+    connection.close()
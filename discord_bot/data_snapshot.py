@@ -0,0 +1,143 @@
+"""
+Versioned snapshots of the bot's item and description data.
+Rebuilds the data off the event loop when its files change, and swaps the new snapshot in atomically.
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+# Seconds between checks of the data files for changes
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+def file_stamps(paths: Sequence[Path]) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """The (mtime_ns, size) of each file, or None for files that don't exist."""
+    stamps = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stamps.append(None)
+        else:
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+class DataSnapshot:
+    """
+    One consistent view of the data: a repository and the file stamps it was loaded from.
+
+    Snapshots are not modified after they are built. A command should read
+    ``SnapshotManager.current`` once and use that snapshot throughout, so a
+    reload landing mid-command never mixes old and new data. ``version``
+    goes up by one with every reload, which makes it a cache key that
+    invalidates itself.
+    """
+
+    def __init__(self, version: int, repository: Any, stamps: Tuple[Optional[Tuple[int, int]], ...]):
+        self.version = version
+        self.repository = repository
+        self.stamps = stamps
+        self.loaded_at = time.time()
+
+
+class SnapshotManager:
+    """
+    Holds the current DataSnapshot and replaces it when the data files change.
+
+    New snapshots are built in a worker thread while commands keep using the
+    current one, then swapped in with a single assignment. If a build fails,
+    e.g. because a parser script is halfway through writing a file, the
+    current snapshot stays in place.
+    """
+
+    def __init__(self, files: Sequence[Path], load: Callable[[], Any], preload: bool = True):
+        """
+        Load the first snapshot synchronously, or leave it to ``start``.
+
+        Parameters:
+        -----------
+        files: sequence of Path
+            Data files to watch; a change to any of them triggers a reload
+        load: callable
+            Reads the files and returns a repository; runs in a worker thread on reloads
+        preload: bool
+            Load the first snapshot now. When False, ``current`` is None until
+            ``start`` has loaded it in a worker thread
+        """
+        self.files = tuple(files)
+        self._load = load
+        self._lock = asyncio.Lock()
+        self._ready = asyncio.Event()
+        self.current: Optional[DataSnapshot] = None
+        if preload:
+            self.current = self._build(1)
+            self._ready.set()
+
+    def _build(self, version: int) -> DataSnapshot:
+        # Stamp before reading, so a write that lands mid-load is picked up by the next check
+        stamps = file_stamps(self.files)
+        return DataSnapshot(version, self._load(), stamps)
+
+    async def reload(self) -> DataSnapshot:
+        """
+        Build a new snapshot off the event loop and make it current.
+
+        Concurrent calls are serialized. Errors from ``load`` are raised to the
+        caller and leave the current snapshot in place.
+        """
+        async with self._lock:
+            start = time.perf_counter()
+            version = self.current.version + 1 if self.current is not None else 1
+            snapshot = await asyncio.to_thread(self._build, version)
+            self.current = snapshot
+            self._ready.set()
+            log.info("Loaded data version %d in %.1f ms", snapshot.version, (time.perf_counter() - start) * 1000)
+            return snapshot
+
+    async def start(self) -> DataSnapshot:
+        """
+        Load the first snapshot off the event loop, so the bot can log in meanwhile.
+
+        Commands that arrive before it is loaded wait on ``wait_ready``. If
+        the load fails, the error is raised and the watcher retries once
+        the data files change.
+        """
+        return await self.reload()
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to ``timeout`` seconds for the first snapshot; returns whether one is loaded."""
+        if self.current is not None:
+            return True
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def watch(self, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """
+        Reload whenever the data files change, until cancelled.
+
+        A file set that failed to load is not retried until it changes again.
+        """
+        failed_stamps = None
+        while True:
+            await asyncio.sleep(interval)
+            stamps = file_stamps(self.files)
+            current = self.current
+            if (current is not None and stamps == current.stamps) or stamps == failed_stamps:
+                continue
+            try:
+                await self.reload()
+            except Exception as e:
+                failed_stamps = stamps
+                if current is None:
+                    log.warning("Still waiting for the first data snapshot, load failed: %s", e)
+                else:
+                    log.warning("Keeping data version %d, reload failed: %s", current.version, e)
@@ -0,0 +1,80 @@
+"""
+Cache of rendered /item and /description embeds.
+The item and description data only change between reloads, so each embed is rendered once.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import discord
+
+# Embeds kept at once; keys include user input such as /search queries and /captcha seeds,
+# so the least recently used embed is dropped once there are more
+DEFAULT_MAX_EMBEDS = 2048
+
+
+class EmbedCache:
+    """
+    Bounded LRU cache of rendered embeds, keyed by whatever identifies the embed.
+
+    Every lookup passes the version of the data snapshot it was rendered from.
+    When a newer version comes along all cached embeds are dropped, so embeds
+    never outlive the data they were built from. Versions only go up, as
+    snapshot versions do: a lookup for an older version, e.g. a command that
+    started just before a reload, renders its embed without caching it.
+
+    Lookups come from worker threads, so the version and the entries are
+    guarded by a lock. Rendering happens outside the lock; if the version
+    moved on meanwhile, the embed is returned but not stored. The same
+    ``discord.Embed`` object is handed out on every hit, so callers must send
+    it as-is and never modify it.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_EMBEDS):
+        self.max_entries = max_entries
+        self._version: Hashable = None
+        self._embeds: "OrderedDict[Hashable, discord.Embed]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._embeds)
+
+    def get(self, version: Hashable, key: Hashable, render: Callable[[], discord.Embed]) -> discord.Embed:
+        """
+        Return the cached embed for ``key``, rendering it on first use.
+
+        Parameters:
+        -----------
+        version: hashable
+            Version of the data the embed is rendered from
+        key: hashable
+            Identifies the embed, e.g. ('item', item_id)
+        render: callable
+            Builds the embed when it isn't cached yet
+        """
+        with self._lock:
+            if version != self._version and (self._version is None or version > self._version):
+                self._embeds.clear()
+                self._version = version
+            if version == self._version:
+                embed = self._embeds.get(key)
+                if embed is not None:
+                    self._embeds.move_to_end(key)
+                    return embed
+
+        embed = render()
+        with self._lock:
+            if version != self._version:
+                return embed
+            # Another thread may have rendered the same embed meanwhile; keep the first
+            embed = self._embeds.setdefault(key, embed)
+            self._embeds.move_to_end(key)
+            while len(self._embeds) > self.max_entries:
+                self._embeds.popitem(last=False)
+        return embed
+
+    def clear(self) -> None:
+        """Drop every cached embed."""
+        with self._lock:
+            self._embeds.clear()
@@ -0,0 +1,237 @@
+"""
+Typo-tolerant search for the bot's autocomplete handlers.
+Finds entries whose names approximately contain the query, ranked by edit distance.
+"""
+
+import heapq
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# At most this many candidates are scored with the edit-distance check
+MAX_CANDIDATES = 64
+
+
+def normalize(text: str) -> str:
+    """Lowercase a name or id and treat underscores as spaces."""
+    return text.lower().replace('_', ' ')
+
+
+def bigrams(text: str) -> List[str]:
+    """Return the two-character substrings of ``text``, repeats included."""
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def max_distance(query: str) -> int:
+    """How many edits a query of this length may contain and still match."""
+    if len(query) < 4:
+        return 0
+    if len(query) < 6:
+        return 1
+    if len(query) < 9:
+        return 2
+    return 3
+
+
+def required_bigrams(query: str, allowed: int) -> int:
+    """
+    How many of the query's bigrams any key within ``allowed`` edits contains.
+
+    A substitution, insertion or deletion breaks at most two of the query's
+    bigrams, and a swap of adjacent characters three. At 0 or below the
+    bigrams can't rule any key out.
+    """
+    return len(query) - 1 - 3 * allowed
+
+
+def required_characters(query: str, allowed: int) -> int:
+    """How many of the query's distinct characters any key within ``allowed`` edits contains."""
+    return len(set(query)) - allowed
+
+
+def candidate_order(shared_bigrams: int, shared_characters: int, key: str) -> Tuple[int, int, int, str]:
+    """
+    Sort key putting the most promising candidates first: most shared bigrams,
+    then most shared characters, then the shortest key, then the key itself.
+    """
+    return (-shared_bigrams, -shared_characters, len(key), key)
+
+
+def substring_distance(query: str, text: str, limit: int, anchored: bool = False) -> int:
+    """
+    Edit distance between ``query`` and the closest substring of ``text``.
+
+    Counts insertions, deletions, substitutions and swaps of adjacent
+    characters. With ``anchored`` the substring must start at the beginning of
+    ``text``, which gives the distance to the closest prefix instead.
+    Returns ``limit + 1`` when the distance exceeds ``limit``.
+
+    Uses Myers' bit-parallel algorithm with Hyyrö's extension for swaps: each
+    column of the edit distance table is a pair of bit vectors, one bit per
+    query character, updated with a handful of integer operations per
+    character of ``text``.
+    """
+    m = len(query)
+    if m == 0:
+        return 0
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    # Bit i of peq[c] is set when query[i] == c
+    peq: Dict[str, int] = {}
+    for i, character in enumerate(query):
+        peq[character] = peq.get(character, 0) | (1 << i)
+
+    # Vertical differences start at +1 per row; row 0 is free unless anchored
+    vp, vn, d0, prev_eq = mask, 0, 0, 0
+    score = best = m
+    for character in text:
+        eq = peq.get(character, 0)
+        swap = (((~d0) & eq) << 1) & prev_eq
+        d0 = ((((eq & vp) + vp) ^ vp) | eq | vn | swap) & mask
+        hp = (vn | ~(d0 | vp)) & mask
+        hn = d0 & vp
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = ((hp << 1) | anchored) & mask
+        hn = (hn << 1) & mask
+        vp = (hn | ~(d0 | hp)) & mask
+        vn = d0 & hp
+        prev_eq = eq
+        best = min(best, score)
+    return min(best, limit + 1)
+
+
+def fuzzy_rank(query: str, key: str, allowed: int) -> Optional[Tuple[int, int]]:
+    """
+    Score a normalized key against a normalized query.
+
+    Returns (edit distance, prefix penalty), where the penalty is 0 when the
+    closest match sits at the start of the key, or None if the key is more
+    than ``allowed`` edits away.
+    """
+    distance = substring_distance(query, key, allowed)
+    if distance > allowed:
+        return None
+    return distance, 0 if substring_distance(query, key, distance, anchored=True) <= distance else 1
+
+
+def rank_candidates(query: str, allowed: int, candidates: Iterable[Tuple[str, str, str, str]],
+                    limit: int, exclude: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Score candidate keys against a normalized query and return the best entries.
+
+    Parameters:
+    -----------
+    query: str
+        The normalized query
+    allowed: int
+        Maximum edit distance for a match
+    candidates: iterable of (name, value, sort name, normalized key)
+        Candidates in the order they should be scored; an entry may appear once per key
+    limit: int
+        Maximum number of (name, value) pairs to return
+    exclude: iterable of str
+        Values to leave out
+    """
+    excluded = set(exclude)
+    best: Dict[str, Tuple[int, int, str]] = {}
+    names: Dict[str, str] = {}
+    for name, value, sort_name, key in candidates:
+        if value in excluded:
+            continue
+
+        score = fuzzy_rank(query, key, allowed)
+        if score is None:
+            continue
+        rank = score + (sort_name,)
+        if value not in best or rank < best[value]:
+            best[value] = rank
+            names[value] = name
+
+    ranked = sorted(best, key=best.get)[:limit]
+    return [(names[value], value) for value in ranked]
+
+
+class FuzzyIndex:
+    """
+    Immutable bigram index ranking entries by approximate substring matches.
+
+    Takes the same (name, value, keys) entries as ``SubstringIndex``. Keys
+    sharing too few of the query's bigrams or characters to be within the
+    allowed edits are ruled out, the ``MAX_CANDIDATES`` keys sharing the most
+    become candidates, and each candidate is scored by the edit distance from
+    the query to the closest part of the key. Keys whose closest match is at
+    their start get a prefix bonus.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Iterable[str]]],
+                 label: Optional[Callable[[str], str]] = None):
+        self._names: List[str] = []
+        self._values: List[str] = []
+        self._sort_names: List[str] = []
+        self._keys: List[str] = []
+        self._key_entries: List[int] = []
+        postings: Dict[str, List[int]] = {}
+        characters: Dict[str, List[int]] = {}
+
+        for entry_id, (name, value, keys) in enumerate(entries):
+            self._names.append(label(name) if label else name)
+            self._values.append(value)
+            self._sort_names.append(name.lower())
+            for key in set(normalize(key) for key in keys):
+                key_id = len(self._keys)
+                self._keys.append(key)
+                self._key_entries.append(entry_id)
+                for gram in set(bigrams(key)):
+                    postings.setdefault(gram, []).append(key_id)
+                for character in set(key):
+                    characters.setdefault(character, []).append(key_id)
+
+        self._postings: Dict[str, Tuple[int, ...]] = {gram: tuple(ids) for gram, ids in postings.items()}
+        self._characters: Dict[str, Tuple[int, ...]] = {character: tuple(ids) for character, ids in characters.items()}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, query: str, limit: int, exclude: Iterable[str] = ()) -> List[Tuple[str, str]]:
+        """
+        Return up to ``limit`` (name, value) pairs approximately matching the query.
+
+        Parameters:
+        -----------
+        query: str
+            The text typed so far
+        limit: int
+            Maximum number of results
+        exclude: iterable of str
+            Values to leave out, e.g. those already found by an exact search
+        """
+        query = normalize(query)
+        allowed = max_distance(query)
+        if allowed == 0 or limit <= 0:
+            return []
+
+        # Count every occurrence of a bigram in the query, as the bound in required_bigrams does
+        shared_bigrams = Counter()
+        for gram in bigrams(query):
+            shared_bigrams.update(self._postings.get(gram, ()))
+        shared_characters = Counter()
+        for character in set(query):
+            shared_characters.update(self._characters.get(character, ()))
+
+        required = required_bigrams(query, allowed)
+        required_shared = required_characters(query, allowed)
+        if required_shared > 0:
+            pool = (key_id for key_id, count in shared_characters.items()
+                    if count >= required_shared and shared_bigrams[key_id] >= required)
+        else:
+            pool = range(len(self._keys))
+        candidates = heapq.nsmallest(MAX_CANDIDATES, pool, key=lambda key_id: candidate_order(
+            shared_bigrams[key_id], shared_characters[key_id], self._keys[key_id]))
+
+        entries = ((self._key_entries[key_id], self._keys[key_id]) for key_id in candidates)
+        return rank_candidates(query, allowed, (
+            (self._names[entry_id], self._values[entry_id], self._sort_names[entry_id], key)
+            for entry_id, key in entries
+        ), limit, exclude)
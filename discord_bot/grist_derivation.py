@@ -0,0 +1,147 @@
+"""
+Estimated grist costs for items that only have combination recipes.
+Costs are NumPy vectors over the grist types, propagated through the combination graph one level at a time.
+"""
+
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+
+class DerivedCosts(NamedTuple):
+    """Estimated costs by item id, the pass each was found in, and the cycles that blocked the rest."""
+    costs: Dict[str, Dict[str, int]]
+    levels: Dict[str, int]
+    cycles: List[List[str]]
+
+
+def cost_matrix(item_ids: Sequence[str], grist_types: Sequence[str],
+                grist_costs: Dict[str, Dict[str, int]]) -> np.ndarray:
+    """Dense items × grist types matrix of the known costs; rows of unknown items are zero."""
+    columns = {grist_type: column for column, grist_type in enumerate(grist_types)}
+    matrix = np.zeros((len(item_ids), len(grist_types)), dtype=np.int64)
+    for row, item_id in enumerate(item_ids):
+        for grist_type, amount in grist_costs.get(item_id, {}).items():
+            matrix[row, columns[grist_type]] = amount
+    return matrix
+
+
+def _cycles(edges: Dict[int, List[int]]) -> List[List[int]]:
+    """Strongly connected components with more than one node or a self-loop (iterative Tarjan)."""
+    index: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    on_stack = set()
+    stack: List[int] = []
+    cycles = []
+
+    for root in sorted(edges):
+        if root in index:
+            continue
+        work = [(root, iter(edges.get(root, ())))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(edges.get(successor, ()))))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in edges.get(node, ()):
+                        cycles.append(sorted(component))
+    return cycles
+
+
+def derive_grist_costs(grist_types: Sequence[str], grist_costs: Dict[str, Dict[str, int]],
+                       combinations: Sequence[Sequence[str]]) -> DerivedCosts:
+    """
+    Estimate grist costs for items made by combination but without a cost of their own.
+
+    An item's estimate is the combined cost of the two ingredients of its
+    cheapest recipe. Items with a known cost are level 0. Each pass takes every
+    recipe whose ingredients are both costed and whose output isn't yet, in a
+    single set of array operations, and costs those outputs. Passes repeat in
+    topological order until nothing changes, so each cost is computed once and
+    reused by later levels. Items still uncosted at the end are either made
+    from uncosted items (e.g. tags) or sit on a cycle. The cycles are reported.
+
+    Parameters:
+    -----------
+    grist_types: sequence of str
+        Grist type names in display form, e.g. 'Build', in the order of GristTypes.java
+    grist_costs: dict
+        Known costs by item id, e.g. {'sord': {'Build': 5}}
+    combinations: sequence of (input1, input2, mode, output)
+        Combination recipes as written by parse_items.py
+    """
+    # Grist types that only appear in cost files still get a column
+    extra_types = sorted({grist_type for cost in grist_costs.values() for grist_type in cost} - set(grist_types))
+    grist_types = list(grist_types) + extra_types
+
+    item_ids = sorted(set(grist_costs).union(*(combination[:2] for combination in combinations),
+                                             (combination[3] for combination in combinations)))
+    rows = {item_id: row for row, item_id in enumerate(item_ids)}
+    matrix = cost_matrix(item_ids, grist_types, grist_costs)
+
+    costed = np.zeros(len(item_ids), dtype=bool)
+    costed[[rows[item_id] for item_id in grist_costs]] = True
+    level = np.full(len(item_ids), -1, dtype=np.int64)
+    level[costed] = 0
+
+    input1 = np.array([rows[combination[0]] for combination in combinations], dtype=np.int64)
+    input2 = np.array([rows[combination[1]] for combination in combinations], dtype=np.int64)
+    output = np.array([rows[combination[3]] for combination in combinations], dtype=np.int64)
+    recipe_order = np.arange(len(combinations))
+
+    current = 0
+    while True:
+        ready = costed[input1] & costed[input2] & ~costed[output]
+        if not ready.any():
+            break
+        current += 1
+
+        candidates = matrix[input1[ready]] + matrix[input2[ready]]
+        outputs = output[ready]
+        # Cheapest recipe per output; ties go to the first recipe in file order
+        order = np.lexsort((recipe_order[ready], candidates.sum(axis=1), outputs))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = outputs[order][1:] != outputs[order][:-1]
+        chosen = order[first]
+
+        matrix[outputs[chosen]] = candidates[chosen]
+        costed[outputs[chosen]] = True
+        level[outputs[chosen]] = current
+
+    derived = np.flatnonzero(level > 0)
+    costs = {
+        item_ids[row]: {grist_types[column]: int(matrix[row, column]) for column in np.flatnonzero(matrix[row])}
+        for row in derived
+    }
+
+    # Uncosted outputs that depend on each other in a loop
+    blocked = ~costed[output]
+    edges: Dict[int, List[int]] = {}
+    for source, target in zip(np.concatenate((input1[blocked], input2[blocked])).tolist(),
+                              np.concatenate((output[blocked], output[blocked])).tolist()):
+        if not costed[source]:
+            edges.setdefault(source, []).append(target)
+    cycles = [[item_ids[row] for row in cycle] for cycle in _cycles(edges)]
+
+    return DerivedCosts(costs, {item_ids[row]: int(level[row]) for row in derived}, cycles)
@@ -0,0 +1,178 @@
+"""
+Dense items × grist types matrix of grist costs, and an inverted index by grist type.
+Answers "what can I afford" with one vectorized comparison and per-type top-k queries from pre-sorted lists.
+"""
+
+import re
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from alchemy_graph import ingredient_name
+
+# "50 build", "build 50", "build: 50" or "build=50"; grist names may contain spaces
+_INVENTORY_PATTERN = re.compile(r'(\d+)\s*([a-z][a-z ]*[a-z])|([a-z][a-z ]*[a-z])\s*[:=]?\s*(\d+)')
+
+
+class AffordableItem(NamedTuple):
+    """An item the inventory covers, with its cost."""
+    item_id: str
+    name: str
+    cost: Dict[str, int]
+    total: int
+
+
+class GristUse(NamedTuple):
+    """An item that costs a grist type, with the amount of that type and its total cost."""
+    item_id: str
+    name: str
+    amount: int
+    total: int
+
+
+def parse_grist_inventory(text: str, grist_types: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Read a grist inventory such as ``"50 build, shale: 20"``.
+
+    Returns the amounts by grist type, in the matrix's spelling, and the
+    names that aren't grist types. Repeated types are added up.
+    """
+    by_name = {grist_type.lower(): grist_type for grist_type in grist_types}
+    inventory: Dict[str, int] = {}
+    unknown = []
+    for part in re.split(r'[,;\n]+', text.lower()):
+        for match in _INVENTORY_PATTERN.finditer(part):
+            amount = int(match.group(1) or match.group(4))
+            name = (match.group(2) or match.group(3)).strip()
+            grist_type = by_name.get(name) or by_name.get(name.removesuffix(' grist'))
+            if grist_type is None:
+                unknown.append(name)
+            else:
+                inventory[grist_type] = inventory.get(grist_type, 0) + amount
+    return inventory, unknown
+
+
+class GristCostMatrix:
+    """
+    Every known grist cost as one row of an int64 matrix, built once per data load.
+
+    Columns are the grist types in alphabetical order. An inventory is
+    affordable for an item when it covers every column of the item's row, so
+    a query is a single ``(matrix <= inventory).all(axis=1)`` over all items.
+    """
+
+    def __init__(self, grist_costs: Mapping[str, Mapping[str, int]], item_names: Mapping[str, str]):
+        """
+        Parameters:
+        -----------
+        grist_costs: mapping
+            Grist cost of each item by id, e.g. {'sord': {'Build': 5}}
+        item_names: mapping
+            Display names of known items by id; other ids are title-cased
+        """
+        costs = {
+            item_id: cost for item_id, cost in grist_costs.items()
+            if isinstance(cost, Mapping) and cost
+        }
+        self.item_ids: List[str] = sorted(costs)
+        self.grist_types: List[str] = sorted({grist_type for cost in costs.values() for grist_type in cost})
+        self.names = [ingredient_name(item_id, item_names) for item_id in self.item_ids]
+
+        columns = {grist_type: column for column, grist_type in enumerate(self.grist_types)}
+        self.matrix = np.zeros((len(self.item_ids), len(self.grist_types)), dtype=np.int64)
+        for row, item_id in enumerate(self.item_ids):
+            for grist_type, amount in costs[item_id].items():
+                self.matrix[row, columns[grist_type]] = amount
+        self.totals = self.matrix.sum(axis=1)
+        # Alphabetical rank of each name, to break ties between equal totals
+        self.name_rank = np.argsort(np.argsort(np.array([name.lower() for name in self.names]), kind='stable'))
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def inventory_vector(self, inventory: Mapping[str, int]) -> np.ndarray:
+        """The inventory as a row over the matrix's grist types; other types are ignored."""
+        return np.array([inventory.get(grist_type, 0) for grist_type in self.grist_types], dtype=np.int64)
+
+    def affordable_mask(self, inventory: Mapping[str, int]) -> np.ndarray:
+        """Boolean array over ``item_ids``: whether the inventory covers each item's cost."""
+        return (self.matrix <= self.inventory_vector(inventory)).all(axis=1)
+
+    def affordable(self, inventory: Mapping[str, int], limit: int) -> Tuple[List[AffordableItem], int]:
+        """
+        The most expensive items the inventory can pay for, and how many items it covers in total.
+
+        Items are ranked by total grist, highest first, then by name.
+        """
+        rows = np.flatnonzero(self.affordable_mask(inventory))
+        order = np.lexsort((self.name_rank[rows], -self.totals[rows]))[:limit]
+        results = []
+        for row in rows[order]:
+            cost = {self.grist_types[column]: int(self.matrix[row, column]) for column in np.flatnonzero(self.matrix[row])}
+            results.append(AffordableItem(self.item_ids[row], self.names[row], cost, int(self.totals[row])))
+        return results, len(rows)
+
+
+class GristTypeIndex:
+    """
+    Inverted index from each grist type to the items whose cost includes it.
+
+    Every list is sorted once when the index is built, by the amount of that
+    grist type and then by name, both highest-first and cheapest-first, and
+    separately for the items that cost nothing but that grist type. A query
+    is a slice of one list, so it takes O(k) for the top k items.
+    """
+
+    def __init__(self, costs: GristCostMatrix):
+        """
+        Parameters:
+        -----------
+        costs: GristCostMatrix
+            The grist costs to index
+        """
+        self.grist_types = costs.grist_types
+        self._by_name = {grist_type.lower(): grist_type for grist_type in self.grist_types}
+        self._most: Dict[str, List[GristUse]] = {}
+        self._cheapest: Dict[str, List[GristUse]] = {}
+        self._most_only: Dict[str, List[GristUse]] = {}
+        self._cheapest_only: Dict[str, List[GristUse]] = {}
+
+        single_type = np.count_nonzero(costs.matrix, axis=1) == 1
+        for column, grist_type in enumerate(self.grist_types):
+            rows = np.flatnonzero(costs.matrix[:, column])
+            amounts = costs.matrix[rows, column]
+            most = rows[np.lexsort((costs.name_rank[rows], -amounts))]
+            cheapest = rows[np.lexsort((costs.name_rank[rows], amounts))]
+
+            def uses(ordered: np.ndarray) -> List[GristUse]:
+                return [GristUse(costs.item_ids[row], costs.names[row], int(costs.matrix[row, column]),
+                                 int(costs.totals[row])) for row in ordered]
+
+            self._most[grist_type] = uses(most)
+            self._cheapest[grist_type] = uses(cheapest)
+            self._most_only[grist_type] = uses(most[single_type[most]])
+            self._cheapest_only[grist_type] = uses(cheapest[single_type[cheapest]])
+
+    def grist_type(self, name: str) -> Optional[str]:
+        """The grist type called ``name``, in any case and with or without a trailing "grist"."""
+        name = name.strip().lower()
+        return self._by_name.get(name) or self._by_name.get(name.removesuffix(' grist'))
+
+    def _uses(self, grist_type: str, cheapest: bool, only: bool) -> List[GristUse]:
+        if only:
+            lists = self._cheapest_only if cheapest else self._most_only
+        else:
+            lists = self._cheapest if cheapest else self._most
+        return lists.get(grist_type, [])
+
+    def most(self, grist_type: str, k: int, only: bool = False) -> List[GristUse]:
+        """The ``k`` items needing the most of ``grist_type``; ``only`` keeps items costing nothing else."""
+        return self._uses(grist_type, False, only)[:k]
+
+    def cheapest(self, grist_type: str, k: int, only: bool = False) -> List[GristUse]:
+        """The ``k`` items needing the least of ``grist_type``; ``only`` keeps items costing nothing else."""
+        return self._uses(grist_type, True, only)[:k]
+
+    def count(self, grist_type: str, only: bool = False) -> int:
+        """How many items cost ``grist_type``, or cost nothing else with ``only``."""
+        return len(self._uses(grist_type, False, only))
@@ -0,0 +1,92 @@
+"""
+Parallel ingestion of datapack JSON directories.
+Walks a directory tree recursively and parses its files on a thread pool, streaming results back in a stable order.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from build_manifest import BuildManifest
+
+
+class DirectoryStats:
+    """File, result and error counts plus parse time for one directory."""
+
+    def __init__(self):
+        self.files = 0
+        self.results = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+
+class IngestReport:
+    """Per-directory statistics for one ingestion run."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.directories: Dict[str, DirectoryStats] = {}
+        self.wall_seconds = 0.0
+
+    def record(self, json_file: Path, has_result: bool, failed: bool, seconds: float) -> None:
+        directory = json_file.parent.relative_to(self.root).as_posix()
+        stats = self.directories.setdefault(directory, DirectoryStats())
+        stats.files += 1
+        stats.results += has_result
+        stats.errors += failed
+        stats.seconds += seconds
+
+    def print(self) -> None:
+        """Print one line per directory and a total."""
+        for directory, stats in sorted(self.directories.items()):
+            name = self.root.name if directory == '.' else f"{self.root.name}/{directory}"
+            print(f"  {name:<32} {stats.files:5} files {stats.results:5} results "
+                  f"{stats.errors:3} errors {stats.seconds * 1000:8.1f} ms parsing")
+        total_files = sum(stats.files for stats in self.directories.values())
+        print(f"  {'total':<32} {total_files:5} files in {self.wall_seconds * 1000:.1f} ms wall time")
+
+
+def ingest_json_tree(root: Path, parse_file: Callable[[Path], Any], report: IngestReport,
+                     manifest: Optional[BuildManifest] = None,
+                     workers: Optional[int] = None) -> Iterator[Tuple[Path, Any]]:
+    """
+    Parse every ``*.json`` file under ``root``, including subdirectories.
+
+    Files are read and decoded on a thread pool, and (path, result) pairs are
+    yielded as soon as they are ready, in sorted path order so merges stay
+    deterministic. Files whose result is None are skipped. Files that fail to
+    parse are reported with a warning and skipped.
+
+    Parameters:
+    -----------
+    root: Path
+        Directory to walk
+    parse_file: callable
+        Parses one file; must be safe to call from several threads
+    report: IngestReport
+        Receives per-directory counts and timings
+    manifest: BuildManifest, optional
+        Reuses cached results for unchanged files
+    workers: int, optional
+        Thread pool size; defaults to the executor's default
+    """
+    files = sorted(root.rglob('*.json'))
+
+    def parse(json_file: Path) -> Tuple[Any, Optional[Exception], float]:
+        start = time.perf_counter()
+        try:
+            result = manifest.parse(json_file, parse_file) if manifest else parse_file(json_file)
+            return result, None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for json_file, (result, error, seconds) in zip(files, executor.map(parse, files)):
+            report.record(json_file, result is not None, error is not None, seconds)
+            if error is not None:
+                print(f"Warning: Error parsing {json_file}: {error}")
+            elif result is not None:
+                yield json_file, result
+    report.wall_seconds = time.perf_counter() - start
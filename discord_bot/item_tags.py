@@ -0,0 +1,152 @@
+"""
+Item tags from the generated datapack, resolved to the concrete items they contain.
+The transitive closure of every tag is computed once at build time, so tag-based grist costs expand in a single pass.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# Namespaces whose item ids are stored without their prefix, as elsewhere in the item data
+BARE_NAMESPACES = ('minecraft', 'minestuck')
+
+# Priority of a cost for a single item; each further item an ingredient matches lowers it by 10,
+# as in GristCostRecipe.defaultPriority
+ITEM_PRIORITY = 100
+PRIORITY_STEP = 10
+
+
+def read_item_tags(data_dir: Path) -> Dict[str, List[str]]:
+    """
+    The entries of every item tag under ``data_dir``, by tag id, e.g. 'c:ores/coal'.
+
+    Entries are item ids or ``#tag`` references, as written in the tag files;
+    optional entries (``{"id": ..., "required": false}``) are included.
+
+    Parameters:
+    -----------
+    data_dir: Path
+        A datapack's data directory, holding <namespace>/tags/item
+    """
+    tags = {}
+    for tag_file in sorted(data_dir.glob('*/tags/item/**/*.json')):
+        tags_dir = data_dir / tag_file.relative_to(data_dir).parts[0] / 'tags' / 'item'
+        tag_id = f"{tags_dir.parent.parent.name}:{tag_file.relative_to(tags_dir).with_suffix('').as_posix()}"
+        with open(tag_file, 'r', encoding='utf-8') as f:
+            values = json.load(f).get('values', [])
+        tags[tag_id] = [value['id'] if isinstance(value, dict) else value for value in values]
+    return tags
+
+
+def tag_closure(tags: Mapping[str, Sequence[str]]) -> Dict[str, List[str]]:
+    """
+    The concrete items of every tag, with nested tags followed all the way down.
+
+    Each tag is resolved once and its result reused by every tag that
+    includes it. Items come in the order they are first reached, without
+    repeats. References to tags that aren't defined add nothing, and a tag
+    that includes itself, directly or through others, stops at the repeat.
+    """
+    closure: Dict[str, List[str]] = {}
+    resolving = set()
+
+    def resolve(tag_id: str) -> List[str]:
+        if tag_id in closure:
+            return closure[tag_id]
+        if tag_id in resolving or tag_id not in tags:
+            return []
+        resolving.add(tag_id)
+        items: Dict[str, None] = {}
+        for entry in tags[tag_id]:
+            if entry.startswith('#'):
+                items.update(dict.fromkeys(resolve(entry[1:])))
+            else:
+                items[entry] = None
+        resolving.discard(tag_id)
+        closure[tag_id] = list(items)
+        return closure[tag_id]
+
+    for tag_id in sorted(tags):
+        resolve(tag_id)
+    return closure
+
+
+def bare_id(item_id: str) -> str:
+    """An item id the way the item data stores it: minecraft and minestuck ids without their namespace."""
+    namespace, _, path = item_id.rpartition(':')
+    return path if namespace in BARE_NAMESPACES else item_id
+
+
+class CostEntry(NamedTuple):
+    """A grist cost recipe: its ingredient (an item id or ``#tag``), cost and explicit priority, if any."""
+    ingredient: str
+    cost: Dict[str, int]
+    priority: Optional[int]
+
+
+def resolve_grist_costs(entries: Iterable[CostEntry], closure: Mapping[str, Sequence[str]]
+                        ) -> Tuple[Dict[str, Dict[str, int]], Dict[str, str]]:
+    """
+    The grist cost of every item, with tag costs expanded to the tags' items.
+
+    When several recipes cover an item, the highest priority wins, as in the
+    mod. A recipe without an explicit priority gets 100 for a single item and
+    10 less for each further item its tag matches, so a small tag beats a
+    larger one. At equal priority an item's own cost beats a tag's, and
+    otherwise the recipe that came first wins.
+
+    Returns the costs by item id and, for the items whose cost came from a
+    tag, the tag it came from.
+
+    Parameters:
+    -----------
+    entries: iterable of CostEntry
+        Grist cost recipes in file order; item ids are already in the bare form
+    closure: mapping
+        Concrete items of each tag, as returned by tag_closure
+    """
+    costs: Dict[str, Dict[str, int]] = {}
+    ranks: Dict[str, Tuple[int, bool]] = {}
+    sources: Dict[str, str] = {}
+    for entry in entries:
+        is_tag = entry.ingredient.startswith('#')
+        if is_tag:
+            items = [bare_id(item_id) for item_id in closure.get(entry.ingredient[1:], ())]
+        else:
+            items = [entry.ingredient]
+        if not items:
+            continue
+        priority = entry.priority
+        if priority is None:
+            priority = ITEM_PRIORITY - (len(items) - 1) * PRIORITY_STEP
+        rank = (priority, not is_tag)
+        for item_id in items:
+            if item_id not in ranks or rank > ranks[item_id]:
+                costs[item_id] = entry.cost
+                ranks[item_id] = rank
+                if is_tag:
+                    sources[item_id] = entry.ingredient
+                else:
+                    sources.pop(item_id, None)
+    return costs, sources
+
+
+def ingredient_tags(ingredients: Iterable[str], closure: Mapping[str, Sequence[str]]) -> Dict[str, List[str]]:
+    """
+    The concrete items of every ``#tag`` among ``ingredients``, in the bare form of the item data.
+
+    Keys keep their ``#``, as recipes write them. Tags the datapack doesn't
+    define, such as vanilla ones, are left out.
+
+    Parameters:
+    -----------
+    ingredients: iterable of str
+        Recipe ingredients, item ids and ``#tag`` references mixed
+    closure: mapping
+        Concrete items of each tag, as returned by tag_closure
+    """
+    tags = {}
+    for ingredient in sorted(set(ingredients)):
+        if ingredient.startswith('#') and closure.get(ingredient[1:]):
+            tags[ingredient] = [bare_id(item_id) for item_id in closure[ingredient[1:]]]
+    return tags
@@ -0,0 +1,22 @@
+"""
+Atomic writes for the JSON files the parse scripts and the bot keep on disk.
+Readers of a file written here see either its old or its new contents, never half of it.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def write_json_file(path: Path, data: Any, **dump_options: Any) -> None:
+    """Write ``data`` to a JSON file through a temporary file and a rename, so readers never see it half-written."""
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_options)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,204 @@
+"""
+Localized item names and tooltips from the mod's lang files.
+Each locale is a compact table of interned strings, loaded the first time a command asks for it.
+"""
+
+import json
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from json_files import write_json_file
+from search_index import SubstringIndex
+
+# Locale of the names stored in the item records themselves
+DEFAULT_LOCALE = 'en_us'
+
+# Discord client locales, and the lang file locale that serves each of them
+DISCORD_LOCALES = {
+    'en-US': 'en_us',
+    'en-GB': 'en_us',
+    'zh-TW': 'zh_tw',
+}
+
+# Lang file keys that hold an item's name, in order of preference
+_NAME_KEYS = ('item.minestuck.{}', 'block.minestuck.{}')
+
+# Lang file key that holds an item's tooltip
+_TOOLTIP_KEY = 'item.minestuck.{}.tooltip'
+
+# Minecraft formatting codes such as §k or §6, which Discord can't show
+_FORMATTING_CODE = re.compile('§.')
+
+
+def item_strings(lang: Mapping[str, str], item_ids: Iterable[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    The names and tooltips a lang file has for the given items.
+
+    Parameters:
+    -----------
+    lang: mapping
+        The lang file's translation keys and strings
+    item_ids: iterable of str
+        Registry ids of the items to look up, e.g. 'sord'
+    """
+    names = {}
+    tooltips = {}
+    for item_id in item_ids:
+        for key in _NAME_KEYS:
+            name = lang.get(key.format(item_id))
+            if name:
+                names[item_id] = _FORMATTING_CODE.sub('', name).strip()
+                break
+        tooltip = lang.get(_TOOLTIP_KEY.format(item_id))
+        if tooltip:
+            tooltips[item_id] = _FORMATTING_CODE.sub('', tooltip).strip()
+    return names, tooltips
+
+
+class LocaleTable:
+    """
+    Item names and tooltips for one locale.
+
+    Every distinct string is stored once, interned, in a tuple, and items map
+    to positions in it, so names shared by several items (e.g. the drawn and
+    sheathed forms of a weapon) cost nothing extra. The table also carries its
+    own autocomplete index, which matches the localized name, the default
+    name and the item id.
+    """
+
+    def __init__(self, locale: str, names: Mapping[str, str], tooltips: Mapping[str, str],
+                 default_names: Mapping[str, str]):
+        """
+        Parameters:
+        -----------
+        locale: str
+            The lang file locale, e.g. 'zh_tw'
+        names: mapping
+            Localized names by item id
+        tooltips: mapping
+            Localized tooltips by item id
+        default_names: mapping
+            Names in the default locale by item id; items without a localized name keep these
+        """
+        self.locale = locale
+        positions: Dict[str, int] = {}
+
+        def position(text: str) -> int:
+            return positions.setdefault(sys.intern(text), len(positions))
+
+        self._names = {sys.intern(item_id): position(name) for item_id, name in names.items()}
+        self._tooltips = {sys.intern(item_id): position(tooltip) for item_id, tooltip in tooltips.items()}
+        self._strings: Tuple[str, ...] = tuple(positions)
+
+        entries = []
+        for item_id, default_name in default_names.items():
+            name = self.name(item_id) or default_name
+            entries.append((name, item_id, (name, default_name, item_id)))
+        self.index = SubstringIndex(entries)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def name(self, item_id: str) -> Optional[str]:
+        position = self._names.get(item_id)
+        return None if position is None else self._strings[position]
+
+    def tooltip(self, item_id: str) -> Optional[str]:
+        position = self._tooltips.get(item_id)
+        return None if position is None else self._strings[position]
+
+
+class LocaleCatalog:
+    """
+    The locales a repository can serve, each loaded into a LocaleTable on first use.
+
+    Only the list of locales is known up front. A locale's strings are read
+    the first time a command needs them and kept for the life of the data
+    snapshot, so a bot that only ever serves English never loads the others.
+    """
+
+    def __init__(self, locales: Iterable[str], load: Callable[[str], Tuple[Dict[str, str], Dict[str, str]]],
+                 default_names: Callable[[], Mapping[str, str]]):
+        """
+        Parameters:
+        -----------
+        locales: iterable of str
+            Locales with strings besides the default one
+        load: callable
+            Returns the (names, tooltips) of a locale
+        default_names: callable
+            Returns the default-locale names of every item, when a table is first built
+        """
+        self.locales = sorted(set(locales) - {DEFAULT_LOCALE})
+        self._load = load
+        self._default_names = default_names
+        self._tables: Dict[str, LocaleTable] = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> List[str]:
+        """Every locale that can be chosen, the default one first."""
+        return [DEFAULT_LOCALE] + self.locales
+
+    def loaded(self) -> List[str]:
+        """The locales whose strings are in memory."""
+        return sorted(self._tables)
+
+    def table(self, locale: str) -> Optional[LocaleTable]:
+        """The strings of ``locale``, or None for the default locale and unknown ones."""
+        if locale not in self.locales:
+            return None
+        with self._lock:
+            table = self._tables.get(locale)
+            if table is None:
+                names, tooltips = self._load(locale)
+                table = LocaleTable(locale, names, tooltips, self._default_names())
+                self._tables[locale] = table
+            return table
+
+
+class LocalePreferences:
+    """
+    The locale each user and each guild has picked, saved to a JSON file.
+
+    A user's own choice wins over their guild's, and the guild's over the
+    locale of the user's Discord client.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self._users: Dict[str, str] = dict(data.get('users', {}))
+        self._guilds: Dict[str, str] = dict(data.get('guilds', {}))
+
+    def resolve(self, user_id: int, guild_id: Optional[int], discord_locale: Optional[str] = None) -> str:
+        """The locale to answer a user in."""
+        locale = self._users.get(str(user_id))
+        if locale is None and guild_id is not None:
+            locale = self._guilds.get(str(guild_id))
+        if locale is None:
+            locale = DISCORD_LOCALES.get(discord_locale or '', DEFAULT_LOCALE)
+        return locale
+
+    def set_user(self, user_id: int, locale: Optional[str]) -> None:
+        """Pick a locale for one user; None goes back to the guild's or the client's."""
+        self._set(self._users, str(user_id), locale)
+
+    def set_guild(self, guild_id: int, locale: Optional[str]) -> None:
+        """Pick a locale for everyone in a guild; None goes back to each client's."""
+        self._set(self._guilds, str(guild_id), locale)
+
+    def _set(self, choices: Dict[str, str], key: str, locale: Optional[str]) -> None:
+        with self._lock:
+            if locale is None:
+                choices.pop(key, None)
+            else:
+                choices[key] = locale
+            write_json_file(self.path, {'users': self._users, 'guilds': self._guilds}, indent=2, sort_keys=True)
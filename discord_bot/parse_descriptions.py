@@ -9,6 +9,13 @@ import re
 from pathlib import Path
 from typing import Dict, List, Any
 
+from data_repository import rebuild_database, write_descriptions_tables
+from grist_matrix import GristCostMatrix, GristTypeIndex
+from json_files import write_json_file
+
+# Number of items listed under each grist subtopic
+TOP_GRIST_ITEMS = 5
+
 
 def parse_grist_types(grist_types_file: Path) -> Dict[str, Dict[str, Any]]:
     """Parse GristTypes.java to extract grist type information."""
@@ -51,6 +58,27 @@ def parse_grist_types(grist_types_file: Path) -> Dict[str, Dict[str, Any]]:
     return grist_descriptions
 
 
+def load_grist_type_index(data_dir: Path) -> GristTypeIndex:
+    """Index the grist costs written by parse_items.py by grist type."""
+    grist_costs_file = data_dir / 'grist_costs_data.json'
+    items_file = data_dir / 'items_data.json'
+    if not grist_costs_file.exists():
+        print(f"Warning: grist_costs_data.json not found at {grist_costs_file}")
+        print("Run parse_items.py first to list the items that use each grist type")
+        return GristTypeIndex(GristCostMatrix({}, {}))
+
+    with open(grist_costs_file, 'r', encoding='utf-8') as f:
+        grist_costs = json.load(f)
+    item_names = {}
+    if items_file.exists():
+        with open(items_file, 'r', encoding='utf-8') as f:
+            item_names = {item_id: data.get('name', item_id) for item_id, data in json.load(f).items()}
+
+    index = GristTypeIndex(GristCostMatrix(grist_costs, item_names))
+    print(f"Indexed grist costs of {len(grist_costs)} items by grist type")
+    return index
+
+
 def parse_entity_types(entity_dir: Path) -> List[str]:
     """Parse entity directory to find underling types."""
     if not entity_dir.exists():
@@ -101,6 +129,18 @@ def update_descriptions_with_source_data():
                 # Only add if not already there
                 if "Technical:" not in existing_desc:
                     subtopics[grist_id]['description'] = existing_desc + tech_note
+
+        # Items that use each grist type, replaced on every run so they follow the cost files
+        grist_index = load_grist_type_index(Path(__file__).parent)
+        for grist_id, subtopic_data in subtopics.items():
+            grist_type = grist_index.grist_type(grist_id)
+            if grist_type is None:
+                continue
+            subtopic_data['item_count'] = grist_index.count(grist_type)
+            subtopic_data['only_item_count'] = grist_index.count(grist_type, only=True)
+            subtopic_data['top_items'] = [
+                [use.name, use.amount] for use in grist_index.most(grist_type, TOP_GRIST_ITEMS)
+            ]
     
     # Parse and update entity types
     underling_types = parse_entity_types(entity_dir)
@@ -108,8 +148,12 @@ def update_descriptions_with_source_data():
         print(f"Underling types found: {', '.join(underling_types)}")
     
     # Save updated descriptions
-    with open(descriptions_file, 'w', encoding='utf-8') as f:
-        json.dump(descriptions, f, indent=2)
+    write_json_file(descriptions_file, descriptions, indent=2)
+    
+    # Save to the SQLite store used by DATA_BACKEND=sqlite
+    database_file = Path(__file__).parent / 'minestuck_data.db'
+    with rebuild_database(database_file) as staging_file:
+        write_descriptions_tables(staging_file, descriptions)
     
     print(f"\nUpdated descriptions_data.json with source code data")
     print(f"Total topics: {len(descriptions)}")
@@ -4,42 +4,63 @@ Parse MSItems.java to extract item information for the Discord bot.
 This script reads the Java source code and extracts item properties into a JSON file.
 """
 
+import argparse
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from build_manifest import BuildManifest
+from captcha import read_predetermined_captchas
+from compat import COMPAT_PACKS_DIR, read_compat_packs
+from data_repository import (rebuild_database, write_combinations_table, write_compat_packs_table,
+                             write_grist_costs_table, write_item_tags_table, write_items_table,
+                             write_locale_strings_table)
+from grist_derivation import derive_grist_costs
+from ingest import IngestReport, ingest_json_tree
+from item_tags import CostEntry, ingredient_tags, read_item_tags, resolve_grist_costs, tag_closure
+from json_files import write_json_file
+from localization import DEFAULT_LOCALE, item_strings
+from parse_descriptions import parse_grist_types
+from thumbnails import Image, ThumbnailCache, build_thumbnails, find_item_textures
+
+# Bump whenever the parsing logic changes so cached per-file results are discarded
+PARSER_VERSION = 4
+
+
+# Approximate quality levels of the weapon tiers used in MSItems.java
+TIER_MAPPING = {
+    'Tiers.WOOD': {'material': 'Wood', 'durability': 59, 'level': 1},
+    'Tiers.STONE': {'material': 'Stone', 'durability': 131, 'level': 2},
+    'Tiers.IRON': {'material': 'Iron', 'durability': 250, 'level': 3},
+    'Tiers.GOLD': {'material': 'Gold', 'durability': 32, 'level': 4},
+    'Tiers.DIAMOND': {'material': 'Diamond', 'durability': 1561, 'level': 5},
+    'Tiers.NETHERITE': {'material': 'Netherite', 'durability': 2031, 'level': 6},
+    'MSItemTypes.SBAHJ_TIER': {'material': 'SBAHJ', 'durability': 64, 'level': 1},
+    'MSItemTypes.PAPER_TIER': {'material': 'Paper', 'durability': 65, 'level': 1},
+    'MSItemTypes.ORGANIC_TIER': {'material': 'Organic', 'durability': 200, 'level': 2},
+    'MSItemTypes.MEAT_TIER': {'material': 'Meat', 'durability': 150, 'level': 2},
+    'MSItemTypes.CANDY_TIER': {'material': 'Candy', 'durability': 250, 'level': 2},
+    'MSItemTypes.CACTUS_TIER': {'material': 'Cactus', 'durability': 104, 'level': 2},
+    'MSItemTypes.POGO_TIER': {'material': 'Pogo', 'durability': 1500, 'level': 3},
+    'MSItemTypes.BOOK_TIER': {'material': 'Book', 'durability': 1024, 'level': 3},
+    'MSItemTypes.REGI_TIER': {'material': 'Regi', 'durability': 2048, 'level': 4},
+    'MSItemTypes.URANIUM_TIER': {'material': 'Uranium', 'durability': 512, 'level': 3},
+    'MSItemTypes.EMERALD_TIER': {'material': 'Emerald', 'durability': 2000, 'level': 4},
+    'MSItemTypes.PRISMARINE_TIER': {'material': 'Prismarine', 'durability': 300, 'level': 3},
+    'MSItemTypes.CORUNDUM_TIER': {'material': 'Corundum', 'durability': 2500, 'level': 5},
+    'MSItemTypes.DENIZEN_TIER': {'material': 'Denizen', 'durability': 4096, 'level': 6},
+    'MSItemTypes.ZILLY_TIER': {'material': 'Zilly', 'durability': 5120, 'level': 7},
+    'MSItemTypes.WELSH_TIER': {'material': 'Welsh', 'durability': 3500, 'level': 5},
+    'MSItemTypes.HORRORTERROR_TIER': {'material': 'Horrorterror', 'durability': 2500, 'level': 5},
+    'MSItemTypes.BATTERY_TIER': {'material': 'Battery', 'durability': 800, 'level': 3},
+    'MSItemTypes.ICE_TIER': {'material': 'Ice', 'durability': 300, 'level': 3},
+}
 
 
 def parse_tier_info(tier_name: str) -> Dict[str, Any]:
     """Map tier names to their approximate quality levels."""
-    tier_mapping = {
-        'Tiers.WOOD': {'material': 'Wood', 'durability': 59, 'level': 1},
-        'Tiers.STONE': {'material': 'Stone', 'durability': 131, 'level': 2},
-        'Tiers.IRON': {'material': 'Iron', 'durability': 250, 'level': 3},
-        'Tiers.GOLD': {'material': 'Gold', 'durability': 32, 'level': 4},
-        'Tiers.DIAMOND': {'material': 'Diamond', 'durability': 1561, 'level': 5},
-        'Tiers.NETHERITE': {'material': 'Netherite', 'durability': 2031, 'level': 6},
-        'MSItemTypes.SBAHJ_TIER': {'material': 'SBAHJ', 'durability': 64, 'level': 1},
-        'MSItemTypes.PAPER_TIER': {'material': 'Paper', 'durability': 65, 'level': 1},
-        'MSItemTypes.ORGANIC_TIER': {'material': 'Organic', 'durability': 200, 'level': 2},
-        'MSItemTypes.MEAT_TIER': {'material': 'Meat', 'durability': 150, 'level': 2},
-        'MSItemTypes.CANDY_TIER': {'material': 'Candy', 'durability': 250, 'level': 2},
-        'MSItemTypes.CACTUS_TIER': {'material': 'Cactus', 'durability': 104, 'level': 2},
-        'MSItemTypes.POGO_TIER': {'material': 'Pogo', 'durability': 1500, 'level': 3},
-        'MSItemTypes.BOOK_TIER': {'material': 'Book', 'durability': 1024, 'level': 3},
-        'MSItemTypes.REGI_TIER': {'material': 'Regi', 'durability': 2048, 'level': 4},
-        'MSItemTypes.URANIUM_TIER': {'material': 'Uranium', 'durability': 512, 'level': 3},
-        'MSItemTypes.EMERALD_TIER': {'material': 'Emerald', 'durability': 2000, 'level': 4},
-        'MSItemTypes.PRISMARINE_TIER': {'material': 'Prismarine', 'durability': 300, 'level': 3},
-        'MSItemTypes.CORUNDUM_TIER': {'material': 'Corundum', 'durability': 2500, 'level': 5},
-        'MSItemTypes.DENIZEN_TIER': {'material': 'Denizen', 'durability': 4096, 'level': 6},
-        'MSItemTypes.ZILLY_TIER': {'material': 'Zilly', 'durability': 5120, 'level': 7},
-        'MSItemTypes.WELSH_TIER': {'material': 'Welsh', 'durability': 3500, 'level': 5},
-        'MSItemTypes.HORRORTERROR_TIER': {'material': 'Horrorterror', 'durability': 2500, 'level': 5},
-        'MSItemTypes.BATTERY_TIER': {'material': 'Battery', 'durability': 800, 'level': 3},
-        'MSItemTypes.ICE_TIER': {'material': 'Ice', 'durability': 300, 'level': 3},
-    }
-    return tier_mapping.get(tier_name, {'material': 'Unknown', 'durability': 0, 'level': 0})
+    return TIER_MAPPING.get(tier_name, {'material': 'Unknown', 'durability': 0, 'level': 0})
 
 
 def extract_item_type(line: str) -> str:
@@ -130,52 +151,103 @@ def parse_special_attributes(line: str) -> List[str]:
     return attributes
 
 
+class Registration(NamedTuple):
+    """One ``REGISTER.register("key", ...)`` statement from MSItems.java."""
+    const_name: str
+    key: str
+    definition: str
+
+
+# Tokens the registration lexer stops at: string/char literals, comment openers, statement ends and
+# registration headers. Every alternative starts with a plain literal so the regex engine can skip ahead
+# by first character. A header is recognized by its named groups; the other kinds are read from their
+# first characters. Parentheses between tokens are counted with str.count.
+_TOKEN_PATTERN = re.compile(
+    r'"(?:[^"\\]|\\.)*"'
+    r"|'(?:[^'\\]|\\.)*'"
+    r'|//|/\*|;'
+    r'|public\s+static\s+final\s+DeferredItem<[^;=]*?>\s+(?P<const_name>\w+)\s*=\s*'
+    r'REGISTER\.register\(\s*"(?P<key>[^"]+)"'
+)
+
+# WeaponItem.Builder(tier, damage, speed); damage and speed are optional so a partial match still gives the tier
+_BUILDER_PATTERN = re.compile(r'WeaponItem\.Builder\(([\w.]+)(?:\s*,\s*(-?\d+)(?:\s*,\s*(-?\d+\.?\d*)[Ff]?)?)?')
+_EFFICIENCY_PATTERN = re.compile(r'\.efficiency\((\d+\.?\d*)[Ff]?\)')
+_DURABILITY_PATTERN = re.compile(r'\.durability\((\d+)\)')
+
+
+def lex_registrations(lines: Iterable[str]) -> Iterator[Registration]:
+    """
+    Stream item registrations out of MSItems.java in a single pass.
+
+    String and char literals, comments and parenthesis depth are tracked, so a
+    registration ends at the ``;`` that closes its statement no matter how its
+    builder calls are nested or split across lines. Comments are left out of
+    the emitted definitions.
+
+    Parameters:
+    -----------
+    lines: iterable of str
+        Source lines, e.g. an open file
+    """
+    const_name = key = None
+    parts: List[str] = []
+    depth = 0
+    in_block_comment = False
+
+    for line in lines:
+        pos = segment_start = 0
+        if in_block_comment:
+            close = line.find('*/')
+            if close < 0:
+                continue
+            in_block_comment = False
+            pos = segment_start = close + 2
+
+        while True:
+            token = _TOKEN_PATTERN.search(line, pos)
+            if token is None:
+                break
+            start = token.start()
+            if key is not None:
+                code = line[pos:start]
+                depth += code.count('(') - code.count(')')
+            pos = token.end()
+            kind = line[start:start + 2]
+
+            if kind == '//' or kind == '/*':
+                if key is not None:
+                    parts.append(line[segment_start:start].strip())
+                close = line.find('*/', pos) if kind == '/*' else -1
+                if close < 0:
+                    in_block_comment = kind == '/*'
+                    segment_start = pos = len(line)
+                    break
+                pos = segment_start = close + 2
+            elif key is None:
+                if token['key'] is not None:
+                    const_name, key = token['const_name'], token['key']
+                    parts = []
+                    depth = 1
+                    segment_start = start
+            elif kind[0] == ';' and depth == 0:
+                parts.append(line[segment_start:pos].strip())
+                yield Registration(const_name, key, ' '.join(part for part in parts if part))
+                const_name = key = None
+
+        if key is not None:
+            code = line[pos:]
+            depth += code.count('(') - code.count(')')
+            parts.append(line[segment_start:].strip())
+
+
 def parse_msitems_java(java_file_path: Path) -> Dict[str, Any]:
     """Parse MSItems.java and extract item information."""
-    items = {}
-    
     with open(java_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Pattern to match item registrations
-    # Example: public static final DeferredItem<Item> CLAW_HAMMER = REGISTER.register("claw_hammer", () -> new WeaponItem(new WeaponItem.Builder(Tiers.IRON, 2, -2.8F).efficiency(1.0F).set(MSItemTypes.HAMMER_TOOL), new Item.Properties()));
-    pattern = r'public static final DeferredItem<.*?>\s+(\w+)\s*=\s*REGISTER\.register\("([^"]+)",\s*\(\)\s*->\s*new\s+(\w+)\((.*?)\)\);'
-    
-    # Split into lines to process multi-line registrations
-    lines = content.split('\n')
-    current_item_name = None
-    current_item_key = None
-    current_item_type = None
-    current_definition = []
-    in_registration = False
-    
-    for line in lines:
-        # Check if this line starts a new registration
-        if 'public static final DeferredItem' in line and 'REGISTER.register(' in line:
-            # Process previous item if exists
-            if current_item_name and current_definition:
-                full_def = ' '.join(current_definition)
-                items[current_item_key] = parse_item_definition(current_item_name, current_item_key, full_def)
-            
-            # Start new item
-            match = re.search(r'public static final DeferredItem<.*?>\s+(\w+)\s*=\s*REGISTER\.register\("([^"]+)"', line)
-            if match:
-                current_item_name = match.group(1)
-                current_item_key = match.group(2)
-                current_definition = [line]
-                in_registration = True
-        elif in_registration:
-            current_definition.append(line)
-            if ');' in line:
-                # End of registration
-                full_def = ' '.join(current_definition)
-                items[current_item_key] = parse_item_definition(current_item_name, current_item_key, full_def)
-                current_item_name = None
-                current_item_key = None
-                current_definition = []
-                in_registration = False
-    
-    return items
+        return {
+            registration.key: parse_item_definition(*registration)
+            for registration in lex_registrations(f)
+        }
 
 
 def parse_item_definition(const_name: str, item_key: str, definition: str) -> Dict[str, Any]:
@@ -191,32 +263,26 @@ def parse_item_definition(const_name: str, item_key: str, definition: str) -> Di
     # Determine item type
     item_info['type'] = extract_item_type(definition)
     
-    # Extract tier
-    tier_match = re.search(r'WeaponItem\.Builder\(([\w.]+)', definition)
-    if tier_match:
-        tier_name = tier_match.group(1)
+    # Extract tier, attack damage and attack speed from the WeaponItem.Builder arguments
+    builder_match = _BUILDER_PATTERN.search(definition)
+    if builder_match:
+        tier_name, damage, speed = builder_match.groups()
         tier_info = parse_tier_info(tier_name)
         item_info['tier'] = tier_info['material']
         item_info['tier_durability'] = tier_info['durability']
         item_info['tier_level'] = tier_info['level']
-    
-    # Extract attack damage (second parameter in Builder)
-    damage_match = re.search(r'WeaponItem\.Builder\([^,]+,\s*(-?\d+)', definition)
-    if damage_match:
-        item_info['attack_damage'] = int(damage_match.group(1))
-    
-    # Extract attack speed (third parameter in Builder)
-    speed_match = re.search(r'WeaponItem\.Builder\([^,]+,\s*-?\d+,\s*(-?\d+\.?\d*F?)', definition)
-    if speed_match:
-        item_info['attack_speed'] = float(speed_match.group(1).replace('F', ''))
+        if damage is not None:
+            item_info['attack_damage'] = int(damage)
+        if speed is not None:
+            item_info['attack_speed'] = float(speed)
     
     # Extract efficiency
-    efficiency_match = re.search(r'\.efficiency\((\d+\.?\d*F?)\)', definition)
+    efficiency_match = _EFFICIENCY_PATTERN.search(definition)
     if efficiency_match:
-        item_info['efficiency'] = float(efficiency_match.group(1).replace('F', ''))
+        item_info['efficiency'] = float(efficiency_match.group(1))
     
     # Extract custom durability
-    durability_match = re.search(r'\.durability\((\d+)\)', definition)
+    durability_match = _DURABILITY_PATTERN.search(definition)
     if durability_match:
         item_info['durability'] = int(durability_match.group(1))
     
@@ -246,83 +312,156 @@ def format_item_name(item_key: str) -> str:
     return item_key.replace('_', ' ').title()
 
 
-def parse_grist_costs(grist_costs_dir: Path) -> Dict[str, Dict[str, int]]:
-    """Parse grist cost JSON files."""
-    grist_costs = {}
-    
+def _pack_version(lang_file: Path) -> Tuple[int, ...]:
+    """Minecraft version a translation pack is for, from its folder name, e.g. (1, 20, 1)."""
+    match = re.match(r'\d+(?:\.\d+)*', lang_file.parents[3].name)
+    return tuple(int(part) for part in match.group(0).split('.')) if match else ()
+
+
+def find_lang_files(repo_root: Path) -> Dict[str, Path]:
+    """
+    The lang file to use for each locale.
+
+    The mod's own generated lang files come first. Other locales come from the
+    translation packs in additional_resources, using the pack for the newest
+    Minecraft version when there are several. Only JSON lang files are read;
+    the pre-1.13 .lang format has different item keys.
+    """
+    lang_files = {}
+    packs = repo_root.glob('additional_resources/*/*/assets/minestuck/lang/*.json')
+    for lang_file in sorted(packs, key=_pack_version):
+        lang_files[lang_file.stem] = lang_file
+    generated = repo_root / 'src' / 'main' / 'generated' / 'resources' / 'assets' / 'minestuck' / 'lang'
+    for lang_file in sorted(generated.glob('*.json')):
+        lang_files[lang_file.stem] = lang_file
+    return lang_files
+
+
+def parse_grist_cost_file(json_file: Path) -> Optional[List[Any]]:
+    """
+    Parse one grist cost JSON file into [ingredient, grist_cost, priority], or None if it has no usable cost.
+
+    The ingredient is an item id, or ``#namespace:tag`` for a cost that covers
+    every item of a tag. The priority is None unless the file sets one.
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    # Extract the item ID or tag from the ingredient
+    ingredient = parse_ingredient(data.get('ingredient') or {})
+    
+    # Extract grist cost
+    grist_cost = data.get('grist_cost', {})
+    if not grist_cost or not isinstance(grist_cost, dict) or not ingredient:
+        return None
+    
+    # Clean up grist type names
+    cleaned_cost = {}
+    for grist_type, amount in grist_cost.items():
+        grist_name = grist_type.replace('minestuck:', '').replace('_', ' ').title()
+        cleaned_cost[grist_name] = amount
+    return [ingredient, cleaned_cost, data.get('priority')]
+
+
+def parse_grist_costs(grist_costs_dir: Path, manifest: Optional[BuildManifest] = None,
+                      workers: Optional[int] = None,
+                      tag_items: Optional[Dict[str, List[str]]] = None
+                      ) -> Tuple[Dict[str, Dict[str, int]], Dict[str, str]]:
+    """
+    Parse grist cost JSON files, including subdirectories, on a thread pool.
+
+    Costs for a tag are given to every item in ``tag_items[tag]``, the
+    precomputed closure of the tag, following the precedence rules of
+    item_tags.resolve_grist_costs. Returns the costs by item id and the tag
+    each tag-based cost came from.
+    """
     if not grist_costs_dir.exists():
         print(f"Warning: Grist costs directory not found at {grist_costs_dir}")
-        return grist_costs
-    
-    for json_file in grist_costs_dir.glob('*.json'):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extract item ID from ingredient
-            ingredient = data.get('ingredient', {})
-            item_id = ingredient.get('item', '')
-            
-            # Handle both minecraft and minestuck namespaces
-            if item_id.startswith('minecraft:'):
-                item_id = item_id.replace('minecraft:', '')
-            elif item_id.startswith('minestuck:'):
-                item_id = item_id.replace('minestuck:', '')
-            
-            # Extract grist cost
-            grist_cost = data.get('grist_cost', {})
-            if grist_cost and item_id:
-                # Clean up grist type names
-                cleaned_cost = {}
-                for grist_type, amount in grist_cost.items():
-                    grist_name = grist_type.replace('minestuck:', '').replace('_', ' ').title()
-                    cleaned_cost[grist_name] = amount
-                grist_costs[item_id] = cleaned_cost
-        except Exception as e:
-            print(f"Warning: Error parsing {json_file}: {e}")
-    
-    return grist_costs
-
-
-def parse_alchemy_recipes(combinations_dir: Path) -> Dict[str, Dict[str, Any]]:
-    """Parse alchemy combination recipes."""
-    alchemy_recipes = {}
+        return {}, {}
+    
+    report = IngestReport(grist_costs_dir)
+    entries = [CostEntry(*result) for _, result in ingest_json_tree(grist_costs_dir, parse_grist_cost_file, report,
+                                                                    manifest, workers)]
+    report.print()
+    
+    return resolve_grist_costs(entries, tag_items or {})
+
+
+def parse_ingredient(ingredient: Dict[str, str]) -> str:
+    """Turn a recipe ingredient into an item id, or ``#namespace:tag`` for tag ingredients."""
+    if 'tag' in ingredient:
+        return '#' + ingredient['tag']
+    item_id = ingredient.get('item', '')
+    if item_id.startswith('minecraft:'):
+        item_id = item_id.replace('minecraft:', '')
+    elif item_id.startswith('minestuck:'):
+        item_id = item_id.replace('minestuck:', '')
+    return item_id
+
+
+def parse_combination_file(json_file: Path) -> Optional[List[str]]:
+    """Parse one combination recipe JSON file into [input1, input2, mode, output], or None if incomplete."""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    # Extract both ingredients
+    input1 = parse_ingredient(data.get('input1', {}))
+    input2 = parse_ingredient(data.get('input2', {}))
+    
+    # Extract output item ID
+    output = data.get('output', '')
+    if output.startswith('minecraft:'):
+        output = output.replace('minecraft:', '')
+    elif output.startswith('minestuck:'):
+        output = output.replace('minestuck:', '')
+    
+    # Extract mode (and/or)
+    mode = data.get('mode', '')
+    
+    if not input1 or not input2 or not output or not mode:
+        return None
+    return [input1, input2, mode, output]
+
+
+def parse_combinations(combinations_dir: Path, manifest: Optional[BuildManifest] = None,
+                       workers: Optional[int] = None) -> List[List[str]]:
+    """Parse alchemy combination recipes, including subdirectories, on a thread pool."""
+    combinations = []
     
     if not combinations_dir.exists():
         print(f"Warning: Combinations directory not found at {combinations_dir}")
-        return alchemy_recipes
-    
-    for json_file in combinations_dir.glob('*.json'):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extract output item ID
-            output = data.get('output', '')
-            if output.startswith('minecraft:'):
-                output = output.replace('minecraft:', '')
-            elif output.startswith('minestuck:'):
-                output = output.replace('minestuck:', '')
-            
-            # Extract mode (and/or)
-            mode = data.get('mode', '')
-            
-            if output and mode:
-                if output not in alchemy_recipes:
-                    alchemy_recipes[output] = {'modes': set()}
-                alchemy_recipes[output]['modes'].add(mode)
-        except Exception as e:
-            print(f"Warning: Error parsing {json_file}: {e}")
-    
-    # Convert sets to lists for JSON serialization
-    for item_id in alchemy_recipes:
-        alchemy_recipes[item_id]['modes'] = sorted(list(alchemy_recipes[item_id]['modes']))
-    
-    return alchemy_recipes
+        return combinations
+    
+    report = IngestReport(combinations_dir)
+    for _, combination in ingest_json_tree(combinations_dir, parse_combination_file, report, manifest, workers):
+        combinations.append(combination)
+    report.print()
+    
+    return combinations
+
+
+def alchemy_modes(combinations: List[List[str]]) -> Dict[str, List[str]]:
+    """Collect the combination modes (and/or) that produce each output item."""
+    modes = {}
+    for _, _, mode, output in combinations:
+        modes.setdefault(output, set()).add(mode)
+    return {item_id: sorted(item_modes) for item_id, item_modes in modes.items()}
 
 
 def main():
     """Main function to parse items and generate JSON."""
+    parser = argparse.ArgumentParser(description="Generate items_data.json from the Minestuck source code.")
+    parser.add_argument('--full', action='store_true',
+                        help="ignore the build manifest and re-parse every input file")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="threads used to read recipe files (default: chosen by Python)")
+    args = parser.parse_args()
+    
+    # Per-file parse results from the previous run; only changed inputs are parsed again
+    repo_root = Path(__file__).parent.parent
+    manifest = BuildManifest(Path(__file__).parent / '.build_cache' / 'parse_items_manifest.json',
+                             repo_root, PARSER_VERSION, full=args.full)
+    
     # Path to MSItems.java
     java_file = Path(__file__).parent.parent / 'src' / 'main' / 'java' / 'com' / 'mraof' / 'minestuck' / 'item' / 'MSItems.java'
     
@@ -331,41 +470,162 @@ def main():
         return
     
     print(f"Parsing {java_file}...")
-    items = parse_msitems_java(java_file)
-    
-    # Format names
-    for item_key, item_data in items.items():
-        item_data['name'] = format_item_name(item_key)
+    items = manifest.parse(java_file, parse_msitems_java)
     
     print(f"Found {len(items)} items")
     
+    # Item names and tooltips from the lang files of every locale
+    print("\nReading lang files...")
+    locale_strings = {}
+    for locale, lang_file in sorted(find_lang_files(repo_root).items()):
+        with open(lang_file, 'r', encoding='utf-8') as f:
+            names, tooltips = item_strings(json.load(f), items)
+        locale_strings[locale] = (names, tooltips)
+        print(f"Found {len(names)} names and {len(tooltips)} tooltips in {lang_file.relative_to(repo_root)}")
+    
+    # Names come from the default locale, falling back to the formatted registry key
+    default_names, default_tooltips = locale_strings.pop(DEFAULT_LOCALE, ({}, {}))
+    for item_key, item_data in items.items():
+        item_data['name'] = default_names.get(item_key) or format_item_name(item_key)
+        if item_key in default_tooltips:
+            item_data['tooltip'] = default_tooltips[item_key]
+    
+    # Thumbnails of every item texture, rendered once and reused until the texture changes
+    assets_dirs = [repo_root / 'src' / 'main' / 'resources' / 'assets' / 'minestuck',
+                   repo_root / 'src' / 'main' / 'generated' / 'resources' / 'assets' / 'minestuck']
+    print("\nRendering item thumbnails...")
+    if Image is None:
+        print("Warning: Pillow is not installed, so thumbnails are unscaled copies of the textures")
+        print("Run pip install -r requirements.txt to render sharp upscaled thumbnails")
+    textures = find_item_textures(assets_dirs, items)
+    thumbnail_cache = ThumbnailCache(Path(__file__).parent / 'thumbnails')
+    thumbnails = build_thumbnails(assets_dirs, textures, thumbnail_cache, on_error=lambda texture_file, e: print(
+        f"Warning: Could not render a thumbnail of {texture_file}, skipping it: {e}"))
+    removed = thumbnail_cache.prune(thumbnails.values())
+    for item_key, item_data in items.items():
+        if item_key in textures:
+            item_data['texture'] = textures[item_key]
+        if item_key in thumbnails:
+            item_data['thumbnail'] = thumbnails[item_key]
+    print(f"Found textures for {len(textures)} of {len(items)} items; rendered {thumbnail_cache.rendered} "
+          f"thumbnails, reused {thumbnail_cache.reused} and removed {removed} stale ones")
+    
+    # Every item tag resolved to its concrete items once, so tag-based grist costs expand in one pass
+    tags_dir = Path(__file__).parent.parent / 'src' / 'main' / 'generated' / 'resources' / 'data'
+    print(f"\nResolving item tags from {tags_dir}...")
+    tag_items = tag_closure(read_item_tags(tags_dir))
+    print(f"Resolved {len(tag_items)} tags to {sum(len(items) for items in tag_items.values())} item entries")
+    
     # Parse grist costs
     grist_costs_dir = Path(__file__).parent.parent / 'src' / 'main' / 'generated' / 'resources' / 'data' / 'minestuck' / 'recipe' / 'grist_costs'
     print(f"\nParsing grist costs from {grist_costs_dir}...")
-    grist_costs = parse_grist_costs(grist_costs_dir)
-    print(f"Found grist costs for {len(grist_costs)} items")
+    grist_costs, grist_cost_tags = parse_grist_costs(grist_costs_dir, manifest, args.workers, tag_items)
+    print(f"Found grist costs for {len(grist_costs)} items, {len(grist_cost_tags)} of them from tags")
     
     # Parse alchemy recipes
     combinations_dir = Path(__file__).parent.parent / 'src' / 'main' / 'generated' / 'resources' / 'data' / 'minestuck' / 'recipe' / 'combinations'
     print(f"\nParsing alchemy recipes from {combinations_dir}...")
-    alchemy_recipes = parse_alchemy_recipes(combinations_dir)
-    print(f"Found alchemy recipes for {len(alchemy_recipes)} items")
+    combinations = parse_combinations(combinations_dir, manifest, args.workers)
+    alchemy_recipes = alchemy_modes(combinations)
+    print(f"Found {len(combinations)} combinations producing {len(alchemy_recipes)} items")
+    # Items of the tags recipes take as ingredients, so /route can use any of them
+    recipe_tags = ingredient_tags((ingredient for combination in combinations for ingredient in combination[:2]),
+                                  tag_items)
+    print(f"Resolved {len(recipe_tags)} ingredient tags to "
+          f"{sum(len(items) for items in recipe_tags.values())} items")
+    
+    # Estimate grist costs for items that only have combination recipes
+    grist_types_file = Path(__file__).parent.parent / 'src' / 'main' / 'java' / 'com' / 'mraof' / 'minestuck' / 'api' / 'alchemy' / 'GristTypes.java'
+    print("\nDeriving grist costs through the combination graph...")
+    grist_types = [grist_id.replace('_', ' ').title() for grist_id in parse_grist_types(grist_types_file)]
+    derived = derive_grist_costs(grist_types, grist_costs, combinations)
+    passes = max(derived.levels.values(), default=0)
+    print(f"Estimated grist costs for {len(derived.costs)} items in {passes} passes")
+    for cycle in derived.cycles:
+        print(f"Warning: Combination cycle without a known grist cost: {', '.join(cycle)}")
+    
+    # Grist costs and recipes of other mods, from the compat datapacks, kept per pack with namespaced ids
+    compat_dir = repo_root / COMPAT_PACKS_DIR
+    print(f"\nReading compat packs from {compat_dir}...")
+    compat_packs = read_compat_packs(compat_dir, manifest, args.workers)
+    compat_costs = sum(len(pack['grist_costs']) for pack in compat_packs.values())
+    compat_combinations = sum(len(pack['combinations']) for pack in compat_packs.values())
+    print(f"Found {compat_costs} grist costs and {compat_combinations} combinations in {len(compat_packs)} packs")
+    
+    # Fixed captcha codes from the mod's captcha_codes.json; the rest depend on the world seed
+    captcha_dirs = [repo_root / 'src' / 'main' / 'resources' / 'data',
+                    repo_root / 'src' / 'main' / 'generated' / 'resources' / 'data']
+    print("\nReading predetermined captcha codes...")
+    predetermined_captchas = read_predetermined_captchas(captcha_dirs)
+    for item_id, captcha in predetermined_captchas.items():
+        namespace, _, item_key = item_id.partition(':')
+        if namespace == 'minestuck' and item_key in items:
+            items[item_key]['captcha'] = captcha
+    print(f"Found {len(predetermined_captchas)} predetermined captcha codes")
+    
+    manifest.save()
+    print(f"\nRe-parsed {manifest.parsed} changed input files, reused {manifest.reused} unchanged ones")
     
     # Add grist costs and alchemy info to items
     for item_key in items:
         if item_key in grist_costs:
             items[item_key]['grist_cost'] = grist_costs[item_key]
+            if item_key in grist_cost_tags:
+                items[item_key]['grist_cost_tag'] = grist_cost_tags[item_key]
+        elif item_key in derived.costs:
+            items[item_key]['estimated_grist_cost'] = derived.costs[item_key]
         
         if item_key in alchemy_recipes:
-            items[item_key]['alchemy_modes'] = alchemy_recipes[item_key]['modes']
+            items[item_key]['alchemy_modes'] = alchemy_recipes[item_key]
     
     # Save to JSON
     output_file = Path(__file__).parent / 'items_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(items, f, indent=2, sort_keys=True)
+    write_json_file(output_file, items, indent=2, sort_keys=True)
     
     print(f"\nSaved item data to {output_file}")
     
+    # Save the full combination graph for /alchemize
+    combinations_file = Path(__file__).parent / 'combinations_data.json'
+    write_json_file(combinations_file, combinations, indent=2)
+    
+    print(f"Saved combination data to {combinations_file}")
+    
+    # Save grist costs of every item, vanilla ones included, for /route
+    grist_costs_file = Path(__file__).parent / 'grist_costs_data.json'
+    write_json_file(grist_costs_file, grist_costs, indent=2, sort_keys=True)
+    
+    print(f"Saved grist cost data to {grist_costs_file}")
+    
+    # Save the items of each ingredient tag for /route
+    item_tags_file = Path(__file__).parent / 'item_tags_data.json'
+    write_json_file(item_tags_file, recipe_tags, indent=2, sort_keys=True)
+    
+    print(f"Saved ingredient tag data to {item_tags_file}")
+    
+    # Save the compat packs, one entry per pack, so servers can pick the mods they run
+    compat_file = Path(__file__).parent / 'compat_data.json'
+    write_json_file(compat_file, compat_packs, indent=2, sort_keys=True)
+    
+    print(f"Saved compat pack data to {compat_file}")
+    
+    # Save each other locale to its own file, so the bot only loads the ones in use
+    for locale, (names, tooltips) in locale_strings.items():
+        locale_file = Path(__file__).parent / f'locale_{locale}.json'
+        write_json_file(locale_file, {'names': names, 'tooltips': tooltips},
+                        indent=2, sort_keys=True, ensure_ascii=False)
+        print(f"Saved {locale} names and tooltips to {locale_file}")
+    
+    # Save to the SQLite store used by DATA_BACKEND=sqlite, swapping the finished database in at once
+    database_file = Path(__file__).parent / 'minestuck_data.db'
+    with rebuild_database(database_file) as staging_file:
+        write_items_table(staging_file, items)
+        write_combinations_table(staging_file, combinations)
+        write_grist_costs_table(staging_file, grist_costs)
+        write_item_tags_table(staging_file, recipe_tags)
+        write_locale_strings_table(staging_file, locale_strings)
+        write_compat_packs_table(staging_file, compat_packs)
+    print(f"Saved item, combination, grist cost, ingredient tag, locale and compat pack data to {database_file}")
+    
     # Print some statistics
     types = {}
     for item_data in items.values():
@@ -378,8 +638,10 @@ def main():
     
     # Print grist and alchemy stats
     items_with_grist = sum(1 for item in items.values() if 'grist_cost' in item)
+    items_with_estimate = sum(1 for item in items.values() if 'estimated_grist_cost' in item)
     items_with_alchemy = sum(1 for item in items.values() if 'alchemy_modes' in item)
     print(f"\nItems with grist costs: {items_with_grist}")
+    print(f"Items with estimated grist costs: {items_with_estimate}")
     print(f"Items with alchemy recipes: {items_with_alchemy}")
 
 
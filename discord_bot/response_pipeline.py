@@ -0,0 +1,153 @@
+"""
+Single-round-trip responses for slash commands.
+Replies with the finished answer in one call, deferring only when it takes too long to build.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# How long to wait for an answer before deferring, in seconds.
+# Discord drops interactions that get no response within 3 seconds.
+DEFAULT_BUDGET = 1.5
+
+# Seconds after an interaction was created by which it must have a first response,
+# whatever held it before respond() ran; leaves room under Discord's 3 seconds for the request itself
+ACKNOWLEDGE_DEADLINE = 2.5
+
+# Sent instead of the answer when building it fails
+ERROR_REPLY_TEXT = "❌ Something went wrong while answering this command. Please try again later."
+
+# How long an interaction that arrives during startup waits for the data, in seconds,
+# before it gets a "still starting" answer; leaves time to answer within Discord's 3 seconds
+DEFAULT_READY_WAIT = 2.0
+
+# How many responses took each path, e.g. {'direct': 120, 'deferred': 3}
+RESPONSE_PATHS = Counter()
+
+
+class Reply(NamedTuple):
+    """The finished answer to a command: a plain message, an embed, or both, and an optional file to attach."""
+    content: Optional[str] = None
+    embed: Optional[discord.Embed] = None
+    attachment: Optional[Path] = None
+
+    def kwargs(self) -> dict:
+        """Keyword arguments for send_message / followup.send."""
+        kwargs = {}
+        if self.content is not None:
+            kwargs['content'] = self.content
+        if self.embed is not None:
+            kwargs['embed'] = self.embed
+        if self.attachment is not None:
+            # A discord.File can only be sent once, so each send opens its own
+            kwargs['file'] = discord.File(self.attachment, filename=self.attachment.name)
+        return kwargs
+
+
+def remaining_budget(interaction: discord.Interaction) -> float:
+    """Seconds left until ACKNOWLEDGE_DEADLINE, counted from when Discord created the interaction."""
+    elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    return ACKNOWLEDGE_DEADLINE - elapsed
+
+
+def _reply(interaction: discord.Interaction, task: asyncio.Future) -> Reply:
+    """The built reply, or an error message if building it failed."""
+    try:
+        return task.result()
+    except Exception:
+        command = interaction.command.name if interaction.command else '?'
+        log.exception("/%s failed to build its reply", command)
+        RESPONSE_PATHS['error'] += 1
+        return Reply(content=ERROR_REPLY_TEXT)
+
+
+async def respond(interaction: discord.Interaction, build: Callable[[], Reply],
+                  budget: float = DEFAULT_BUDGET, ephemeral: bool = False) -> str:
+    """
+    Build a reply off the event loop and send it with as few REST calls as possible.
+
+    If the reply is ready within ``budget`` seconds it is sent as the initial
+    interaction response, in a single call. Otherwise the interaction is
+    deferred so Discord shows "thinking...", and the reply is sent as a
+    followup once it is ready.
+
+    Parameters:
+    -----------
+    interaction: discord.Interaction
+        The interaction to respond to
+    build: callable
+        Produces the Reply; runs in a worker thread
+    budget: float
+        Seconds to wait for the reply before deferring. Time the interaction
+        already spent waiting, e.g. on the readiness gate, counts against
+        ACKNOWLEDGE_DEADLINE, so the budget shrinks to whatever is left of it
+    ephemeral: bool
+        Show the reply only to the user who ran the command
+
+    If ``build`` raises, the error is logged and the user gets an error
+    message instead of a reply, or of an endless "thinking...".
+
+    Returns the path taken, 'direct' or 'deferred', which is also logged and
+    counted in RESPONSE_PATHS.
+    """
+    start = time.perf_counter()
+    task = asyncio.ensure_future(asyncio.to_thread(build))
+    done, _ = await asyncio.wait({task}, timeout=max(0.0, min(budget, remaining_budget(interaction))))
+
+    visibility = {'ephemeral': True} if ephemeral else {}
+    if done:
+        path = 'direct'
+        await interaction.response.send_message(**_reply(interaction, task).kwargs(), **visibility)
+    else:
+        path = 'deferred'
+        await interaction.response.defer(thinking=True, **visibility)
+        await asyncio.wait({task})
+        await interaction.followup.send(**_reply(interaction, task).kwargs(), **visibility)
+
+    RESPONSE_PATHS[path] += 1
+    command = interaction.command.name if interaction.command else '?'
+    log.info("/%s answered via %s path in %.1f ms", command, path, (time.perf_counter() - start) * 1000)
+    return path
+
+
+async def hold_until_ready(interaction: discord.Interaction, wait_ready: Callable[[float], Awaitable[bool]],
+                           timeout: float = DEFAULT_READY_WAIT) -> bool:
+    """
+    Hold an interaction that arrived before the data finished loading.
+
+    Meant as the command tree's interaction_check. Once the data is loaded
+    this returns True straight away. Until then the interaction waits up to
+    ``timeout`` seconds, and never past ACKNOWLEDGE_DEADLINE; if the data is
+    still not ready, it gets a degraded answer instead, no choices for an
+    autocomplete or an ephemeral "still starting" message for a command,
+    and False is returned so the command doesn't run.
+
+    Parameters:
+    -----------
+    interaction: discord.Interaction
+        The incoming interaction
+    wait_ready: callable
+        Waits up to the given number of seconds for the data; returns whether it is loaded
+    timeout: float
+        Seconds to hold the interaction
+    """
+    if await wait_ready(max(0.0, min(timeout, remaining_budget(interaction)))):
+        return True
+    if interaction.type is discord.InteractionType.autocomplete:
+        await interaction.response.autocomplete([])
+    else:
+        await interaction.response.send_message(
+            "⏳ The bot is still starting up and loading its data. Please try again in a few seconds.",
+            ephemeral=True)
+    RESPONSE_PATHS['not ready'] += 1
+    command = interaction.command.name if interaction.command else '?'
+    log.info("/%s answered before the data was ready", command)
+    return False
@@ -0,0 +1,174 @@
+"""
+Prebuilt search indexes for the bot's autocomplete handlers.
+The indexes are built once when the data files load and never change afterwards.
+"""
+
+import heapq
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Any
+
+from fuzzy_search import FuzzyIndex
+
+# Sorts after every character that can appear in a lowercased key
+_MAX_CHAR = chr(0x10FFFF)
+
+# Discord rejects autocomplete choice names longer than this
+MAX_CHOICE_NAME_LENGTH = 100
+
+
+def truncate_choice_name(name: str) -> str:
+    """Shorten a choice name to fit Discord's limit, cutting at a word boundary."""
+    if len(name) > MAX_CHOICE_NAME_LENGTH:
+        return name[:MAX_CHOICE_NAME_LENGTH - 3].rsplit(' ', 1)[0] + '...'
+    return name
+
+
+class SubstringIndex:
+    """
+    Immutable substring index over a fixed set of entries.
+
+    Each entry has a display name, a value and one or more search keys.
+    An entry matches a query when the lowercased query is contained in any of
+    its lowercased keys, exactly like a plain ``in`` test. Results come back in
+    lexicographic order of the lowercased display name.
+
+    Internally every suffix of every key is stored in a sorted suffix array,
+    so a query is a binary search for the suffixes that start with it. Entries
+    are ranked by their sort order up front, which lets the top-k results be
+    picked from the matching ranks without sorting the full match set.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Iterable[str]]],
+                 label: Optional[Callable[[str], str]] = None):
+        """
+        Build the index.
+
+        Parameters:
+        -----------
+        entries: iterable of (name, value, keys)
+            Display name, choice value and the strings searched for matches
+        label: callable, optional
+            Applied once to each display name to produce the returned choice name
+        """
+        entries = list(entries)
+        # Stable sort keeps the original order for entries with equal names
+        order = sorted(range(len(entries)), key=lambda i: entries[i][0].lower())
+
+        names = (entries[i][0] for i in order)
+        self._names: Tuple[str, ...] = tuple(label(name) for name in names) if label else tuple(names)
+        self._values: Tuple[str, ...] = tuple(entries[i][1] for i in order)
+
+        self._keys: Tuple[Tuple[str, ...], ...] = tuple(
+            tuple(set(key.lower() for key in entries[i][2])) for i in order
+        )
+
+        suffixes = []
+        for rank, keys in enumerate(self._keys):
+            for key in keys:
+                for start in range(len(key)):
+                    suffixes.append((key[start:], rank))
+        suffixes.sort()
+
+        self._suffixes: Tuple[str, ...] = tuple(suffix for suffix, _ in suffixes)
+        self._suffix_ranks: Tuple[int, ...] = tuple(rank for _, rank in suffixes)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, str]]:
+        """Return up to ``limit`` (name, value) pairs matching the query."""
+        query = query.lower()
+        if not query:
+            ranks = range(min(limit, len(self._names)))
+        else:
+            lo = bisect_left(self._suffixes, query)
+            hi = bisect_left(self._suffixes, query + _MAX_CHAR, lo)
+            ranks = heapq.nsmallest(limit, set(self._suffix_ranks[lo:hi]))
+
+        return self.choices(ranks)
+
+    def matching_ranks(self, query: str, candidates: Optional[Sequence[int]] = None) -> Tuple[int, ...]:
+        """
+        Return the ranks of every entry matching the query, each once, in no particular order.
+
+        The match set can be most of the index, so it is left unsorted; pick
+        the top results with ``heapq.nsmallest``. When ``candidates`` is given
+        (ranks matching a substring of the query) only those entries are
+        tested, instead of the whole index.
+        """
+        query = query.lower()
+        if candidates is not None:
+            return tuple(rank for rank in candidates if any(query in key for key in self._keys[rank]))
+        if not query:
+            return tuple(range(len(self._names)))
+        lo = bisect_left(self._suffixes, query)
+        hi = bisect_left(self._suffixes, query + _MAX_CHAR, lo)
+        return tuple(set(self._suffix_ranks[lo:hi]))
+
+    def choices(self, ranks: Iterable[int]) -> List[Tuple[str, str]]:
+        """Return the (name, value) pairs for the given ranks."""
+        return [(self._names[rank], self._values[rank]) for rank in ranks]
+
+
+def item_entries(items: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str, Tuple[str, str]]]:
+    """Flatten items into (name, id, keys) entries, searching item names and ids."""
+    entries = []
+    for item_id, item_data in items.items():
+        item_name = item_data.get('name', item_id)
+        entries.append((item_name, item_id, (item_name, item_id)))
+    return entries
+
+
+def build_item_index(items: Dict[str, Dict[str, Any]]) -> SubstringIndex:
+    """Build the /item autocomplete index."""
+    return SubstringIndex(item_entries(items))
+
+
+def build_item_fuzzy_index(items: Dict[str, Dict[str, Any]]) -> FuzzyIndex:
+    """Build the typo-tolerant /item autocomplete index."""
+    return FuzzyIndex(item_entries(items))
+
+
+class DescriptionIndex:
+    """
+    Flattened index over every topic and subtopic in the descriptions data.
+
+    Topics and subtopics are flattened once into (display name, value id, keys)
+    entries. The /description topic option searches all of them at once, while
+    the subtopic option searches only the subtopics of the chosen topic.
+    The topic entries also get a typo-tolerant fuzzy index.
+    """
+
+    def __init__(self, descriptions: Dict[str, Dict[str, Any]]):
+        topic_entries = []
+        self._subtopics: Dict[str, SubstringIndex] = {}
+
+        for topic_id, topic_data in descriptions.items():
+            topic_name = topic_data.get('name', topic_id)
+            topic_entries.append((topic_name, topic_id, (topic_name, topic_id)))
+
+            subtopic_entries = []
+            for subtopic_id, subtopic_data in topic_data.get('subtopics', {}).items():
+                subtopic_name = subtopic_data.get('name', subtopic_id)
+                keys = (subtopic_name, subtopic_id)
+                topic_entries.append((f"{topic_name} - {subtopic_name}", f"{topic_id}:{subtopic_id}", keys))
+                subtopic_entries.append((subtopic_name, subtopic_id, keys))
+
+            if subtopic_entries:
+                self._subtopics[topic_id] = SubstringIndex(subtopic_entries)
+
+        self.topic_index = SubstringIndex(topic_entries, label=truncate_choice_name)
+        self.fuzzy_topic_index = FuzzyIndex(topic_entries, label=truncate_choice_name)
+
+    def subtopic_index(self, topic_id: str) -> Optional[SubstringIndex]:
+        """Return the index over a topic's subtopics, or None if it has none."""
+        return self._subtopics.get(topic_id)
+
+    def search_topics(self, query: str, limit: int) -> List[Tuple[str, str]]:
+        """Search topics and ``topic:subtopic`` entries; names are pre-truncated."""
+        return self.topic_index.search(query, limit)
+
+    def search_subtopics(self, topic_id: str, query: str, limit: int) -> List[Tuple[str, str]]:
+        """Search the subtopics of a single topic."""
+        index = self._subtopics.get(topic_id)
+        return index.search(query, limit) if index else []
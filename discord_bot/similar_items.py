@@ -0,0 +1,150 @@
+"""
+Nearest-neighbour "similar items" over combat stats, tier and grist makeup.
+Features are normalized into one matrix and every item's neighbours are found in batched NumPy passes at load time.
+"""
+
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+from stat_index import STAT_FIELDS
+
+# Neighbours kept per item
+SIMILAR_K = 10
+
+# Stats used as features; grist is added as its makeup and total below
+FEATURE_STATS = ('damage', 'speed', 'efficiency', 'durability', 'tier')
+
+# Stats compared on a log scale because their values span several orders of magnitude
+LOG_STATS = ('durability',)
+
+# Rows per block of the pairwise distance computation
+_BATCH_SIZE = 256
+
+
+class Neighbour(NamedTuple):
+    """A similar item and its distance in feature space (0 means identical features)."""
+    item_id: str
+    name: str
+    distance: float
+
+
+def _grist_cost(item: Mapping[str, Any]) -> Dict[str, int]:
+    cost = item.get('grist_cost') or item.get('estimated_grist_cost')
+    return cost if isinstance(cost, Mapping) else {}
+
+
+def _standardize(column: np.ndarray) -> np.ndarray:
+    """Scale a column to mean 0 and standard deviation 1 over the rows that have it; missing rows become 0."""
+    present = ~np.isnan(column)
+    if not present.any():
+        return np.zeros_like(column)
+    values = column[present]
+    spread = values.std() or 1.0
+    return np.where(present, (column - values.mean()) / spread, 0.0)
+
+
+def feature_matrix(items: Mapping[str, Mapping[str, Any]], item_ids: List[str]) -> np.ndarray:
+    """
+    Normalized features of each item, one row per id in ``item_ids``.
+
+    Each stat is standardized over the items that have it, with a 0/1 column
+    marking whether the item has combat stats at all, so weapons sit apart
+    from plain items. Grist makeup is each type's share of the item's total,
+    so a 5 Build item and a 500 Build item have the same makeup, and the
+    log of the total is standardized like a stat.
+    """
+    columns = []
+    for field in FEATURE_STATS:
+        values = [STAT_FIELDS[field](items[item_id]) for item_id in item_ids]
+        column = np.array([value if isinstance(value, (int, float)) else np.nan for value in values],
+                          dtype=np.float64)
+        if field in LOG_STATS:
+            column = np.log1p(np.maximum(column, 0))
+        columns.append(_standardize(column))
+    columns.append(np.array([items[item_id].get('attack_damage') is not None for item_id in item_ids],
+                            dtype=np.float64))
+
+    costs = [_grist_cost(items[item_id]) for item_id in item_ids]
+    grist_types = sorted({grist_type for cost in costs for grist_type in cost})
+    grist = np.zeros((len(item_ids), len(grist_types)), dtype=np.float64)
+    for row, cost in enumerate(costs):
+        for column, grist_type in enumerate(grist_types):
+            grist[row, column] = cost.get(grist_type, 0)
+    totals = grist.sum(axis=1)
+    makeup = np.divide(grist, totals[:, None], out=np.zeros_like(grist), where=totals[:, None] > 0)
+    columns.append(_standardize(np.where(totals > 0, np.log1p(np.maximum(totals, 0)), np.nan)))
+
+    return np.column_stack(columns + [makeup]) if item_ids else np.zeros((0, 0))
+
+
+def nearest_neighbours(features: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indexes of each row's ``k`` nearest other rows by Euclidean distance, nearest first.
+
+    Distances come from ``|a|² + |b|² - 2a·b`` over blocks of rows, so memory
+    stays at one block × all rows. Ties are broken by row index.
+    """
+    count = len(features)
+    k = min(k, count - 1)
+    if k <= 0:
+        return np.zeros((count, 0), dtype=np.int64)
+
+    squared = (features ** 2).sum(axis=1)
+    neighbours = np.empty((count, k), dtype=np.int64)
+    for start in range(0, count, _BATCH_SIZE):
+        block = features[start:start + _BATCH_SIZE]
+        distances = squared[start:start + _BATCH_SIZE, None] + squared[None, :] - 2 * block @ features.T
+        np.maximum(distances, 0, out=distances)
+        # An item is never its own neighbour
+        rows = np.arange(len(block))
+        distances[rows, start + rows] = np.inf
+        # A stable sort keeps equally distant rows in index order
+        neighbours[start:start + len(block)] = np.argsort(distances, axis=1, kind='stable')[:, :k]
+    return neighbours
+
+
+class SimilarityIndex:
+    """
+    Precomputed nearest neighbours of every item, built once per data load.
+
+    Items with neither combat stats nor a grist cost have no features and
+    are left out. A /similar query is a lookup into the neighbour table.
+    """
+
+    def __init__(self, items: Mapping[str, Mapping[str, Any]], k: int = SIMILAR_K):
+        """
+        Parameters:
+        -----------
+        items: mapping
+            Item records by id, as written by parse_items.py
+        k: int
+            Neighbours to keep per item
+        """
+        self.item_ids: List[str] = sorted(
+            item_id for item_id, item in items.items()
+            if item.get('attack_damage') is not None or _grist_cost(item)
+        )
+        self.names = [items[item_id].get('name', item_id) for item_id in self.item_ids]
+        self._rows = {item_id: row for row, item_id in enumerate(self.item_ids)}
+        self.features = feature_matrix(items, self.item_ids)
+
+        self._neighbours = nearest_neighbours(self.features, k)
+        # Distance to each kept neighbour, shown next to it
+        self._distances = np.linalg.norm(self.features[:, None, :] - self.features[self._neighbours], axis=2)
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def similar(self, item_id: str, limit: int = SIMILAR_K) -> Optional[List[Neighbour]]:
+        """The items closest to ``item_id``, nearest first, or None if it has no features."""
+        row = self._rows.get(item_id)
+        if row is None:
+            return None
+        return [
+            Neighbour(self.item_ids[neighbour], self.names[neighbour], float(distance))
+            for neighbour, distance in zip(self._neighbours[row, :limit], self._distances[row, :limit])
+        ]
@@ -0,0 +1,228 @@
+"""
+Columnar index of weapon and tool stats for the /search query language.
+Each stat is a NumPy column with a sorted index, so range filters and sorting are array operations.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Default and maximum number of results for a query
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+
+def _grist_total(item: Mapping[str, Any]) -> Optional[int]:
+    cost = item.get('grist_cost') or item.get('estimated_grist_cost')
+    return sum(cost.values()) if isinstance(cost, Mapping) and cost else None
+
+
+# Numeric fields a query can filter and sort on, and where each comes from in an item record;
+# items without their own durability have their tier's
+STAT_FIELDS: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    'damage': lambda item: item.get('attack_damage'),
+    'speed': lambda item: item.get('attack_speed'),
+    'efficiency': lambda item: item.get('efficiency'),
+    'durability': lambda item: item.get('durability') or item.get('tier_durability'),
+    'tier': lambda item: item.get('tier_level'),
+    'grist': _grist_total,
+}
+
+# Text fields a query can match exactly, e.g. type:sword or material:diamond
+TEXT_FIELDS: Dict[str, str] = {
+    'type': 'type',
+    'material': 'tier',
+}
+
+# Item record fields the stat and text columns are read from, along with the name
+ITEM_FIELDS = ('name', 'attack_damage', 'attack_speed', 'efficiency', 'durability', 'tier_durability', 'tier_level',
+               'grist_cost', 'estimated_grist_cost', 'type', 'tier')
+
+# Shorter spellings accepted in queries
+FIELD_ALIASES = {
+    'dmg': 'damage',
+    'attack': 'damage',
+    'spd': 'speed',
+    'eff': 'efficiency',
+    'dur': 'durability',
+    'cost': 'grist',
+    'mat': 'material',
+}
+
+# field, operator and value of one term, e.g. "tier>=5"
+_TERM_PATTERN = re.compile(r'([a-z_]+)(>=|<=|!=|>|<|=|:)(.+)')
+
+
+class QueryError(ValueError):
+    """Raised for a /search query that can't be parsed or names an unknown field or value."""
+
+
+class StatQuery(NamedTuple):
+    """A parsed /search query."""
+    ranges: List[Tuple[str, str, float]]
+    text: Dict[str, List[str]]
+    words: List[str]
+    sort: Optional[Tuple[str, bool]]
+    limit: int
+
+
+def _field(name: str) -> str:
+    return FIELD_ALIASES.get(name, name)
+
+
+def parse_query(query: str, max_limit: int = MAX_LIMIT) -> StatQuery:
+    """
+    Parse a query such as ``"type:sword tier>=5 damage>8 sort:-speed limit:10"``.
+
+    Terms are separated by spaces and all have to match. Stats take the
+    operators ``> >= < <= = !=`` (``:`` means ``=``), text fields take
+    ``:`` with one or more comma-separated values, ``sort:`` names a stat with
+    an optional ``-`` for highest first, and other words must appear in the
+    item's name.
+
+    Raises QueryError for anything else.
+    """
+    ranges = []
+    text: Dict[str, List[str]] = {}
+    words = []
+    sort = None
+    limit = DEFAULT_LIMIT
+
+    for term in query.lower().split():
+        match = _TERM_PATTERN.fullmatch(term)
+        if match is None:
+            words.append(term)
+            continue
+        field, operator, value = _field(match.group(1)), match.group(2), match.group(3)
+
+        if field == 'sort' and operator == ':':
+            descending = value.startswith('-')
+            sort_field = _field(value.lstrip('+-'))
+            if sort_field not in STAT_FIELDS:
+                raise QueryError(f"Can't sort by '{value.lstrip('+-')}'. Sort by one of: {', '.join(STAT_FIELDS)}")
+            sort = (sort_field, descending)
+        elif field == 'limit' and operator == ':':
+            if not value.isdigit() or not 1 <= int(value) <= max_limit:
+                raise QueryError(f"limit must be a whole number from 1 to {max_limit}")
+            limit = int(value)
+        elif field in TEXT_FIELDS:
+            if operator != ':':
+                raise QueryError(f"Use {field}:<value> to match {field}")
+            text.setdefault(field, []).extend(part for part in value.split(',') if part)
+        elif field in STAT_FIELDS:
+            try:
+                number = float(value)
+            except ValueError:
+                raise QueryError(f"'{value}' is not a number in '{term}'") from None
+            ranges.append((field, '=' if operator == ':' else operator, number))
+        else:
+            fields = list(STAT_FIELDS) + list(TEXT_FIELDS)
+            raise QueryError(f"Unknown field '{match.group(1)}'. Fields: {', '.join(fields)}")
+
+    return StatQuery(ranges, text, words, sort, limit)
+
+
+class StatIndex:
+    """
+    Every item's stats as float64 columns, built once per data load.
+
+    Items without a stat hold NaN in its column, so they never match a range
+    on it. Each column also keeps the row order sorted by value, which turns
+    a range filter into two binary searches and a slice, and sorting the
+    matches into picking the matching rows out of a pre-sorted order.
+    """
+
+    def __init__(self, items: Mapping[str, Mapping[str, Any]]):
+        """
+        Parameters:
+        -----------
+        items: mapping
+            Item records by id, as written by parse_items.py
+        """
+        self.item_ids: List[str] = sorted(items)
+        names = [items[item_id].get('name', item_id) for item_id in self.item_ids]
+        self._lower_names = np.array([name.lower() for name in names])
+        name_rank = np.argsort(np.argsort(self._lower_names, kind='stable'))
+        self._by_name = np.argsort(name_rank)
+
+        self.columns: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._sorted_values: Dict[str, np.ndarray] = {}
+        self._ascending: Dict[str, np.ndarray] = {}
+        self._descending: Dict[str, np.ndarray] = {}
+        for field, value_of in STAT_FIELDS.items():
+            values = [value_of(items[item_id]) for item_id in self.item_ids]
+            column = np.array([value if isinstance(value, (int, float)) else np.nan for value in values],
+                              dtype=np.float64)
+            missing = np.isnan(column)
+            self.columns[field] = column
+            # Rows with the stat, by value; missing values sort after every number
+            order = np.argsort(column, kind='stable')[:np.count_nonzero(~missing)]
+            self._sorted[field] = order
+            self._sorted_values[field] = column[order]
+            # Result orders for sort:field and sort:-field, ties by name, rows without the stat last
+            self._ascending[field] = np.lexsort((name_rank, column, missing))
+            self._descending[field] = np.lexsort((name_rank, -column, missing))
+
+        self._text: Dict[str, Dict[str, np.ndarray]] = {}
+        for field, key in TEXT_FIELDS.items():
+            values = np.array([str(items[item_id].get(key) or '').lower() for item_id in self.item_ids])
+            self._text[field] = {value: values == value for value in np.unique(values) if value}
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def text_values(self, field: str) -> List[str]:
+        """The values a text field takes, e.g. every item type."""
+        return sorted(self._text[field])
+
+    def _range_mask(self, field: str, operator: str, value: float) -> np.ndarray:
+        sorted_values = self._sorted_values[field]
+        low = np.searchsorted(sorted_values, value, side='left')
+        high = np.searchsorted(sorted_values, value, side='right')
+        bounds = {
+            '>': (high, len(sorted_values)),
+            '>=': (low, len(sorted_values)),
+            '<': (0, low),
+            '<=': (0, high),
+            '=': (low, high),
+            '!=': (low, high),
+        }
+        start, stop = bounds[operator]
+
+        mask = np.zeros(len(self.item_ids), dtype=bool)
+        if operator == '!=':
+            mask[self._sorted[field]] = True
+            mask[self._sorted[field][start:stop]] = False
+        else:
+            mask[self._sorted[field][start:stop]] = True
+        return mask
+
+    def search(self, query: StatQuery) -> Tuple[List[str], int]:
+        """
+        The ids of the first ``query.limit`` matching items and how many match in total.
+
+        Results are ordered by the query's sort field, or by name without one.
+        Raises QueryError for a text value no item has.
+        """
+        mask = np.ones(len(self.item_ids), dtype=bool)
+        for field, operator, value in query.ranges:
+            mask &= self._range_mask(field, operator, value)
+        for field, values in query.text.items():
+            matches = np.zeros(len(self.item_ids), dtype=bool)
+            for value in values:
+                if value not in self._text[field]:
+                    raise QueryError(f"No item has {field} '{value}'. Try: {', '.join(self.text_values(field))}")
+                matches |= self._text[field][value]
+            mask &= matches
+        for word in query.words:
+            mask &= np.char.find(self._lower_names, word) >= 0
+
+        if query.sort is None:
+            order = self._by_name
+        else:
+            field, descending = query.sort
+            order = self._descending[field] if descending else self._ascending[field]
+        rows = order[mask[order]]
+        return [self.item_ids[row] for row in rows[:query.limit]], len(rows)
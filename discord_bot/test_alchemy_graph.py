@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the alchemy combination graph.
+Checks indexed lookups against a full scan of the recipes, for both storage backends.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from alchemy_graph import AlchemyGraph
+from alchemy_route import RoutePlanner, RouteTimeout
+from data_repository import (SqliteRepository, write_combinations_table, write_grist_costs_table, write_item_tags_table,
+                             write_items_table)
+from grist_derivation import derive_grist_costs
+
+
+def load_items():
+    """Load items from JSON file."""
+    items_file = Path(__file__).parent / 'items_data.json'
+    with open(items_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_combinations():
+    """Load combination recipes from JSON file."""
+    combinations_file = Path(__file__).parent / 'combinations_data.json'
+    with open(combinations_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_lookups_match_full_scan():
+    combinations = load_combinations()
+    graph = AlchemyGraph(combinations, {})
+
+    for input1, input2, mode, output in combinations:
+        expected = [c for c in combinations if {c[0], c[1]} == {input1, input2} and c[2] == mode]
+        assert [list(c) for c in graph.combine(input2, input1, mode)] == expected
+        assert [list(c) for c in graph.recipes_for(output)] == [c for c in combinations if c[3] == output]
+        assert [list(c) for c in graph.uses_of(input1)] == [c for c in combinations if input1 in (c[0], c[1])]
+
+    assert graph.combine('birch_door', 'jungle_door', 'and') == []
+    assert graph.recipes_for('not_an_item') == []
+
+
+def test_names_and_autocomplete():
+    graph = AlchemyGraph([['#minecraft:boats', 'gold_block', 'and', 'gold_boat']], {'gold_boat': 'Golden Boat'})
+
+    assert graph.name('gold_boat') == 'Golden Boat'
+    assert graph.name('gold_block') == 'Gold Block'
+    assert graph.name('#minecraft:boats') == '#minecraft:boats'
+    assert graph.index.search('boat', 5) == [('#minecraft:boats', '#minecraft:boats'), ('Golden Boat', 'gold_boat')]
+
+
+def test_sqlite_graph_matches_json():
+    items = load_items()
+    combinations = load_combinations()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'minestuck_data.db'
+        write_items_table(db_path, items)
+        write_combinations_table(db_path, combinations)
+        graph = SqliteRepository(db_path).alchemy_graph()
+
+        assert [list(c) for c in graph.combinations] == combinations
+        assert graph.names == AlchemyGraph(combinations, {k: v['name'] for k, v in items.items()}).names
+
+
+def test_route_planner_finds_cheapest_chain():
+    graph = AlchemyGraph([
+        ['log', 'stone', 'and', 'hammer'],
+        ['hammer', 'stone', 'or', 'sledge'],
+        ['log', 'log', 'or', 'plank'],
+        ['plank', 'stone', 'and', 'sledge'],
+        ['sledge', 'gem', 'and', 'crusher'],
+    ], {})
+    planner = RoutePlanner(graph, {
+        'hammer': {'Build': 10}, 'sledge': {'Build': 20}, 'plank': {'Build': 1}, 'crusher': {'Build': 50},
+    })
+
+    # Plank (1) beats hammer (10) on the way to sledge
+    route = planner.plan(['log', 'stone'], 'sledge')
+    assert [c.output for c in route.steps] == ['plank', 'sledge']
+    assert route.grist == {'Build': 21}
+
+    # Both ingredients of an && / || combination are needed
+    assert planner.plan(['log', 'stone'], 'crusher') is None
+    route = planner.plan(['log', 'stone', 'gem'], 'crusher')
+    assert [c.output for c in route.steps] == ['plank', 'sledge', 'crusher']
+
+    assert planner.plan(['sledge'], 'sledge').steps == []
+    # Items without a known grist cost are reported rather than silently counted as free
+    assert planner.plan(['log', 'stone', 'gem'], 'crusher').unknown_cost == []
+    assert RoutePlanner(graph, {}).plan(['log'], 'plank').unknown_cost == ['plank']
+
+
+def test_route_planner_expands_tags():
+    graph = AlchemyGraph([
+        ['#minecraft:planks', 'stone', 'and', 'carved_planks'],
+        ['log', 'log', 'or', 'oak_planks'],
+        ['carved_planks', '#c:gems', 'and', 'idol'],
+    ], {})
+    item_tags = {'#minecraft:planks': ['oak_planks', 'birch_planks'], '#c:gems': ['amber']}
+    planner = RoutePlanner(graph, {'carved_planks': {'Build': 4}, 'oak_planks': {'Build': 1}, 'idol': {'Build': 9}},
+                           item_tags)
+
+    # An owned item of the tag satisfies the ingredient, and is named in the step
+    assert planner.knows('birch_planks') and not planner.knows('spruce_planks')
+    route = planner.plan(['birch_planks', 'stone'], 'carved_planks')
+    assert [tuple(c) for c in route.steps] == [('birch_planks', 'stone', 'and', 'carved_planks')]
+    assert route.grist == {'Build': 4}
+
+    # So does a crafted one
+    route = planner.plan(['log', 'stone', 'amber'], 'idol')
+    assert [tuple(c) for c in route.steps] == [('log', 'log', 'or', 'oak_planks'),
+                                               ('oak_planks', 'stone', 'and', 'carved_planks'),
+                                               ('carved_planks', 'amber', 'and', 'idol')]
+    assert route.grist == {'Build': 14}
+
+    # Owning the tag itself still works, and items outside every tag still don't
+    assert planner.plan(['#minecraft:planks', 'stone'], 'carved_planks').steps[0].input1 == '#minecraft:planks'
+    assert planner.plan(['stone', 'spruce_planks'], 'carved_planks') is None
+
+    # The SQLite store keeps the tags for its planner
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / 'minestuck_data.db'
+        write_items_table(db_path, {})
+        write_combinations_table(db_path, [list(c) for c in graph.combinations])
+        write_grist_costs_table(db_path, {'carved_planks': {'Build': 4}})
+        write_item_tags_table(db_path, item_tags)
+        route = SqliteRepository(db_path).alchemy_route_planner().plan(['birch_planks', 'stone'], 'carved_planks')
+        assert route.steps[0].input1 == 'birch_planks'
+
+
+def test_route_planner_respects_budget():
+    combinations = load_combinations()
+    graph = AlchemyGraph(combinations, {})
+    outputs = {c.output for c in graph.combinations}
+    owned = [item_id for item_id in graph.names if item_id not in outputs]
+    planner = RoutePlanner(graph, {})
+
+    try:
+        planner.plan(owned, 'not_an_item', budget=0)
+        assert False, "expected RouteTimeout"
+    except RouteTimeout:
+        pass
+    # The interrupted search is resumed, not restarted
+    assert planner.plan(owned, 'not_an_item') is None
+
+
+def test_derived_grist_costs():
+    derived = derive_grist_costs(['Build', 'Amber'], {'log': {'Build': 2}, 'gem': {'Amber': 5}, 'mud': {'Build': 9}}, [
+        ['log', 'gem', 'and', 'hammer'],
+        ['hammer', 'log', 'or', 'sledge'],
+        ['mud', 'mud', 'or', 'sledge'],
+        ['sledge', 'ghost', 'and', 'phantom'],
+        ['ladder', 'log', 'or', 'rail'],
+        ['rail', 'log', 'or', 'ladder'],
+    ])
+
+    assert derived.costs['hammer'] == {'Build': 2, 'Amber': 5}
+    # Found in the first pass from mud + mud, before hammer is costed
+    assert derived.costs['sledge'] == {'Build': 18}
+    assert derived.levels == {'hammer': 1, 'sledge': 1}
+    # Made from an item without any cost, but not part of a cycle
+    assert 'phantom' not in derived.costs
+    assert derived.cycles == [['ladder', 'rail']]
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Indexed lookups match a full scan")
+    test_lookups_match_full_scan()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Display names and autocomplete")
+    test_names_and_autocomplete()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: SQLite graph matches JSON graph")
+    test_sqlite_graph_matches_json()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Route planner finds the cheapest chain")
+    test_route_planner_finds_cheapest_chain()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 5: Route planner expands tag ingredients")
+    test_route_planner_expands_tags()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 6: Route planner respects its time budget")
+    test_route_planner_respects_budget()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 7: Grist costs are derived through the combination graph")
+    test_derived_grist_costs()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
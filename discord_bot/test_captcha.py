@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the captcha code port.
+Checks java.util.Random vectors, the batched table against single items, and collision handling.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import captcha
+from captcha import (EMPTY_CARD_CAPTCHA, CaptchaTables, JavaRandom, build_captcha_table, generated_captcha,
+                     java_string_hash, parse_seed, read_predetermined_captchas)
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Regression vectors: (seed, item id, code) as printed by this port for items without collisions.
+# They only catch changes to the port; its match with the mod rests on the java.util.Random and
+# String.hashCode vectors below, which were printed by a JVM. No code printed by the mod itself
+# is checked in yet; add one from an in-game captchalogue card with its world seed when at hand.
+REGRESSION_CODES = [
+    (0, 'minestuck:zillyhoo_hammer', 'd2t96tVt'),
+    (0, 'minestuck:captcha_card', 'BGtnMVPZ'),
+    (0, 'minecraft:stick', 'FWiNoAX9'),
+    (12345, 'minestuck:zillyhoo_hammer', '3VWkSa7x'),
+    (12345, 'minestuck:captcha_card', '0Hst0CdG'),
+    (-4962768465676381896, 'minecraft:stick', 'M1a6ckMg'),
+]
+
+
+def test_java_random_vectors():
+    # Values printed by java.util.Random and String.hashCode
+    random = JavaRandom(0)
+    assert [random.next(32), random.next(32)] == [-1155484576, -723955400]
+    assert JavaRandom(42).next(32) == -1170105035
+    assert JavaRandom(0).next_long() == -4962768465676381896
+    assert JavaRandom(42).next_long() == -5025562857975149833
+    random = JavaRandom(42)
+    assert [random.next_int(10) for _ in range(5)] == [0, 3, 8, 4, 0]
+    assert java_string_hash('hello') == 99162322
+    assert java_string_hash('') == 0
+
+    assert parse_seed(' 12345 ') == 12345
+    assert parse_seed('minestuck') == java_string_hash('minestuck')
+    assert parse_seed('9223372036854775808') == java_string_hash('9223372036854775808')
+    assert parse_seed('-42') == -42
+    # Long.parseLong rejects underscores, so Minecraft hashes the text
+    assert parse_seed('1_000') == 48130338
+    # Minecraft gives a world with an empty seed field a random seed, not seed 0
+    for blank in ('', '   '):
+        with pytest.raises(ValueError):
+            parse_seed(blank)
+
+
+def test_regression_codes():
+    for seed, item_id, code in REGRESSION_CODES:
+        assert generated_captcha(seed, item_id) == code
+        assert build_captcha_table(seed, [item_id], {}).code(item_id) == code
+
+
+def test_batched_table_matches_single_items():
+    with open(Path(__file__).parent / 'items_data.json', 'r', encoding='utf-8') as f:
+        item_ids = [f'minestuck:{item_id}' for item_id in sorted(json.load(f))]
+
+    for seed in (0, -1, 8675309):
+        table = build_captcha_table(seed, item_ids, {})
+        assert len(table) == len(item_ids)
+        assert all(table.code(item_id) == generated_captcha(seed, item_id) for item_id in item_ids)
+        assert all(table.item(table.code(item_id)) == item_id for item_id in item_ids)
+
+
+def test_predetermined_and_collisions():
+    predetermined = read_predetermined_captchas([REPO_ROOT / 'src' / 'main' / 'resources' / 'data'])
+    assert predetermined['minestuck:sord'] == 'SUPRePIC'
+    assert predetermined['minestuck:generic_object'] == EMPTY_CARD_CAPTCHA
+
+    # A predetermined code takes precedence, and a later item with the same code gets a backup
+    hammer = generated_captcha(0, 'minestuck:zillyhoo_hammer')
+    table = build_captcha_table(0, ['minestuck:zillyhoo_hammer', 'minestuck:sord'],
+                                {'minestuck:sord': hammer})
+    assert table.code('minestuck:sord') == hammer
+    backup = table.code('minestuck:zillyhoo_hammer')
+    assert backup != hammer and backup.endswith('#') and len(backup) == 8
+    # The backup comes from the item's random source, right after its shuffle
+    random = captcha.item_random(0, 'minestuck:zillyhoo_hammer')
+    for index in range(64):
+        random.next_int(index + 1)
+    assert backup == ''.join(captcha.AVAILABLE_CHARACTERS[random.next_int(64)] for _ in range(7)) + '#'
+
+    # Between generated codes, the first item keeps its code
+    duplicate = build_captcha_table(0, ['minestuck:zillyhoo_hammer', 'minestuck:zillyhoo_hammer'], {})
+    assert len(duplicate) == 1 and duplicate.code('minestuck:zillyhoo_hammer') == hammer
+
+
+def test_tables_are_cached_per_seed():
+    tables = CaptchaTables(['minestuck:zillyhoo_hammer', 'minestuck:captcha_card'], {}, max_seeds=2)
+    first = tables.table(0)
+    assert tables.table(0) is first
+    tables.table(1)
+    tables.table(0)
+    tables.table(2)
+    # Seed 1 was used least recently, so it was dropped
+    assert len(tables) == 2 and tables.table(0) is first
+    assert tables.code(12345, 'minecraft:stick') == 'XJISsISH'
+
+
+def main():
+    """Run tests."""
+    print("Test 1: java.util.Random and String.hashCode match Java")
+    test_java_random_vectors()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Codes match the regression vectors")
+    test_regression_codes()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: The batched table matches item-by-item codes")
+    test_batched_table_matches_single_items()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Predetermined codes and collisions")
+    test_predetermined_and_collisions()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 5: Tables are cached per seed")
+    test_tables_are_cached_per_seed()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify command tree syncing and startup timings.
+Checks that the tree hash follows the commands and that unchanged trees skip the sync.
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+import discord
+from discord import app_commands
+
+from command_sync import CommandSyncState, StartupTimer, command_tree_hash, sync_if_changed
+
+
+class _RecordingTree(app_commands.CommandTree):
+    """A command tree that counts its syncs instead of calling Discord."""
+
+    syncs = 0
+
+    async def sync(self, *, guild=None):
+        self.syncs += 1
+        return self.get_commands()
+
+
+def _tree(description: str = "Look up an item") -> _RecordingTree:
+    tree = _RecordingTree(discord.Client(intents=discord.Intents.none()))
+
+    @tree.command(name="item", description=description)
+    async def item(interaction: discord.Interaction, name: str):
+        pass
+
+    @tree.command(name="grist", description="List grist")
+    async def grist(interaction: discord.Interaction):
+        pass
+
+    return tree
+
+
+def test_hash_follows_the_commands():
+    assert command_tree_hash(_tree()) == command_tree_hash(_tree())
+    assert command_tree_hash(_tree()) != command_tree_hash(_tree("Look up any item"))
+
+
+def test_unchanged_tree_skips_the_sync():
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'command_sync.json'
+        tree = _tree()
+
+        assert asyncio.run(sync_if_changed(tree, 1, CommandSyncState(path))) == 2
+        # A restart with the same commands reads the saved hash and skips the sync
+        assert asyncio.run(sync_if_changed(tree, 1, CommandSyncState(path))) is None
+        assert tree.syncs == 1
+        assert asyncio.run(sync_if_changed(tree, 1, CommandSyncState(path), force=True)) == 2
+        assert tree.syncs == 2
+
+        # Changed commands and other applications are synced
+        assert CommandSyncState(path).needs_sync(1, command_tree_hash(_tree("Look up any item")))
+        assert CommandSyncState(path).needs_sync(2, command_tree_hash(tree))
+
+
+def test_startup_phases():
+    ticks = iter([10.0, 10.125, 10.25, 11.5, 12.0, 12.0, 12.25])
+    timer = StartupTimer(clock=lambda: next(ticks))
+    # The data loads while the bot logs in
+    timer.begin('data load')
+    timer.begin('login')
+    assert timer.end('login') == 1.25
+    assert not timer.done('data load')
+    assert timer.end('data load') == 1.875
+    with timer.phase('command sync'):
+        pass
+
+    assert timer.done('data load') and timer.done('command sync')
+    assert timer.profile() == {
+        'total_ms': 2250.0,
+        'phases': [
+            {'phase': 'data load', 'start_ms': 125.0, 'end_ms': 2000.0, 'duration_ms': 1875.0},
+            {'phase': 'login', 'start_ms': 250.0, 'end_ms': 1500.0, 'duration_ms': 1250.0},
+            {'phase': 'command sync', 'start_ms': 2000.0, 'end_ms': 2250.0, 'duration_ms': 250.0},
+        ],
+    }
+
+
+def main():
+    """Run tests."""
+    print("Test 1: The tree hash follows the commands")
+    test_hash_follows_the_commands()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: An unchanged tree skips the sync")
+    test_unchanged_tree_skips_the_sync()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Startup phases are timed")
+    test_startup_phases()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
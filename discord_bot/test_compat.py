@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script to verify compat pack ingestion.
+Checks namespaced ids, per-pack partitions and the packs each guild enables.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from compat import (COMPAT_PACKS_DIR, CompatGristCosts, CompatIndex, CompatSettings, parse_compat_file, qualified_id,
+                    read_compat_packs)
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def _parse(data: dict):
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = Path(directory) / 'recipe.json'
+        json_file.write_text(json.dumps(data), encoding='utf-8')
+        return parse_compat_file(json_file)
+
+
+def test_ids_keep_their_namespace():
+    assert qualified_id('stick') == 'minecraft:stick'
+    assert qualified_id('quark:crab_leg') == 'quark:crab_leg'
+    assert qualified_id('#forge:ingots') == '#forge:ingots'
+
+    assert _parse({'type': 'minestuck:grist_cost', 'grist_cost': {'minestuck:iodine': 3},
+                   'ingredient': {'item': 'quark:crab_leg'}}) == ['grist_cost', 'quark:crab_leg', {'Iodine': 3}]
+    assert _parse({'type': 'minestuck:combination', 'input1': {'item': 'minecraft:grass'},
+                   'input2': {'tag': 'forge:mushrooms'}, 'mode': 'or',
+                   'output': {'item': 'farmersdelight:brown_mushroom_colony'}}) == [
+        'combination', ['minecraft:grass', '#forge:mushrooms', 'or', 'farmersdelight:brown_mushroom_colony']]
+    # The player picks the grist type of a wildcard cost, and weapon attributes aren't recipes
+    assert _parse({'type': 'minestuck:wildcard_grist_cost', 'grist_cost': 20,
+                   'ingredient': {'item': 'extradelight:bad_food'}}) is None
+    assert _parse({'parent': 'bettercombat:sword'}) is None
+
+
+def test_official_packs_are_read():
+    packs = read_compat_packs(REPO_ROOT / COMPAT_PACKS_DIR)
+
+    assert {'quark', 'create', 'farmersdelight'} <= set(packs)
+    assert packs['quark']['grist_costs']['quark:crab_leg'] == {'Iodine': 3, 'Garnet': 1}
+    assert packs['quark']['name'] == 'MinestuckQuarkCompat'
+    assert all(':' in item_id for pack in packs.values() for item_id in pack['grist_costs'])
+    assert ['minecraft:grass', 'minecraft:brown_mushroom', 'or', 'farmersdelight:brown_mushroom_colony'] in \
+        packs['farmersdelight']['combinations']
+
+
+def test_lookups_only_see_enabled_packs():
+    index = CompatIndex({
+        'quark': {'grist_costs': {'quark:crab_leg': {'Iodine': 3}, 'minecraft:egg': {'Amber': 1}}},
+        'create': {'grist_costs': {'create:zinc_ingot': {'Build': 4}, 'minecraft:egg': {'Build': 9}},
+                   'combinations': [['create:zinc_ingot', 'minecraft:stick', 'and', 'create:wrench']]},
+    })
+
+    assert index.packs == ['create', 'quark']
+    assert index.item_count('create') == 3
+    assert index.lookup('quark:crab_leg', ['create']) == []
+    assert [entry.pack for entry in index.lookup('minecraft:egg', ['create', 'quark'])] == ['create', 'quark']
+    wrench = index.lookup('create:wrench', ['create', 'unknown'])
+    assert wrench[0].grist_cost is None and wrench[0].combinations[0][0] == 'create:zinc_ingot'
+
+    assert index.search('', 10, ['quark']) == [('Crab Leg', 'quark:crab_leg'), ('Egg', 'minecraft:egg')]
+    assert index.search('egg', 10, ['create', 'quark']) == [('Egg', 'minecraft:egg')]
+    assert index.grist_costs(['create', 'quark'])['minecraft:egg'] == {'Build': 9}
+
+
+def test_grist_costs_of_enabled_packs():
+    index = CompatIndex({
+        'quark': {'grist_costs': {'quark:crab_leg': {'Iodine': 3}, 'minecraft:egg': {'Amber': 1},
+                                  'minecraft:stick': {'Build': 50}}},
+        'create': {'grist_costs': {'create:zinc_ingot': {'Build': 4}, 'minecraft:egg': {'Build': 9}}},
+    })
+    grist = CompatGristCosts(index, {'stick': {'Build': 2}, 'sord': {'Build': 5}}, {'sord': 'Sord'}, max_sets=2)
+
+    costs, types = grist.indexes(['quark', 'unknown'])
+    # Vanilla items match the base data's ids, whose own costs win
+    assert sorted(costs.item_ids) == ['egg', 'quark:crab_leg', 'sord', 'stick']
+    affordable, total = costs.affordable({'Build': 10, 'Iodine': 3, 'Amber': 1}, 10)
+    assert total == 4 and ('quark:crab_leg', 'Crab Leg') in [(item.item_id, item.name) for item in affordable]
+    assert [use.name for use in types.most('Build', 10)] == ['Sord', 'Stick']
+    # Where packs disagree, the first pack in order wins
+    affordable, _ = grist.indexes(['create', 'quark'])[0].affordable({'Build': 9}, 10)
+    assert [(item.item_id, item.total) for item in affordable] == [
+        ('egg', 9), ('sord', 5), ('create:zinc_ingot', 4), ('stick', 2)]
+
+    # Each set of packs is built once; the least recently used set is dropped
+    assert grist.indexes(['quark']) is grist.indexes(['quark', 'unknown'])
+    first = grist.indexes(['create'])
+    grist.indexes(['quark'])
+    grist.indexes(['create', 'quark'])
+    assert grist.indexes(['create']) is not first
+
+
+def test_guild_settings():
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'compat_settings.json'
+        settings = CompatSettings(path)
+        available = ['create', 'quark']
+
+        # Servers start with no packs; direct messages, where none can be picked, see them all
+        assert settings.enabled(1, available) == []
+        assert settings.enabled(None, available) == available
+        settings.set_enabled(1, ['quark', 'retired'])
+
+        reloaded = CompatSettings(path)
+        assert reloaded.enabled(1, available) == ['quark']
+        assert reloaded.enabled(2, available) == []
+        reloaded.set_enabled(1, None)
+        assert CompatSettings(path).enabled(1, available) == []
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Ids keep their namespace")
+    test_ids_keep_their_namespace()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: The official compat packs are read")
+    test_official_packs_are_read()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Lookups only see enabled packs")
+    test_lookups_only_see_enabled_packs()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Grist costs include the enabled packs")
+    test_grist_costs_of_enabled_packs()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 5: Each guild picks its own packs")
+    test_guild_settings()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
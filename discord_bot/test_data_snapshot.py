@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script to verify hot reloading of data snapshots.
+Checks versioning, atomic swaps and that broken data files never replace a working snapshot.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from data_repository import SqliteRepository, rebuild_database, write_items_table
+from data_snapshot import SnapshotManager
+
+
+def write_json(path: Path, data, bump: int = 0):
+    """Write a data file and move its mtime forward so the change is always visible."""
+    path.write_text(json.dumps(data) if not isinstance(data, str) else data, encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+
+def make_manager(path: Path) -> SnapshotManager:
+    def load():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return SnapshotManager([path], load)
+
+
+def test_reload_swaps_in_a_new_version():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'items_data.json'
+        write_json(path, {'sord': {}})
+        manager = make_manager(path)
+        first = manager.current
+        assert first.version == 1
+
+        write_json(path, {'sord': {}, 'sburb_code': {}}, bump=1)
+        second = asyncio.run(manager.reload())
+
+        assert manager.current is second
+        assert second.version == 2
+        assert set(second.repository) == {'sord', 'sburb_code'}
+        # Anything still holding the old snapshot keeps seeing the old data
+        assert set(first.repository) == {'sord'}
+
+
+def test_watch_skips_broken_files():
+    async def run(path: Path, manager: SnapshotManager):
+        watcher = asyncio.create_task(manager.watch(0.01))
+        try:
+            # Half-written JSON must not replace the working snapshot
+            write_json(path, '{"sord": {', bump=1)
+            await asyncio.sleep(0.1)
+            assert manager.current.version == 1
+
+            write_json(path, {'sord': {}, 'wet_swonge': {}}, bump=2)
+            for _ in range(100):
+                if manager.current.version > 1:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            watcher.cancel()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'items_data.json'
+        write_json(path, {'sord': {}})
+        manager = make_manager(path)
+        asyncio.run(run(path, manager))
+
+        assert manager.current.version == 2
+        assert set(manager.current.repository) == {'sord', 'wet_swonge'}
+
+
+def test_first_snapshot_loads_in_the_background():
+    async def run(manager: SnapshotManager):
+        assert manager.current is None
+        # Nothing is loaded yet, so a short wait gives up
+        assert not await manager.wait_ready(0.01)
+        waiter = asyncio.create_task(manager.wait_ready(5))
+        loader = asyncio.create_task(manager.start())
+        assert await waiter
+        snapshot = await loader
+        assert manager.current is snapshot and snapshot.version == 1
+        assert await manager.wait_ready(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'items_data.json'
+        write_json(path, {'sord': {}})
+
+        def load():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        asyncio.run(run(SnapshotManager([path], load, preload=False)))
+
+
+def test_sqlite_snapshots_keep_their_database():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'minestuck_data.db'
+        with rebuild_database(db_path) as staging_file:
+            write_items_table(staging_file, {'sord': {'name': 'Sord'}})
+        old = SqliteRepository(db_path)
+        assert old.item_count() == 1
+
+        with rebuild_database(db_path) as staging_file:
+            # Nothing is visible until the rebuild is finished
+            write_items_table(staging_file, {})
+            assert old.item_count() == 1 and SqliteRepository(db_path).item_count() == 1
+            write_items_table(staging_file, {'sord': {'name': 'Sord'}, 'wet_swonge': {'name': 'Wet Swonge'}})
+
+        # The old snapshot still reads the file it was opened on, from any thread
+        assert old.item_count() == 1
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(old.item_count).result() == 1
+            assert pool.submit(old.get_item, 'wet_swonge').result() is None
+        assert SqliteRepository(db_path).item_count() == 2
+
+        # A failed rebuild leaves the database as it was
+        try:
+            with rebuild_database(db_path) as staging_file:
+                write_items_table(staging_file, {})
+                raise RuntimeError("parser crashed")
+        except RuntimeError:
+            pass
+        assert SqliteRepository(db_path).item_count() == 2
+        assert not (Path(tmp) / 'minestuck_data.db.tmp').exists()
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Reload swaps in a new version")
+    test_reload_swaps_in_a_new_version()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Watcher skips broken data files")
+    test_watch_skips_broken_files()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: The first snapshot loads in the background")
+    test_first_snapshot_loads_in_the_background()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: SQLite snapshots keep their database")
+    test_sqlite_snapshots_keep_their_database()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the rendered embed cache.
+Checks LRU eviction, version changes and renders that race a reload.
+"""
+
+import threading
+
+import discord
+
+from embed_cache import EmbedCache
+
+
+def _render(title: str):
+    return lambda: discord.Embed(title=title)
+
+
+def test_least_recently_used_embeds_are_dropped():
+    cache = EmbedCache(max_entries=2)
+    first = cache.get(1, 'a', _render('a'))
+    cache.get(1, 'b', _render('b'))
+    assert cache.get(1, 'a', _render('other')) is first
+    cache.get(1, 'c', _render('c'))
+
+    # 'b' was used least recently
+    assert len(cache) == 2
+    assert cache.get(1, 'a', _render('other')) is first
+    assert cache.get(1, 'b', _render('b again')).title == 'b again'
+
+
+def test_versions_only_go_up():
+    cache = EmbedCache()
+    cache.get(1, 'a', _render('old'))
+    assert cache.get(2, 'a', _render('new')).title == 'new'
+    # A command still on the old snapshot gets its own embed, and the new one stays cached
+    assert cache.get(1, 'a', _render('old')).title == 'old'
+    assert cache.get(2, 'a', _render('other')).title == 'new'
+
+
+def test_renders_racing_a_reload_are_not_stored():
+    cache = EmbedCache()
+    started, reloaded = threading.Event(), threading.Event()
+
+    def slow_render():
+        started.set()
+        reloaded.wait(5)
+        return discord.Embed(title='old')
+
+    worker = threading.Thread(target=lambda: cache.get(1, 'a', slow_render))
+    worker.start()
+    started.wait(5)
+    cache.get(2, 'b', _render('new'))
+    reloaded.set()
+    worker.join()
+
+    # The embed rendered from version 1 never lands in the version 2 cache
+    assert len(cache) == 1
+    assert cache.get(2, 'a', _render('fresh')).title == 'fresh'
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Least recently used embeds are dropped")
+    test_least_recently_used_embeds_are_dropped()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Versions only go up")
+    test_versions_only_go_up()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Renders racing a reload are not stored")
+    test_renders_racing_a_reload_are_not_stored()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
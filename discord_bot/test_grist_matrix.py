@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the grist cost matrix and its grist type index.
+Checks vectorized affordability and top-k queries against plain loops over the costs.
+"""
+
+import json
+import random
+from pathlib import Path
+
+from grist_matrix import GristCostMatrix, GristTypeIndex, parse_grist_inventory
+
+
+def load_grist_costs():
+    """Load grist costs from JSON file."""
+    grist_costs_file = Path(__file__).parent / 'grist_costs_data.json'
+    with open(grist_costs_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_inventory_parsing():
+    grist_types = ['Amber', 'Build', 'Shale']
+    inventory, unknown = parse_grist_inventory("50 build, shale: 20; amber=3 10 amber grist, 7 bread", grist_types)
+
+    assert inventory == {'Build': 50, 'Shale': 20, 'Amber': 13}
+    assert unknown == ['bread']
+    assert parse_grist_inventory("", grist_types) == ({}, [])
+
+
+def test_affordable_matches_loop():
+    grist_costs = load_grist_costs()
+    costs = GristCostMatrix(grist_costs, {})
+    valid = {item_id: cost for item_id, cost in grist_costs.items() if isinstance(cost, dict) and cost}
+    rng = random.Random(413)
+
+    for _ in range(50):
+        inventory = {grist_type: rng.choice([0, 5, 20, 100, 1000]) for grist_type in costs.grist_types}
+        expected = sorted(
+            (item_id for item_id, cost in valid.items()
+             if all(amount <= inventory.get(grist_type, 0) for grist_type, amount in cost.items())),
+            key=lambda item_id: (-sum(valid[item_id].values()), item_id.replace('_', ' ').title().lower())
+        )
+        affordable, total = costs.affordable(inventory, 25)
+
+        assert total == len(expected)
+        assert [item.item_id for item in affordable] == expected[:25]
+        assert all(item.cost == valid[item.item_id] for item in affordable)
+
+
+def test_grist_type_index_matches_sort():
+    grist_costs = load_grist_costs()
+    costs = GristCostMatrix(grist_costs, {})
+    index = GristTypeIndex(costs)
+    valid = {item_id: cost for item_id, cost in grist_costs.items() if isinstance(cost, dict) and cost}
+
+    def name(item_id):
+        return item_id.replace('_', ' ').title().lower()
+
+    for grist_type in costs.grist_types:
+        users = [item_id for item_id, cost in valid.items() if cost.get(grist_type)]
+        only = [item_id for item_id in users if len([a for a in valid[item_id].values() if a]) == 1]
+        for only_flag, candidates in ((False, users), (True, only)):
+            most = sorted(candidates, key=lambda item_id: (-valid[item_id][grist_type], name(item_id)))
+            cheapest = sorted(candidates, key=lambda item_id: (valid[item_id][grist_type], name(item_id)))
+
+            assert index.count(grist_type, only_flag) == len(candidates)
+            assert [use.item_id for use in index.most(grist_type, 10, only_flag)] == most[:10]
+            assert [use.item_id for use in index.cheapest(grist_type, 10, only_flag)] == cheapest[:10]
+            assert all(use.amount == valid[use.item_id][grist_type] for use in index.most(grist_type, 10, only_flag))
+
+    assert index.grist_type('uranium grist') == 'Uranium'
+    assert index.grist_type('bread') is None
+    assert index.most('Bread', 5) == []
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Grist inventories are parsed")
+    test_inventory_parsing()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Affordable items match a plain loop")
+    test_affordable_matches_loop()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Grist type index matches a full sort")
+    test_grist_type_index_matches_sort()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script to verify item tag resolution and tag-based grist costs.
+Checks nested tags, cycles, and the precedence between item and tag costs.
+"""
+
+from pathlib import Path
+
+from item_tags import CostEntry, ingredient_tags, read_item_tags, resolve_grist_costs, tag_closure
+from parse_items import parse_grist_costs
+
+DATA_DIR = Path(__file__).parent.parent / 'src' / 'main' / 'generated' / 'resources' / 'data'
+
+
+def test_nested_tags_are_closed():
+    closure = tag_closure({
+        'c:ores': ['#c:ores/coal', '#c:ores/iron', 'minecraft:diamond_ore'],
+        'c:ores/coal': ['#minestuck:ores/coal'],
+        'c:ores/iron': ['minestuck:pink_stone_iron_ore', '#c:missing'],
+        'minestuck:ores/coal': ['minestuck:shade_stone_coal_ore', 'minestuck:pink_stone_coal_ore'],
+        'loop:a': ['#loop:b', 'loop:item_a'],
+        'loop:b': ['#loop:a', 'loop:item_b'],
+    })
+
+    assert closure['c:ores'] == ['minestuck:shade_stone_coal_ore', 'minestuck:pink_stone_coal_ore',
+                                 'minestuck:pink_stone_iron_ore', 'minecraft:diamond_ore']
+    assert closure['c:ores/coal'] == closure['minestuck:ores/coal']
+    assert set(closure['loop:a']) == {'loop:item_a', 'loop:item_b'}
+
+
+def test_generated_tags():
+    tags = read_item_tags(DATA_DIR)
+    closure = tag_closure(tags)
+
+    assert tags['c:ores/coal'] == ['#minestuck:ores/coal']
+    assert 'minestuck:shade_stone_coal_ore' in closure['c:ores/coal']
+    assert not any(item_id.startswith('#') for items in closure.values() for item_id in items)
+
+
+def test_ingredient_tags():
+    closure = tag_closure(read_item_tags(DATA_DIR))
+    tags = ingredient_tags(['book', '#minecraft:planks', '#minecraft:planks', '#minecraft:boats'], closure)
+
+    # Vanilla tags aren't in the mod's datapack, so only the mod's additions are known
+    assert list(tags) == ['#minecraft:planks']
+    assert 'blood_aspect_planks' in tags['#minecraft:planks']
+
+
+def test_cost_precedence():
+    closure = {
+        'c:stones': ['minestuck:black_stone', 'minestuck:pink_stone', 'minecraft:stone'],
+        'c:pink': ['minestuck:pink_stone', 'minestuck:pink_stone_bricks'],
+        'c:one': ['minestuck:black_stone'],
+    }
+    costs, sources = resolve_grist_costs([
+        CostEntry('stone', {'Build': 1}, None),
+        CostEntry('#c:stones', {'Build': 2}, None),
+        CostEntry('#c:pink', {'Build': 3}, None),
+        CostEntry('#c:one', {'Build': 4}, None),
+        CostEntry('black_stone', {'Build': 5}, None),
+        CostEntry('#c:missing', {'Build': 6}, None),
+        CostEntry('#c:one', {'Shale': 7}, 200),
+    ], closure)
+
+    # An item's own cost beats a tag's
+    assert costs['stone'] == {'Build': 1} and 'stone' not in sources
+    # A smaller tag beats a larger one
+    assert costs['pink_stone'] == {'Build': 3} and sources['pink_stone'] == '#c:pink'
+    # An explicit priority beats everything
+    assert costs['black_stone'] == {'Shale': 7} and sources['black_stone'] == '#c:one'
+    # An item's own cost beats a one-item tag with the same priority, whichever comes first
+    costs, sources = resolve_grist_costs([CostEntry('#c:one', {'Build': 4}, None),
+                                          CostEntry('black_stone', {'Build': 5}, None)], closure)
+    assert costs == {'black_stone': {'Build': 5}} and sources == {}
+
+
+def test_tag_costs_reach_items():
+    closure = tag_closure(read_item_tags(DATA_DIR))
+    grist_costs_dir = DATA_DIR / 'minestuck' / 'recipe' / 'grist_costs'
+    costs, sources = parse_grist_costs(grist_costs_dir, tag_items=closure)
+
+    assert sources['black_cobblestone'] == '#c:cobblestones'
+    assert costs['black_cobblestone'] == {'Build': 2}
+    assert 'sord' in costs and 'sord' not in sources
+    assert not any(item_id.startswith('#') for item_id in costs)
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Nested tags resolve to their items")
+    test_nested_tags_are_closed()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: The generated item tags are read")
+    test_generated_tags()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Ingredient tags resolve to bare item ids")
+    test_ingredient_tags()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Item and tag costs follow the mod's precedence")
+    test_cost_precedence()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 5: Tag costs reach the tags' items")
+    test_tag_costs_reach_items()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
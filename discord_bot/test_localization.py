@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script to verify localized item names and tooltips.
+Checks lang file lookups, lazy per-locale loading and locale preferences.
+"""
+
+import tempfile
+from pathlib import Path
+
+from localization import DEFAULT_LOCALE, LocaleCatalog, LocalePreferences, LocaleTable, item_strings
+from parse_items import find_lang_files
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def test_item_strings_from_lang_file():
+    lang = {
+        'item.minestuck.sord': 'Sord.....',
+        'item.minestuck.sord.tooltip': 'A shitty sword.',
+        'block.minestuck.cruxtruder': 'Cruxtruder',
+        'item.minestuck.spooky.tooltip': '§kOooh spooky',
+    }
+    names, tooltips = item_strings(lang, ['sord', 'cruxtruder', 'spooky', 'missing'])
+
+    assert names == {'sord': 'Sord.....', 'cruxtruder': 'Cruxtruder'}
+    assert tooltips == {'sord': 'A shitty sword.', 'spooky': 'Oooh spooky'}
+
+
+def test_lang_files_prefer_newest_pack():
+    lang_files = find_lang_files(REPO_ROOT)
+
+    assert lang_files[DEFAULT_LOCALE] == (REPO_ROOT / 'src' / 'main' / 'generated' / 'resources' / 'assets' /
+                                          'minestuck' / 'lang' / 'en_us.json')
+    assert '1.20.1' in str(lang_files['zh_tw'])
+
+
+def test_catalog_loads_locales_lazily():
+    loads = []
+
+    def load(locale):
+        loads.append(locale)
+        return {'sord': '賤.....', 'batleacks': '賤.....'}, {'sord': '一把爛劍'}
+
+    catalog = LocaleCatalog(['zh_tw', DEFAULT_LOCALE], load, lambda: {'sord': 'Sord.....', 'batleacks': 'batleacks!!'})
+    assert catalog.available() == [DEFAULT_LOCALE, 'zh_tw']
+    assert catalog.table(DEFAULT_LOCALE) is None
+    assert catalog.table('fr_fr') is None
+    assert loads == []
+
+    table = catalog.table('zh_tw')
+    assert catalog.table('zh_tw') is table
+    assert loads == ['zh_tw']
+    assert table.name('sord') == '賤.....' and table.tooltip('sord') == '一把爛劍'
+    assert table.tooltip('batleacks') is None
+    # Both items share one stored name
+    assert len(table) == 2
+    # Autocomplete matches localized names, default names and ids
+    assert sorted(table.index.search('賤', 5)) == [('賤.....', 'batleacks'), ('賤.....', 'sord')]
+    assert table.index.search('leacks', 5) == [('賤.....', 'batleacks')]
+
+    empty = LocaleTable('zh_tw', {}, {}, {'sord': 'Sord.....'})
+    assert empty.index.search('sord', 5) == [('Sord.....', 'sord')]
+
+
+def test_preferences_precedence_and_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'locale_preferences.json'
+        preferences = LocalePreferences(path)
+        assert preferences.resolve(1, 10, 'zh-TW') == 'zh_tw'
+        assert preferences.resolve(1, 10, 'fr') == DEFAULT_LOCALE
+
+        preferences.set_guild(10, 'zh_tw')
+        assert preferences.resolve(1, 10, 'en-US') == 'zh_tw'
+        preferences.set_user(1, DEFAULT_LOCALE)
+        assert preferences.resolve(1, 10, 'zh-TW') == DEFAULT_LOCALE
+        assert preferences.resolve(2, 10) == 'zh_tw'
+        assert preferences.resolve(2, None) == DEFAULT_LOCALE
+
+        reloaded = LocalePreferences(path)
+        assert reloaded.resolve(1, 10) == DEFAULT_LOCALE
+        reloaded.set_user(1, None)
+        assert reloaded.resolve(1, 10) == 'zh_tw'
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Names and tooltips are read from a lang file")
+    test_item_strings_from_lang_file()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Lang files come from the mod and the newest translation pack")
+    test_lang_files_prefer_newest_pack()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Locales are loaded on first use")
+    test_catalog_loads_locales_lazily()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Locale choices follow user, guild, then client")
+    test_preferences_precedence_and_persistence()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the MSItems.java registration lexer.
+Checks statement boundaries with nested calls, comments and string literals.
+"""
+
+from pathlib import Path
+
+from parse_items import lex_registrations, parse_item_definition, parse_msitems_java
+
+JAVA_FILE = (Path(__file__).parent.parent / 'src' / 'main' / 'java' / 'com' / 'mraof' / 'minestuck' /
+             'item' / 'MSItems.java')
+
+SAMPLE_SOURCE = '''\
+public final class MSItems
+{
+	public static final DeferredItem<Item> CLAW_HAMMER = REGISTER.register("claw_hammer", () -> new WeaponItem(new WeaponItem.Builder(Tiers.IRON, 2, -2.8F).efficiency(1.0F).set(MSItemTypes.HAMMER_TOOL), new Item.Properties()));
+	public static final DeferredItem<BlockItem> CRUXTRUDER_LID = registerBlockItem(MSBlocks.CRUXTRUDER_LID);
+	public static final DeferredItem<Item> CARVED_SIGN = REGISTER.register("carved_sign",
+			() -> new SignItem(new Item.Properties().stacksTo(16), MSBlocks.CARVED_SIGN.get(),
+					MSBlocks.CARVED_WALL_SIGN.get()));
+	public static final DeferredItem<Item> TRICKY = REGISTER.register("tricky", () -> new Item(new Item.Properties().rarity(Rarity.RARE))); // not the end: ); (
+	/* commented out );
+	public static final DeferredItem<Item> GONE = REGISTER.register("gone", () -> new Item(new Item.Properties()));
+	*/
+	public static final DeferredItem<Item> QUOTED = REGISTER.register("quoted", () -> new NamedItem(");\\"(", new Item.Properties().fireResistant()));
+	public static final DeferredItem<Item> UNION_BUSTER = REGISTER.register("union_buster", () -> new WeaponItem(new WeaponItem.Builder(Tiers.GOLD, 9, -3.5F).efficiency(1.0f).set(MSItemTypes.SWORD_TOOL), new MSItemProperties().durability(505)));
+}
+'''
+
+
+def test_lexer_finds_statement_boundaries():
+    registrations = list(lex_registrations(SAMPLE_SOURCE.splitlines(keepends=True)))
+    assert [r.key for r in registrations] == ['claw_hammer', 'carved_sign', 'tricky', 'quoted', 'union_buster']
+
+    carved_sign = registrations[1]
+    assert carved_sign.const_name == 'CARVED_SIGN'
+    assert 'MSBlocks.CARVED_WALL_SIGN.get()' in carved_sign.definition
+    assert carved_sign.definition.endswith(');')
+
+    tricky = registrations[2]
+    assert 'not the end' not in tricky.definition
+    assert 'GONE' not in tricky.definition
+
+    assert 'fireResistant()' in registrations[3].definition
+
+
+def test_item_definitions_are_parsed():
+    items = {r.key: parse_item_definition(*r) for r in lex_registrations(SAMPLE_SOURCE.splitlines())}
+
+    assert items['claw_hammer']['type'] == 'Hammer'
+    assert items['claw_hammer']['tier'] == 'Iron'
+    assert items['claw_hammer']['attack_damage'] == 2
+    assert items['claw_hammer']['attack_speed'] == -2.8
+    assert items['claw_hammer']['efficiency'] == 1.0
+    assert items['carved_sign']['attributes'] == ['Max Stack: 16']
+    assert items['tricky']['attributes'] == ['Rarity: Rare']
+    assert items['union_buster']['efficiency'] == 1.0
+    assert items['union_buster']['durability'] == 505
+
+
+def test_msitems_java_registrations():
+    if not JAVA_FILE.exists():
+        return
+    items = parse_msitems_java(JAVA_FILE)
+    with open(JAVA_FILE, 'r', encoding='utf-8') as f:
+        expected = sum(line.count('REGISTER.register("') for line in f)
+
+    assert len(items) == expected
+    # Single-line registrations must not pick up the line that follows them
+    assert items['cruxtruder']['type'] == 'Item'
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Lexer finds statement boundaries")
+    test_lexer_finds_statement_boundaries()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Item definitions are parsed")
+    test_item_definitions_are_parsed()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Every registration in MSItems.java is found")
+    test_msitems_java_registrations()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the single-round-trip response pipeline.
+Checks the acknowledge deadline after the readiness gate and the error reply when a build fails.
+"""
+
+import asyncio
+import datetime
+import time
+
+import discord
+
+from response_pipeline import ERROR_REPLY_TEXT, Reply, hold_until_ready, respond
+
+
+class _Interaction:
+    """Records what a command sends, in place of a discord.Interaction."""
+
+    type = discord.InteractionType.application_command
+    command = None
+
+    def __init__(self, age: float = 0.0):
+        self.created_at = discord.utils.utcnow() - datetime.timedelta(seconds=age)
+        self.sent = []
+        self.response = self
+        self.followup = self
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append(('message', content, kwargs))
+
+    async def defer(self, **kwargs):
+        self.sent.append(('defer', None, kwargs))
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(('followup', content, kwargs))
+
+
+def _slow_reply() -> Reply:
+    time.sleep(0.2)
+    return Reply(content="done")
+
+
+def _failing_reply() -> Reply:
+    raise ValueError("broken data")
+
+
+def test_fresh_interactions_get_the_full_budget():
+    interaction = _Interaction()
+    assert asyncio.run(respond(interaction, _slow_reply)) == 'direct'
+    assert interaction.sent == [('message', "done", {})]
+
+
+def test_ephemeral_replies_stay_private():
+    interaction = _Interaction()
+    asyncio.run(respond(interaction, _slow_reply, ephemeral=True))
+    assert interaction.sent == [('message', "done", {'ephemeral': True})]
+
+    interaction = _Interaction(age=2.4)
+    asyncio.run(respond(interaction, _slow_reply, ephemeral=True))
+    assert [kwargs.get('ephemeral') for _, _, kwargs in interaction.sent] == [True, True]
+
+
+def test_held_interactions_defer_right_away():
+    # Held by the readiness gate until the acknowledge deadline is nearly up
+    interaction = _Interaction(age=2.4)
+    assert asyncio.run(respond(interaction, _slow_reply)) == 'deferred'
+    assert [kind for kind, _, _ in interaction.sent] == ['defer', 'followup']
+    assert interaction.sent[1][1] == "done"
+
+    # The gate itself never waits past the deadline
+    async def never_ready(timeout: float) -> bool:
+        await asyncio.sleep(timeout)
+        return False
+    interaction = _Interaction(age=2.4)
+    start = time.perf_counter()
+    assert not asyncio.run(hold_until_ready(interaction, never_ready))
+    assert time.perf_counter() - start < 0.5
+    assert interaction.sent[0][0] == 'message' and interaction.sent[0][2] == {'ephemeral': True}
+
+
+def test_failed_builds_get_an_error_reply():
+    interaction = _Interaction()
+    assert asyncio.run(respond(interaction, _failing_reply)) == 'direct'
+    assert interaction.sent == [('message', ERROR_REPLY_TEXT, {})]
+
+    def slow_failure() -> Reply:
+        time.sleep(0.1)
+        raise ValueError("broken data")
+    interaction = _Interaction()
+    assert asyncio.run(respond(interaction, slow_failure, budget=0.01)) == 'deferred'
+    assert interaction.sent[-1] == ('followup', ERROR_REPLY_TEXT, {})
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Fresh interactions get the full budget")
+    test_fresh_interactions_get_the_full_budget()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Held interactions defer right away")
+    test_held_interactions_defer_right_away()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Failed builds get an error reply")
+    test_failed_builds_get_an_error_reply()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Ephemeral replies stay private")
+    test_ephemeral_replies_stay_private()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
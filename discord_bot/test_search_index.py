@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the prebuilt autocomplete indexes.
+Checks that indexed searches return exactly what a full linear scan would.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from autocomplete_cache import AutocompleteCache
+from data_repository import JsonRepository, SqliteRepository, write_descriptions_tables, write_items_table
+from fuzzy_search import substring_distance
+from search_index import DescriptionIndex, build_item_fuzzy_index, build_item_index
+from stat_index import parse_query
+
+
+def load_items():
+    """Load items from JSON file."""
+    items_file = Path(__file__).parent / 'items_data.json'
+    with open(items_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_descriptions():
+    """Load descriptions from JSON file."""
+    descriptions_file = Path(__file__).parent / 'descriptions_data.json'
+    with open(descriptions_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def linear_item_search(items, search_term, limit=5):
+    """Reference implementation: the original full scan used by /item autocomplete."""
+    current_lower = search_term.lower()
+    matching_items = []
+    for item_id, item_data in items.items():
+        item_name = item_data.get('name', item_id)
+        if current_lower in item_name.lower() or current_lower in item_id.lower():
+            matching_items.append((item_name, item_id))
+    matching_items.sort(key=lambda x: x[0].lower())
+    return matching_items[:limit]
+
+
+def linear_topic_search(descriptions, search_term, limit=25):
+    """Reference implementation: the original full scan used by /description autocomplete."""
+    current_lower = search_term.lower()
+    matching_topics = []
+    for topic_id, topic_data in descriptions.items():
+        topic_name = topic_data.get('name', topic_id)
+        if current_lower in topic_name.lower() or current_lower in topic_id.lower():
+            matching_topics.append((topic_name, topic_id))
+        for subtopic_id, subtopic_data in topic_data.get('subtopics', {}).items():
+            subtopic_name = subtopic_data.get('name', subtopic_id)
+            if current_lower in subtopic_name.lower() or current_lower in subtopic_id.lower():
+                matching_topics.append((f"{topic_name} - {subtopic_name}", f"{topic_id}:{subtopic_id}"))
+    matching_topics.sort(key=lambda x: x[0].lower())
+    choices = []
+    for name, topic_id in matching_topics[:limit]:
+        if len(name) > 100:
+            name = name[:97].rsplit(' ', 1)[0] + '...'
+        choices.append((name, topic_id))
+    return choices
+
+
+def search_terms(names):
+    """Every prefix of a handful of names plus some awkward inputs."""
+    terms = ['', ' ', '_', 'Sword', 'SWORD', 'zzzz', 'e', 'of ', 'unb']
+    for name in names:
+        terms.extend(name[:end] for end in range(1, len(name) + 1))
+    return terms
+
+
+def test_item_index_matches_linear_scan():
+    """Indexed item search returns the same top matches as the full scan."""
+    items = load_items()
+    index = build_item_index(items)
+    names = ['unbreakable_katana', 'Claw Hammer', 'caledfwlch']
+    for term in search_terms(names):
+        for limit in (1, 5, 25):
+            expected = linear_item_search(items, term, limit)
+            assert index.search(term, limit) == expected, f"mismatch for {term!r}"
+
+
+def test_description_index_matches_linear_scan():
+    """Indexed topic and subtopic searches return the same matches as the full scan."""
+    descriptions = load_descriptions()
+    index = DescriptionIndex(descriptions)
+    for term in search_terms(['grist', 'Build Grist', 'alchemiter']):
+        assert index.search_topics(term, 25) == linear_topic_search(descriptions, term), f"mismatch for {term!r}"
+
+        expected = []
+        for subtopic_id, subtopic_data in descriptions['grist']['subtopics'].items():
+            subtopic_name = subtopic_data.get('name', subtopic_id)
+            if term.lower() in subtopic_name.lower() or term.lower() in subtopic_id.lower():
+                expected.append((subtopic_name, subtopic_id))
+        expected.sort(key=lambda x: x[0].lower())
+        assert index.search_subtopics('grist', term, 25) == expected[:25], f"mismatch for {term!r}"
+
+    assert index.search_subtopics('no_such_topic', '', 25) == []
+
+
+def test_autocomplete_cache_narrows_previous_results():
+    """Typing one character at a time through the cache gives the same results as fresh searches."""
+    items = load_items()
+    index = build_item_index(items)
+    cache = AutocompleteCache(max_entries=2, ttl=60.0)
+    for word in ['unbreakable_katana', 'Claw Hammer', 'sword', 'a']:
+        for end in range(len(word) + 1):
+            term = word[:end]
+            assert cache.search(('user', 'item'), index, term, 5) == linear_item_search(items, term), f"mismatch for {term!r}"
+        # Backspacing widens the query again and must not reuse the narrower set
+        assert cache.search(('user', 'item'), index, word[:1], 5) == linear_item_search(items, word[:1])
+        # A repeated query picks its top results from the cached, unsorted match set
+        assert cache.search(('user', 'item'), index, word[:1], 25) == linear_item_search(items, word[:1], 25)
+
+    # Least recently used sessions are evicted once the cache is full
+    for user in range(5):
+        cache.search((user, 'item'), index, 'sw', 5)
+    assert len(cache) == 2
+
+    # Results cached against a different index are never reused
+    other = build_item_index({'zzzz_sword': {'name': 'Zzzz Sword'}})
+    assert cache.search(('user', 'item'), other, 'sw', 5) == [('Zzzz Sword', 'zzzz_sword')]
+    assert cache.search(('user', 'item'), index, 'swo', 5) == linear_item_search(items, 'swo')
+
+
+def test_fuzzy_search_tolerates_typos():
+    """Misspelled queries still find the intended item or topic, ranked by edit distance."""
+    assert substring_distance('caledflwch', 'caledfwlch', 3) == 1
+    assert substring_distance('hamer', 'claw hammer', 3) == 1
+    assert substring_distance('zzzz', 'claw hammer', 1) == 2
+
+    items = load_items()
+    fuzzy = build_item_fuzzy_index(items)
+    assert fuzzy.search('caledflwch', 5)[0] == ('Caledfwlch', 'caledfwlch')
+    assert fuzzy.search('zilyhoo', 5)[0] == ('Warhammer of Zillyhoo', 'zillyhoo_hammer')
+    assert fuzzy.search('unbrekable', 5)[0] == ('Unbreakable Katana', 'unbreakable_katana')
+    assert ('Caledfwlch', 'caledfwlch') not in fuzzy.search('caledflwch', 5, exclude=['caledfwlch'])
+    assert fuzzy.search('xyzqwerty', 5) == []
+    # Too short for the bigrams to rule out any key, so the candidates come from shared characters
+    assert fuzzy.search('osrd', 5)[0][1] == 'sord'
+
+    descriptions = DescriptionIndex(load_descriptions())
+    assert ('Alchemiter', 'alchemiter') in descriptions.fuzzy_topic_index.search('alchemitre', 25)
+
+
+def test_sqlite_repository_matches_json_repository():
+    """The SQLite/FTS5 store answers lookups and exact searches exactly like the in-memory indexes."""
+    items = load_items()
+    descriptions = load_descriptions()
+    json_repository = JsonRepository(items, descriptions, AutocompleteCache(max_entries=10, ttl=60.0))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'minestuck_data.db'
+        write_items_table(db_path, items)
+        write_descriptions_tables(db_path, descriptions)
+        sqlite_repository = SqliteRepository(db_path)
+
+        assert sqlite_repository.item_count() == len(items)
+        assert sqlite_repository.topic_count() == len(descriptions)
+        assert sqlite_repository.get_item('claw_hammer') == items['claw_hammer']
+        assert sqlite_repository.get_topic('grist') == descriptions['grist']
+        assert sqlite_repository.get_item('fake_item') is None
+
+        for term in search_terms(['unbreakable_katana', 'Build Grist', 'alchemiter']):
+            assert sqlite_repository.search_items(term, 5)[:len(linear_item_search(items, term))] == \
+                linear_item_search(items, term), f"mismatch for {term!r}"
+            expected_topics = linear_topic_search(descriptions, term)
+            assert sqlite_repository.search_topics(term, 25)[:len(expected_topics)] == expected_topics, \
+                f"mismatch for {term!r}"
+            assert sqlite_repository.search_subtopics('grist', term, 25) == \
+                json_repository.search_subtopics('grist', term, 25), f"mismatch for {term!r}"
+
+        assert sqlite_repository.search_items('caledflwch', 5)[0] == ('Caledfwlch', 'caledfwlch')
+        for term in ['osrd', 'zilyhoo', 'alchemitre']:
+            assert sqlite_repository.search_items(term, 5) == json_repository.search_items(term, 5)
+            assert sqlite_repository.search_topics(term, 25) == json_repository.search_topics(term, 25)
+
+        # Autocomplete sessions narrow their matches through the cache, with the same results
+        cached_repository = SqliteRepository(db_path, AutocompleteCache(max_entries=10, ttl=60.0))
+        for term in ['g', 'gr', 'gri', 'gris', 'grist', 'gris', 'hammer']:
+            assert cached_repository.search_items(term, 5, ('user', 'item')) == \
+                json_repository.search_items(term, 5, ('user', 'item')), f"mismatch for {term!r}"
+            assert cached_repository.search_topics(term, 25, ('user', 'topic')) == \
+                json_repository.search_topics(term, 25, ('user', 'topic')), f"mismatch for {term!r}"
+
+        # Indexes read from a few record fields match those built from the whole records
+        query = parse_query('type:sword sort:-damage')
+        assert sqlite_repository.stat_index().search(query) == json_repository.stat_index().search(query)
+        assert sqlite_repository.similarity_index().similar('claw_hammer') == \
+            json_repository.similarity_index().similar('claw_hammer')
+        assert sqlite_repository.captcha_tables().code(0, 'minestuck:sord') == \
+            json_repository.captcha_tables().code(0, 'minestuck:sord')
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Item index matches linear scan")
+    test_item_index_matches_linear_scan()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Description index matches linear scan")
+    test_description_index_matches_linear_scan()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Autocomplete cache narrows previous results")
+    test_autocomplete_cache_narrows_previous_results()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Fuzzy search tolerates typos")
+    test_fuzzy_search_tolerates_typos()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 5: SQLite repository matches JSON repository")
+    test_sqlite_repository_matches_json_repository()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the /search query language and its columnar stat index.
+Checks indexed searches against a plain scan of the item records.
+"""
+
+import json
+import operator
+from pathlib import Path
+
+from stat_index import STAT_FIELDS, QueryError, StatIndex, parse_query
+
+# How each query operator compares an item's stat with the query's value
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+             '=': operator.eq, '!=': operator.ne}
+
+
+def load_items():
+    """Load items from JSON file."""
+    items_file = Path(__file__).parent / 'items_data.json'
+    with open(items_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def scan(items, query):
+    """Answer a parsed query with a plain loop over the item records."""
+    matches = []
+    for item_id, item in items.items():
+        name = item.get('name', item_id).lower()
+        values = {field: value_of(item) for field, value_of in STAT_FIELDS.items()}
+        if any(values[field] is None or not OPERATORS[op](values[field], value) for field, op, value in query.ranges):
+            continue
+        if 'type' in query.text and item.get('type', '').lower() not in query.text['type']:
+            continue
+        if 'material' in query.text and (item.get('tier') or '').lower() not in query.text['material']:
+            continue
+        if not all(word in name for word in query.words):
+            continue
+        matches.append((item_id, name, values))
+
+    if query.sort is None:
+        matches.sort(key=lambda match: match[1])
+    else:
+        field, descending = query.sort
+        matches.sort(key=lambda match: (match[2][field] is None,
+                                        -(match[2][field] or 0) if descending else (match[2][field] or 0),
+                                        match[1]))
+    return [item_id for item_id, _, _ in matches[:query.limit]], len(matches)
+
+
+def test_search_matches_scan():
+    items = load_items()
+    index = StatIndex(items)
+    queries = [
+        "type:sword tier>=5 damage>8 sort:-speed limit:10",
+        "type:sword tier>=3 damage>=5 sort:-speed",
+        "type:hammer,club sort:-damage limit:25",
+        "damage<2 speed!=-2.4 sort:dur",
+        "material:diamond sort:-eff limit:5",
+        "hammer sort:dmg",
+        "grist<=100 sort:-grist",
+        "tier:3",
+        "sort:-durability limit:25",
+    ]
+    for text in queries:
+        query = parse_query(text)
+        assert index.search(query) == scan(items, query), text
+
+
+def test_query_errors():
+    for text in ["foo>3", "damage>lots", "sort:name", "limit:0", "limit:26", "type>sword"]:
+        try:
+            parse_query(text)
+        except QueryError:
+            continue
+        raise AssertionError(f"{text!r} should not parse")
+
+    index = StatIndex(load_items())
+    try:
+        index.search(parse_query("type:swrd"))
+    except QueryError as e:
+        assert 'sword' in str(e)
+    else:
+        raise AssertionError("unknown type should be reported")
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Indexed searches match a plain scan")
+    test_search_matches_scan()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Bad queries are reported")
+    test_query_errors()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the item thumbnail pipeline.
+Checks texture lookup through item and block models, and the content-addressed thumbnail cache.
+"""
+
+import io
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from thumbnails import ThumbnailCache, build_thumbnails, find_item_textures, render_thumbnail
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# The mod's hand-written and generated assets
+ASSETS_DIRS = [REPO_ROOT / 'src' / 'main' / 'resources' / 'assets' / 'minestuck',
+               REPO_ROOT / 'src' / 'main' / 'generated' / 'resources' / 'assets' / 'minestuck']
+
+
+def _write(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, bytes):
+        path.write_bytes(data)
+    else:
+        path.write_text(json.dumps(data), encoding='utf-8')
+
+
+def test_textures_found_through_models():
+    with tempfile.TemporaryDirectory() as directory:
+        assets = Path(directory)
+        _write(assets / 'models' / 'item' / 'sord.json',
+               {'parent': 'minecraft:item/handheld', 'textures': {'layer0': 'minestuck:item/sord'}})
+        _write(assets / 'models' / 'item' / 'crate.json', {'parent': 'minestuck:block/crate'})
+        _write(assets / 'models' / 'block' / 'crate.json',
+               {'parent': 'block/block', 'textures': {'particle': '#side', 'side': 'minestuck:block/crate_side'}})
+        _write(assets / 'models' / 'item' / 'ghost.json', {'textures': {'layer0': 'minestuck:item/ghost'}})
+        _write(assets / 'models' / 'item' / 'vanilla.json', {'textures': {'layer0': 'minecraft:item/stick'}})
+        _write(assets / 'textures' / 'item' / 'sord.png', b'sord')
+        _write(assets / 'textures' / 'block' / 'crate_side.png', b'crate')
+
+        textures = find_item_textures([assets], ['sord', 'crate', 'ghost', 'vanilla', 'unmodelled'])
+
+    # ghost's texture file is missing, and vanilla textures aren't in the mod
+    assert textures == {'sord': 'item/sord', 'crate': 'block/crate_side'}
+
+
+def test_every_item_has_a_texture():
+    with open(Path(__file__).parent / 'items_data.json', 'r', encoding='utf-8') as f:
+        item_ids = list(json.load(f))
+    textures = find_item_textures(ASSETS_DIRS, item_ids)
+
+    assert len(textures) == len(item_ids)
+    assert textures['sord'] == 'item/sord'
+    # An item model that is only a block model's parent
+    assert textures['mini_cruxtruder'] == 'item/cruxtruder'
+
+
+def test_cache_is_content_addressed():
+    with tempfile.TemporaryDirectory() as directory:
+        textures = ASSETS_DIRS[0] / 'textures' / 'item'
+        sord = (textures / 'sord.png').read_bytes()
+        cache = ThumbnailCache(Path(directory))
+
+        key = cache.store(sord)
+        assert cache.path(key).is_file()
+        assert cache.store(sord) == key
+        assert (cache.rendered, cache.reused) == (1, 1)
+
+        # The same texture under two names is rendered once
+        thumbnails = build_thumbnails(ASSETS_DIRS, {'sord': 'item/sord', 'copy': 'item/sord'}, cache)
+        assert thumbnails == {'sord': key, 'copy': key}
+        assert cache.rendered == 1
+
+        # A different size is a different thumbnail
+        assert ThumbnailCache(Path(directory), size=64).key(sord) != key
+
+        other = cache.store((textures / 'ace_clubs.png').read_bytes())
+        assert cache.prune([key]) == 1
+        assert not cache.path(other).exists() and cache.path(key).exists()
+
+        # Thumbnails are readable by everyone, like any other data file
+        assert cache.path(key).stat().st_mode & 0o777 == 0o644
+
+
+def test_broken_texture_is_skipped():
+    pytest.importorskip('PIL.Image')
+
+    with tempfile.TemporaryDirectory() as directory:
+        assets_dir = Path(directory) / 'assets'
+        _write(assets_dir / 'textures' / 'item' / 'broken.png', b'not a png')
+        sord = (ASSETS_DIRS[0] / 'textures' / 'item' / 'sord.png').read_bytes()
+        _write(assets_dir / 'textures' / 'item' / 'sord.png', sord)
+        cache = ThumbnailCache(Path(directory) / 'thumbnails')
+
+        with pytest.raises(Exception):
+            build_thumbnails([assets_dir], {'broken': 'item/broken'}, cache)
+        # No temporary file is left behind by the failed render
+        assert list(cache.directory.iterdir()) == []
+
+        errors = []
+        thumbnails = build_thumbnails([assets_dir], {'broken': 'item/broken', 'sord': 'item/sord'}, cache,
+                                      on_error=lambda texture_file, e: errors.append(texture_file.name))
+        assert list(thumbnails) == ['sord']
+        assert errors == ['broken.png']
+
+
+def test_thumbnails_are_upscaled():
+    Image = pytest.importorskip('PIL.Image')
+
+    texture = (ASSETS_DIRS[0] / 'textures' / 'item' / 'sord.png').read_bytes()
+    with Image.open(io.BytesIO(texture)) as image:
+        source = image.convert('RGBA')
+    with Image.open(io.BytesIO(render_thumbnail(texture, 128))) as image:
+        thumbnail = image.convert('RGBA')
+
+    scale = 128 // max(source.size)
+    assert thumbnail.size == (source.width * scale, source.height * scale)
+    # Every texture pixel becomes a solid scale x scale square, with no blending between them
+    assert all(thumbnail.getpixel((x, y)) == source.getpixel((x // scale, y // scale))
+               for x in range(thumbnail.width) for y in range(thumbnail.height))
+
+    # Only the first frame of an animated texture's strip is used
+    strip = Image.new('RGBA', (2, 4))
+    strip.putdata([(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255), (0, 0, 0, 0)] + [(9, 9, 9, 255)] * 4)
+    output = io.BytesIO()
+    strip.save(output, format='PNG')
+    with Image.open(io.BytesIO(render_thumbnail(output.getvalue(), 128))) as image:
+        frame = image.convert('RGBA')
+    assert frame.size == (128, 128)
+    assert [frame.getpixel(point) for point in ((0, 0), (127, 0), (0, 127), (127, 127), (63, 63), (64, 64))] == [
+        (255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255), (0, 0, 0, 0), (255, 0, 0, 255), (0, 0, 0, 0)]
+
+
+def main():
+    """Run tests."""
+    print("Test 1: Textures are found through item and block models")
+    test_textures_found_through_models()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 2: Every item in items_data.json has a texture")
+    test_every_item_has_a_texture()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 3: Thumbnails are cached by content")
+    test_cache_is_content_addressed()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 4: Thumbnails are upscaled textures")
+    test_thumbnails_are_upscaled()
+    print("  ✓ Passed")
+    print()
+
+    print("Test 5: A texture that can't be rendered is skipped")
+    test_broken_texture_is_skipped()
+    print("  ✓ Passed")
+    print()
+
+    print("✓ All tests completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Item thumbnails rendered from the mod's textures at build time.
+Textures are found through the item models, upscaled nearest-neighbour and kept in a content-addressed cache.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+try:
+    from PIL import Image
+except ImportError:  # Listed in requirements.txt; without it thumbnails are the original textures
+    Image = None
+
+# Longest side of a rendered thumbnail, in pixels
+THUMBNAIL_SIZE = 128
+
+# Bump whenever rendering changes, so every cached thumbnail is rendered again
+RENDER_VERSION = 1
+
+# Permissions of a stored thumbnail, readable by a bot running as another user
+THUMBNAIL_MODE = 0o644
+
+# Model texture variables that show an item best, in order of preference;
+# item models draw layer0, block models are shown by their particle or face texture
+_TEXTURE_KEYS = ('layer0', 'particle', 'all', 'side', 'front', 'top', 'texture')
+
+# Parent models deeper than this are not followed
+_MAX_PARENT_DEPTH = 16
+
+
+def _resource(reference: str) -> Optional[str]:
+    """The path of a 'minestuck:' resource reference, e.g. 'item/sord'; None for other namespaces."""
+    namespace, _, path = reference.rpartition(':')
+    return path if namespace in ('', 'minestuck') else None
+
+
+def _read_model(models_dirs: Sequence[Path], model: str) -> Optional[dict]:
+    for models_dir in models_dirs:
+        model_file = models_dir / f'{model}.json'
+        if model_file.is_file():
+            with open(model_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return None
+
+
+def model_texture(models_dirs: Sequence[Path], model: str) -> Optional[str]:
+    """
+    The texture that represents a model, e.g. 'item/sord' for 'item/sord'.
+
+    Texture variables are collected up the model's parents, the child's
+    winning, and ``#variable`` references are followed. Parents outside the
+    minestuck namespace (the vanilla templates) aren't on disk and end the
+    chain.
+
+    Parameters:
+    -----------
+    models_dirs: sequence of Path
+        assets/minestuck/models directories, searched in order
+    model: str
+        Model path below them, without the .json extension
+    """
+    textures: Dict[str, str] = {}
+    for _ in range(_MAX_PARENT_DEPTH):
+        data = _read_model(models_dirs, model)
+        if data is None:
+            break
+        for key, value in data.get('textures', {}).items():
+            textures.setdefault(key, value)
+        model = _resource(data.get('parent', ''))
+        if not model:
+            break
+
+    keys = [key for key in _TEXTURE_KEYS if key in textures] + sorted(textures)
+    for key in keys:
+        value = textures[key]
+        seen = {key}
+        while value.startswith('#') and value[1:] not in seen:
+            seen.add(value[1:])
+            value = textures.get(value[1:], value)
+        texture = None if value.startswith('#') else _resource(value)
+        if texture:
+            return texture
+    return None
+
+
+def find_item_textures(assets_dirs: Sequence[Path], item_ids: Iterable[str]) -> Dict[str, str]:
+    """
+    The texture of each item whose item model leads to a texture file that exists.
+
+    Parameters:
+    -----------
+    assets_dirs: sequence of Path
+        assets/minestuck directories, e.g. the hand-written and the generated resources
+    item_ids: iterable of str
+        Registry ids of the items, e.g. 'sord'
+    """
+    models_dirs = [assets_dir / 'models' for assets_dir in assets_dirs]
+    textures = {}
+    for item_id in item_ids:
+        texture = model_texture(models_dirs, f'item/{item_id}')
+        if texture and any((assets_dir / 'textures' / f'{texture}.png').is_file() for assets_dir in assets_dirs):
+            textures[item_id] = texture
+    return textures
+
+
+def render_thumbnail(texture: bytes, size: int = THUMBNAIL_SIZE) -> bytes:
+    """
+    A PNG thumbnail of a texture: its first animation frame, upscaled by the
+    largest whole factor that fits in ``size`` so every pixel stays a sharp square.
+
+    Without Pillow the texture is returned as it is.
+    """
+    if Image is None:
+        return texture
+    with Image.open(io.BytesIO(texture)) as image:
+        image = image.convert('RGBA')
+        # Animated textures are a vertical strip of square frames
+        width, height = image.size
+        if height > width and height % width == 0:
+            image = image.crop((0, 0, width, width))
+            height = width
+        scale = max(1, size // max(width, height))
+        image = image.resize((width * scale, height * scale), Image.NEAREST)
+        output = io.BytesIO()
+        image.save(output, format='PNG', optimize=True)
+        return output.getvalue()
+
+
+class ThumbnailCache:
+    """
+    Rendered thumbnails on disk, each named after a hash of what it was rendered from.
+
+    The name covers the texture's bytes, the thumbnail size and the
+    renderer, so an unchanged texture is never rendered twice, identical
+    textures share one file, and a thumbnail that exists is always current.
+    Files are written atomically, so the bot never attaches half a file.
+    """
+
+    def __init__(self, directory: Path, size: int = THUMBNAIL_SIZE):
+        """
+        Parameters:
+        -----------
+        directory: Path
+            Where thumbnails are stored; created if missing
+        size: int
+            Longest side of a thumbnail, in pixels
+        """
+        self.directory = directory
+        self.size = size
+        self.rendered = 0
+        self.reused = 0
+
+    def key(self, texture: bytes) -> str:
+        """The file name of the thumbnail of ``texture``."""
+        renderer = 'pillow' if Image is not None else 'copy'
+        digest = hashlib.sha256(f'{RENDER_VERSION}:{renderer}:{self.size}:'.encode() + texture).hexdigest()
+        return f'{digest}.png'
+
+    def path(self, key: str) -> Path:
+        return self.directory / key
+
+    def store(self, texture: bytes) -> str:
+        """Render ``texture`` unless it already is, and return its thumbnail's file name."""
+        key = self.key(texture)
+        path = self.path(key)
+        if path.exists():
+            self.reused += 1
+            return key
+        self.directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(render_thumbnail(texture, self.size))
+            # mkstemp creates the file readable by its owner only
+            os.chmod(temp_path, THUMBNAIL_MODE)
+            os.replace(temp_path, path)
+        finally:
+            Path(temp_path).unlink(missing_ok=True)
+        self.rendered += 1
+        return key
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Delete thumbnails not in ``keep``; returns how many were deleted."""
+        keep = set(keep)
+        removed = 0
+        for path in self.directory.glob('*.png'):
+            if path.name not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+def build_thumbnails(assets_dirs: Sequence[Path], textures: Dict[str, str], cache: ThumbnailCache,
+                     on_error: Optional[Callable[[Path, Exception], None]] = None) -> Dict[str, str]:
+    """
+    Store a thumbnail for every item texture and return each item's thumbnail file name.
+
+    Parameters:
+    -----------
+    assets_dirs: sequence of Path
+        assets/minestuck directories, searched in order for each texture
+    textures: dict
+        Texture of each item, as returned by find_item_textures
+    cache: ThumbnailCache
+        Where thumbnails are stored
+    on_error: callable, optional
+        Called with the texture file and the error when a texture can't be
+        rendered; its items are left without a thumbnail. Without it the error is raised
+    """
+    thumbnails = {}
+    keys: Dict[str, Optional[str]] = {}
+    for item_id, texture in sorted(textures.items()):
+        if texture not in keys:
+            for assets_dir in assets_dirs:
+                texture_file = assets_dir / 'textures' / f'{texture}.png'
+                if texture_file.is_file():
+                    try:
+                        keys[texture] = cache.store(texture_file.read_bytes())
+                    except Exception as e:
+                        if on_error is None:
+                            raise
+                        on_error(texture_file, e)
+                        keys[texture] = None
+                    break
+        if keys.get(texture) is not None:
+            thumbnails[item_id] = keys[texture]
+    return thumbnails